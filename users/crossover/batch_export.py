@@ -0,0 +1,280 @@
+"""
+batch_export.py - Multi-symbol, multi-timeframe MT5 export over one session
+
+Runs a manifest of symbol x timeframe x indicator export jobs with a single
+MT5 connection and a single interpreter. Jobs flow through export_pipeline's
+bounded-queue pipeline: one fetch thread (one IPC connection), a compute
+worker pool and one writer thread, so MT5 waits and disk writes overlap with
+indicator computation on other jobs. Each job's bars are quality-scanned in
+the compute stage and the per-check counts go into the summary.
+
+Manifest (JSON):
+    {
+        "output": "C:\\Users\\crossover\\exports",
+        "bars": 5000,
+        "format": "csv",
+        "indicators": {"rsi": {"period": 14}, "laguerre_rsi": {"atr_period": 32}},
+        "symbols": ["EURUSD", "XAUUSD"],
+        "periods": ["M1", "M5", "H1", "H4"],
+        "jobs": [
+            {"symbol": "USDJPY", "period": "M1", "bars": 10000, "indicators": {"sma": {"period": 20}}}
+        ]
+    }
+
+"symbols" x "periods" expands to one job each with the top-level defaults;
+entries in "jobs" are added as-is and may override "bars", "indicators",
+"format" and "output". Indicator names and parameters are those of indicators/registry.py.
+
+Usage:
+    python batch_export.py --manifest nightly.json
+    python batch_export.py --manifest nightly.json --workers 4 --summary-json summary.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import MetaTrader5 as mt5
+
+import export_aligned
+from export_pipeline import ExportPipeline
+from indicators import registry
+from indicators.quality import scan_rates
+
+
+DEFAULT_OUTPUT = 'C:\\Users\\crossover\\exports'
+
+
+def load_manifest(path):
+    """
+    Expand a manifest into a list of export jobs
+
+    Returns:
+        List of dicts with symbol, period, bars, indicators, format, output
+
+    Raises:
+        ValueError: If the manifest is malformed or names an unknown indicator/period
+    """
+    manifest = json.loads(Path(path).read_text())
+
+    defaults = {
+        'bars': manifest.get('bars', 5000),
+        'indicators': manifest.get('indicators') or export_aligned.default_indicator_params(),
+        'output': manifest.get('output', DEFAULT_OUTPUT),
+        'format': manifest.get('format', 'csv'),
+    }
+
+    jobs = [
+        {'symbol': symbol, 'period': period, **defaults}
+        for symbol in manifest.get('symbols', [])
+        for period in manifest.get('periods', [])
+    ]
+    for entry in manifest.get('jobs', []):
+        if 'symbol' not in entry or 'period' not in entry:
+            raise ValueError(f"Manifest job needs 'symbol' and 'period': {entry}")
+        jobs.append({**defaults, **entry})
+
+    if not jobs:
+        raise ValueError(f"Manifest {path} defines no jobs (need symbols x periods or jobs)")
+
+    for job in jobs:
+        job['symbol'] = job['symbol'].upper()
+        job['period'] = job['period'].upper()
+        export_aligned.parse_timeframe(job['period'])
+        if job['format'] not in export_aligned.EXPORT_FORMATS:
+            raise ValueError(f"Invalid format: {job['format']} (valid: {', '.join(export_aligned.EXPORT_FORMATS)})")
+        for name, params in job['indicators'].items():
+            registry.resolve_params(name, params)  # Raises on unknown parameters
+
+    return jobs
+
+
+def compute_job(job, rates):
+    """
+    Compute stage: quality-scan the bars and calculate indicators for one job
+    (module-level so worker processes can run it)
+
+    Returns:
+        (export DataFrame, quality report dict)
+    """
+    quality = scan_rates(rates, job['period'])
+    return export_aligned.compute_export(rates, job['bars'], job['indicators']), quality.to_dict()
+
+
+def run_batch(jobs, workers=None, use_threads=False, queue_size=None):
+    """
+    Run export jobs over one MT5 session through the fetch/compute/write pipeline
+
+    Args:
+        jobs: Jobs from load_manifest()
+        workers: Compute pool size (default: CPU count)
+        use_threads: Compute in threads instead of worker processes
+        queue_size: Capacity of each inter-stage queue (default: 2 x workers);
+                    bounds memory held by fetched or computed-but-unwritten jobs
+
+    Returns:
+        (results, pipeline): per-job result dicts in manifest order, and the
+        ExportPipeline with per-stage metrics
+    """
+    workers = workers or os.cpu_count() or 1
+    selected = set()
+
+    def fetch(job):
+        symbol, period = job['symbol'], job['period']
+        if symbol not in selected:
+            export_aligned.select_symbol(symbol)
+            selected.add(symbol)
+        timeframe = export_aligned.parse_timeframe(period)
+        count = export_aligned.bars_needed(job['bars'], job['indicators'])
+        rates = export_aligned.fetch_rates(symbol, timeframe, period, count)
+        print(f"[OK] Fetched {symbol} {period}: {len(rates)} bars")
+        return rates
+
+    def write(job, output):
+        export_df, quality = output
+        filepath = Path(job['output']) / export_aligned.export_filename(job['symbol'], job['period'], job['format'])
+        export_aligned.write_export(export_df, filepath, job['format'])
+        return {'rows': len(export_df), 'file': str(filepath), 'quality': quality}
+
+    pipeline = ExportPipeline(
+        fetch, compute_job, write,
+        compute_workers=workers,
+        queue_size=queue_size or 2 * workers,
+        processes=not use_threads,
+    )
+
+    if not mt5.initialize():
+        error_code, error_msg = mt5.last_error()
+        raise ConnectionError(
+            f"MT5 initialization failed\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Ensure MT5 terminal is running and logged in"
+        )
+
+    try:
+        results = pipeline.run(jobs)
+    finally:
+        mt5.shutdown()
+
+    for job, result in zip(jobs, results):
+        result.update(symbol=job['symbol'], period=job['period'], bars=job['bars'])
+        result.setdefault('rows', 0)
+        if result['status'] == 'FAILED':
+            print(f"[FAIL] {job['symbol']} {job['period']}: {result['error']}")
+
+    return results, pipeline
+
+
+def print_summary(results, wall_s, pipeline=None):
+    """Print per-job timings, totals and per-stage utilisation"""
+    print()
+    print("=" * 78)
+    print("Batch Export Summary")
+    print("=" * 78)
+    print(f"{'Symbol':<10} {'Period':<7} {'Rows':>8} {'Fetch(s)':>9} {'Compute(s)':>11} {'Write(s)':>9}  Status")
+    print("-" * 78)
+    for r in results:
+        print(f"{r['symbol']:<10} {r['period']:<7} {r['rows']:>8} {r['fetch_s']:>9.3f} "
+              f"{r['compute_s']:>11.3f} {r['write_s']:>9.3f}  {r['status']}")
+    print("-" * 78)
+
+    ok = sum(1 for r in results if r['status'] == 'OK')
+    stage_total = sum(r['fetch_s'] + r['compute_s'] + r['write_s'] for r in results)
+    print(f"Jobs: {ok}/{len(results)} succeeded")
+    print(f"Wall time: {wall_s:.2f}s (sum of job stages: {stage_total:.2f}s)")
+
+    for r in results:
+        if r['status'] != 'OK':
+            print(f"  {r['symbol']} {r['period']}: {r.get('error')}")
+    for r in results:
+        quality = r.get('quality')
+        if quality and (not quality['ok'] or quality['missing_bars']):
+            found = ', '.join(f"{n} {check}" for check, n in quality['counts'].items() if n)
+            print(f"[WARN] {r['symbol']} {r['period']} quality: {found}; {quality['missing_bars']} missing bars")
+    print()
+
+    if pipeline is not None:
+        print("Pipeline stages:")
+        pipeline.print_metrics()
+        print()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Batch MT5 export over one session (manifest of symbol x timeframe x indicator jobs)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python batch_export.py --manifest nightly.json
+  python batch_export.py --manifest nightly.json --workers 4
+  python batch_export.py --manifest nightly.json --threads --summary-json summary.json
+        """
+    )
+
+    parser.add_argument(
+        '--manifest',
+        required=True,
+        help='JSON manifest of export jobs'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Compute worker count (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--threads',
+        action='store_true',
+        help='Use a thread pool instead of worker processes'
+    )
+
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=None,
+        help='Jobs buffered between pipeline stages (default: 2 x workers)'
+    )
+
+    parser.add_argument(
+        '--summary-json',
+        help='Also write the per-job summary to this JSON file'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: invalid manifest: {e}")
+        return 1
+
+    print("=" * 78)
+    print(f"MT5 Batch Export - {len(jobs)} jobs")
+    print("=" * 78)
+    print()
+
+    start = time.perf_counter()
+    try:
+        results, pipeline = run_batch(jobs, workers=args.workers, use_threads=args.threads, queue_size=args.queue_size)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    wall_s = time.perf_counter() - start
+
+    print_summary(results, wall_s, pipeline)
+
+    if args.summary_json:
+        Path(args.summary_json).write_text(json.dumps({'wall_s': wall_s, 'jobs': results, 'stages': pipeline.metrics_summary()}, indent=2))
+        print(f"Summary written to: {args.summary_json}")
+
+    return 0 if all(r['status'] == 'OK' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
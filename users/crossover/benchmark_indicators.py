@@ -0,0 +1,127 @@
+"""
+benchmark_indicators.py - Indicator throughput on synthetic data at production scale
+
+Generates deterministic synthetic bars (synthetic_data.py) and times, per
+size: generation, the data-quality scan, each registered indicator's batch kernel, all indicators
+through one ComputeGraph (shared intermediates), and streaming (bar-by-bar)
+indicators. No terminal or network access is needed, so results are
+comparable across machines and commits.
+
+Usage:
+    python benchmark_indicators.py
+    python benchmark_indicators.py --bars 10000 1000000 10000000 --model regime --json bench.json
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from indicators import registry
+from indicators.bars import BarSeries
+from indicators.graph import ComputeGraph
+from indicators.quality import scan_rates
+import synthetic_data
+
+
+def timed(func, *args, **kwargs):
+    """(result, seconds) of one call"""
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+def run_benchmark(sizes, period='M1', model='gbm', seed=0, streaming_bars=100_000, names=None):
+    """
+    Time generation, batch, graph and streaming computation per size
+
+    Args:
+        names: Registry indicators to time (default: all)
+
+    Returns:
+        List of result dicts (size, stage, indicator, seconds, bars_per_s)
+    """
+    results = []
+
+    def record(size, stage, indicator, seconds, bars):
+        results.append({
+            'bars': size, 'stage': stage, 'indicator': indicator,
+            'seconds': seconds, 'bars_per_s': bars / seconds if seconds > 0 else float('inf'),
+        })
+        print(f"{size:>11,} {stage:<10} {indicator:<14} {seconds:>9.3f} {results[-1]['bars_per_s']:>14,.0f}")
+
+    print(f"{'Bars':>11} {'Stage':<10} {'Indicator':<14} {'Seconds':>9} {'Bars/s':>14}")
+    print("-" * 62)
+
+    names = names or registry.available_indicators()
+    for name in names:
+        registry.get_spec(name)  # Raises on unknown indicators
+    for size in sizes:
+        rates, seconds = timed(synthetic_data.generate_bars, size, period=period, model=model, seed=seed)
+        record(size, 'generate', '-', seconds, size)
+        _, seconds = timed(scan_rates, rates, period)
+        record(size, 'quality', '-', seconds, size)
+        bars = BarSeries(rates)
+
+        for name in names:
+            _, seconds = timed(ComputeGraph(bars).evaluate_indicators, {name: registry.get_spec(name).defaults()})
+            record(size, 'batch', name, seconds, size)
+
+        params = {name: registry.get_spec(name).defaults() for name in names}
+        _, seconds = timed(ComputeGraph(bars).evaluate_indicators, params)
+        record(size, 'graph', 'all', seconds, size)
+
+        sample = rates[:min(size, streaming_bars)]
+        for name in names:
+            if registry.get_spec(name).streaming is None or len(sample) == 0:
+                continue
+            indicator = registry.create_streaming(name)
+            _, seconds = timed(indicator.run, sample)
+            record(size, 'streaming', name, seconds, len(sample))
+
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark indicator throughput on deterministic synthetic bars',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmark_indicators.py
+  python benchmark_indicators.py --bars 10000 1000000 10000000 --model regime
+  python benchmark_indicators.py --bars 50000000 --indicators rsi sma --streaming-bars 0 --json bench.json
+        """
+    )
+    parser.add_argument('--bars', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help='Sizes to benchmark')
+    parser.add_argument('--period', default='M1', help='Synthetic bar timeframe (default: M1)')
+    parser.add_argument('--model', default='gbm', choices=synthetic_data.MODELS, help='Price model (default: gbm)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--streaming-bars', type=int, default=100_000,
+                        help='Bars replayed through streaming indicators per size (0 to skip; default: 100000)')
+    parser.add_argument('--indicators', nargs='+', help='Registry indicators to time (default: all)')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Indicator Benchmark - synthetic {args.period} ({args.model}, seed {args.seed})")
+    print("=" * 70)
+    print()
+
+    try:
+        results = run_benchmark(args.bars, args.period.upper(), args.model, args.seed, args.streaming_bars, args.indicators)
+    except (ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print()
+        print(f"Results written to: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,49 +5,45 @@ Phase 4: Data export script matching ExportAligned.mq5 functionality
 Usage:
     python export_aligned.py --symbol EURUSD --period M1 --bars 5000
     python export_aligned.py --symbol XAUUSD --period H1 --bars 5000
+    python export_aligned.py --symbol EURUSD --period M1 --append
+    python export_aligned.py --symbol EURUSD --period M1 --bars 1000000 --format parquet
+    python export_aligned.py --symbol EURUSD --period M1 --from 2015-01-01 --to 2025-01-01 --format parquet
+    python export_aligned.py --symbol EURUSD --period M12 --ticks --from 2025-01-06 --to 2025-01-11 --format parquet
+
+Append mode keeps a <csv>.state.json sidecar with the streaming indicator
+state after the last closed bar. Later --append runs read only the tail of the
+CSV, fetch bars from the last (still-forming) row onwards, advance the
+indicators from the saved state and rewrite just that tail.
+
+Range mode (--from/--to) exports arbitrarily long histories in bounded memory:
+bars are fetched in copy_rates_range windows of --chunk-days, streaming
+indicator state carries across window boundaries, and each window is written
+as its own part file (Export_<symbol>_PERIOD_<period>/part-YYYYMMDD.<fmt>).
+
+Tick mode (--ticks --from/--to) pages copy_ticks_range, stores the raw ticks
+columnar (Ticks_<symbol>/) and aggregates them into bars of any timeframe,
+including custom ones such as M12 or S30, driving the streaming indicators
+tick by tick (indicators/ticks.py). --intrabar also records the indicator
+values of the forming bar at every tick.
+
+Every fetch is checked by a vectorized data-quality scan (indicators/quality.py)
+before indicators run: duplicate or out-of-order bars, inconsistent OHLC and
+unexpected gaps are reported with per-check counts and example bars.
 """
+import os
 import sys
+import json
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import MetaTrader5 as mt5
 import pandas as pd
 import numpy as np
-from indicators.laguerre_rsi import calculate_laguerre_rsi_indicator
-
-
-def calculate_rsi(prices, period=14):
-    """
-    Calculate RSI (Relative Strength Index)
-
-    Formula:
-        RSI = 100 - (100 / (1 + RS))
-        where RS = Average Gain / Average Loss
-
-    Args:
-        prices: pandas Series of close prices
-        period: RSI period (default 14)
-
-    Returns:
-        pandas Series of RSI values
-    """
-    # Calculate price changes
-    delta = prices.diff()
-
-    # Separate gains and losses
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
-
-    # Calculate exponential moving average (Wilder's smoothing)
-    # alpha=1/period is the correct Wilder's method for RSI
-    avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
-
-    # Calculate RS and RSI
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-
-    return rsi
+from indicators import registry
+from indicators.bars import BarSeries
+from indicators.graph import ComputeGraph
+from indicators.quality import scan_rates
+from indicators.ticks import TickBarAggregator, bar_open, parse_bar_seconds
 
 
 def parse_timeframe(period_str):
@@ -73,7 +69,335 @@ def parse_timeframe(period_str):
     return timeframe_map[period_str]
 
 
-def export_data(symbol, period_str, num_bars, output_dir="C:\\Users\\crossover\\exports", laguerre_atr_period=32, laguerre_price_smooth_period=5, laguerre_price_smooth_method='ema'):
+# Bar columns of the MT5 export format (indicator columns follow, see build_export_frame)
+BAR_HEADERS = {'Time': 'time', 'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'tick_volume'}
+TIME_FORMAT = '%Y.%m.%d %H:%M:%S'
+STATE_VERSION = 1
+
+# Output formats: CSV (text, 5 decimals, matches ExportAligned.mq5) or typed
+# columnar files with full float64 precision (Parquet/Feather need pyarrow)
+EXPORT_FORMATS = ('csv', 'parquet', 'feather', 'npz')
+
+
+def default_indicator_params(laguerre_atr_period=32, laguerre_price_smooth_period=5, laguerre_price_smooth_method='ema'):
+    """Indicators exported by default ({registry name: params}): RSI + Laguerre RSI"""
+    return {
+        'rsi': {'period': 14},
+        'laguerre_rsi': {
+            'atr_period': laguerre_atr_period,
+            'price_type': 'close',
+            'price_smooth_period': laguerre_price_smooth_period,
+            'price_smooth_method': laguerre_price_smooth_method,
+        },
+    }
+
+
+def export_filename(symbol, period_str, fmt='csv'):
+    """Export filename matching ExportAligned.mq5 format (extension per output format)"""
+    return f"Export_{symbol}_PERIOD_{period_str}.{fmt}"
+
+
+def format_time(epoch_seconds):
+    """Format an MT5 bar time (epoch seconds) like the CSV Time column"""
+    return pd.Timestamp(int(epoch_seconds), unit='s').strftime(TIME_FORMAT)
+
+
+def build_export_frame(df, results, indicator_params):
+    """
+    Assemble the export table: bar columns plus every registry buffer
+
+    Args:
+        df: Bar DataFrame (BarSeries.to_dataframe()) for the exported rows
+        results: {indicator_name: result DataFrame} aligned on df's index
+        indicator_params: {indicator_name: params}, in column order
+
+    Returns:
+        DataFrame with MT5 export headers (typed; Time is datetime64)
+    """
+    export_df = pd.DataFrame({header: df[col] for header, col in BAR_HEADERS.items()}, index=df.index)
+    for name in indicator_params:
+        for buffer in registry.get_spec(name).buffers:
+            export_df[buffer.column] = results[name][buffer.output]
+    return export_df
+
+
+def select_symbol(symbol):
+    """Add the symbol to Market Watch"""
+    if not mt5.symbol_select(symbol, True):
+        error_code, error_msg = mt5.last_error()
+        raise RuntimeError(
+            f"Failed to select {symbol}\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Symbol may not exist or broker may not offer it"
+        )
+
+
+def fetch_rates(symbol, timeframe, period_str, count):
+    """Fetch the most recent `count` bars (oldest first)"""
+    # Use copy_rates_from_pos - fetches from most recent bar backwards
+    # This is more reliable than date ranges, especially for non-24/7 markets
+    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+
+    if rates is None or len(rates) == 0:
+        error_code, error_msg = mt5.last_error()
+        raise RuntimeError(
+            f"Failed to fetch {symbol} {period_str} data\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Check if symbol has data available for this timeframe"
+        )
+
+    return rates
+
+
+def print_quality(report):
+    """Print a data-quality report (indicators/quality.py) with its example issues"""
+    tag = '[OK]' if report.ok else '[WARN]'
+    print(f"{tag} Quality: {report.summary()} [{report.seconds * 1000:.1f} ms]")
+    for issue in report.issues:
+        print(f"  {issue['check']}: bar {issue['index']} at {format_time(issue['time'])} - {issue['detail']}")
+
+
+def bars_needed(num_bars, indicator_params):
+    """Requested bars plus the declared warmup of the slowest indicator"""
+    warmup = max((registry.warmup_bars(name, params) for name, params in indicator_params.items()), default=0)
+    return num_bars + warmup
+
+
+def compute_export(rates, num_bars, indicator_params):
+    """
+    Calculate indicators over the fetched bars and build the export table
+
+    Args:
+        rates: MT5 rates array (requested bars + warmup)
+        num_bars: Number of most recent bars to export
+        indicator_params: {indicator_name: params}
+
+    Returns:
+        Export DataFrame (see build_export_frame)
+    """
+    # Wrap the MT5 structured array without copying; pandas conversion happens at export
+    bars = BarSeries(rates)
+    output_start = max(0, len(bars) - num_bars)
+
+    # Indicators share intermediates (price diffs, true range) through the compute graph;
+    # warmup bars are discarded below, so indicators that support it may skip writing their outputs
+    graph = ComputeGraph(bars, output_start=output_start)
+    results = graph.evaluate_indicators(indicator_params)
+
+    # Take only the requested number of bars (most recent)
+    return build_export_frame(bars.tail(num_bars).to_dataframe(), results, indicator_params)
+
+
+def format_csv_frame(export_df):
+    """Render Time as text for CSV output"""
+    csv_df = export_df.copy()
+    if 'Time' in csv_df:
+        csv_df['Time'] = csv_df['Time'].dt.strftime(TIME_FORMAT)
+    return csv_df
+
+
+def write_export(export_df, filepath, fmt='csv'):
+    """
+    Write the export table
+
+    Args:
+        export_df: Table from compute_export()/build_export_frame()
+        filepath: Output path
+        fmt: 'csv' (5 decimals, text time), 'parquet'/'feather' (zstd-compressed,
+             requires pyarrow) or 'npz' (compressed NumPy arrays, time as datetime64[s])
+
+    Raises:
+        ValueError: If fmt is not a supported format
+        ImportError: If pyarrow is needed but not installed
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format: {fmt} (valid: {', '.join(EXPORT_FORMATS)})")
+
+    Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == 'csv':
+        format_csv_frame(export_df).to_csv(filepath, index=False, float_format='%.5f')
+    elif fmt == 'npz':
+        columns = {col: export_df[col].to_numpy() for col in export_df.columns}
+        if 'Time' in columns:
+            columns['Time'] = columns['Time'].astype('datetime64[s]')
+        with open(filepath, 'wb') as f:
+            np.savez_compressed(f, **columns)
+    else:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(f"--format {fmt} requires pyarrow (pip install pyarrow)")
+        table = export_df.reset_index(drop=True)
+        if fmt == 'parquet':
+            table.to_parquet(filepath, index=False, compression='zstd')
+        else:
+            table.to_feather(filepath, compression='zstd')
+
+
+def read_csv_tail(filepath, chunk_size=65536):
+    """
+    Locate the last data row of an export without reading the whole file
+
+    Returns:
+        (time_string, byte_offset_of_row) or None if the file has no data rows
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - chunk_size)
+        f.seek(start)
+        chunk = f.read()
+
+    body = chunk.rstrip(b'\r\n')
+    newline = body.rfind(b'\n')
+    if newline < 0:
+        return None  # Header only
+
+    last_time = body[newline + 1:].split(b',', 1)[0].decode()
+    return last_time, start + newline + 1
+
+
+def fetch_rates_since(symbol, timeframe, since, page=256):
+    """
+    Fetch bars with open time >= since (epoch seconds), oldest first
+
+    Pages back from the current bar with copy_rates_from_pos, doubling the
+    page until it reaches `since`, so the cost scales with the new bars only.
+    """
+    count = page
+    while True:
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+        if rates is None or len(rates) == 0:
+            error_code, error_msg = mt5.last_error()
+            raise RuntimeError(
+                f"Failed to fetch {symbol} data\n"
+                f"Error code: {error_code}\n"
+                f"Message: {error_msg}"
+            )
+        if rates[0]['time'] <= since or len(rates) < count:
+            return rates[rates['time'] >= since]
+        count *= 2
+
+
+def streaming_snapshot(rates, indicator_params, states=None):
+    """
+    Advance streaming indicators over all bars but the last (still-forming) one
+
+    Args:
+        rates: MT5 rates array
+        indicator_params: {indicator_name: params}
+        states: Saved {indicator_name: state} to resume from (default: start fresh)
+
+    Returns:
+        (results, snapshot): results {name: DataFrame} for every bar, and the
+        state after the last closed bar
+    """
+    indicators = {
+        name: registry.create_streaming(name, params, state=(states or {}).get(name))
+        for name, params in indicator_params.items()
+    }
+    rows = {name: [] for name in indicators}
+    snapshot = {}
+
+    for i, bar in enumerate(rates):
+        if i == len(rates) - 1:
+            snapshot = {name: ind.state() for name, ind in indicators.items()}
+        for name, ind in indicators.items():
+            rows[name].append(ind.update(bar))
+
+    results = {name: pd.DataFrame(values) for name, values in rows.items()}
+    return results, snapshot
+
+
+def save_export_state(state_path, state):
+    """Write the append-mode sidecar atomically (temp file + rename)"""
+    tmp_path = state_path.with_name(f"{state_path.name}.tmp-{os.getpid()}")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, state_path)
+
+
+def load_export_state(filepath, state_path, symbol, period_str, indicator_params):
+    """
+    Load the append-mode sidecar if it still matches the CSV
+
+    Returns:
+        State dict (with 'tail_offset' of the still-forming row) or None when a
+        full export is required (no CSV/state, different parameters, or the CSV
+        tail no longer matches the saved state)
+    """
+    if not filepath.exists() or not state_path.exists():
+        return None
+
+    try:
+        state = json.loads(state_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if (state.get('version') != STATE_VERSION
+            or state.get('symbol') != symbol
+            or state.get('period') != period_str
+            or state.get('params') != indicator_params):
+        return None
+
+    tail = read_csv_tail(filepath)
+    if tail is None or tail[0] != format_time(state['forming_time']):
+        return None
+
+    state['tail_offset'] = tail[1]
+    return state
+
+
+def append_export(symbol, timeframe, period_str, filepath, state_path, state, indicator_params):
+    """
+    Append bars newer than the last exported row, rewriting the still-forming row
+
+    Returns:
+        Path to the CSV, or None if history changed and a full export is needed
+    """
+    forming_time = state['forming_time']
+    print(f"[4/7] Fetching {symbol} {period_str} bars since {format_time(forming_time)}...")
+    rates = fetch_rates_since(symbol, timeframe, forming_time)
+    if len(rates) == 0 or rates[0]['time'] != forming_time:
+        print(f"[WARN] Last exported bar not found in terminal history")
+        return None
+    print(f"[OK] Fetched {len(rates)} bars ({len(rates) - 1} new)")
+    print()
+
+    print(f"[5/7] Advancing indicators from saved state...")
+    results, snapshot = streaming_snapshot(rates, indicator_params, state['indicators'])
+    df = build_export_frame(BarSeries(rates).to_dataframe(), results, indicator_params)
+    print(f"[OK] Indicators advanced by {len(df)} bars")
+    print()
+
+    print(f"[6/7] Appending to CSV...")
+    text = format_csv_frame(df).to_csv(index=False, header=False, float_format='%.5f', lineterminator=os.linesep)
+
+    # Rewrite from the start of the still-forming row; the state file below is
+    # the commit point, so a torn write is caught by the tail check next run
+    with open(filepath, 'r+b') as f:
+        f.truncate(state['tail_offset'])
+        f.seek(state['tail_offset'])
+        f.write(text.encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+    save_export_state(state_path, {
+        **{k: v for k, v in state.items() if k != 'tail_offset'},
+        'forming_time': int(rates[-1]['time']),
+        'indicators': snapshot,
+    })
+
+    print(f"[OK] Appended to: {filepath}")
+    print(f"  Rows written: {len(df)} (last bar {format_time(rates[-1]['time'])})")
+    print()
+
+    return filepath
+
+
+def export_data(symbol, period_str, num_bars, output_dir="C:\\Users\\crossover\\exports", laguerre_atr_period=32, laguerre_price_smooth_period=5, laguerre_price_smooth_method='ema', append=False, indicator_params=None, fmt='csv'):
     """
     Export MT5 data with RSI to CSV
 
@@ -82,10 +406,21 @@ def export_data(symbol, period_str, num_bars, output_dir="C:\\Users\\crossover\\
         period_str: Timeframe string (e.g., 'M1', 'H1')
         num_bars: Number of bars to fetch
         output_dir: Output directory path
+        append: Extend an existing export from its saved state instead of
+                rewriting it (falls back to a full export when not possible)
+        indicator_params: {registry indicator name: params} to export
+                          (default: RSI + Laguerre RSI from the laguerre_* arguments)
+        fmt: Output format ('csv', 'parquet', 'feather', 'npz'); append mode is CSV only
 
     Returns:
-        Path to exported CSV file
+        Path to exported file
+
+    Raises:
+        ValueError: If append is combined with a non-CSV format
     """
+    if append and fmt != 'csv':
+        raise ValueError(f"--append is only supported for CSV exports (got --format {fmt})")
+
     print("=" * 70)
     print(f"MT5 Data Export - {symbol} {period_str}")
     print("=" * 70)
@@ -107,14 +442,7 @@ def export_data(symbol, period_str, num_bars, output_dir="C:\\Users\\crossover\\
     try:
         # Step 2: Select symbol
         print(f"[2/6] Selecting symbol {symbol}...")
-        if not mt5.symbol_select(symbol, True):
-            error_code, error_msg = mt5.last_error()
-            raise RuntimeError(
-                f"Failed to select {symbol}\n"
-                f"Error code: {error_code}\n"
-                f"Message: {error_msg}\n"
-                f"Symbol may not exist or broker may not offer it"
-            )
+        select_symbol(symbol)
         print(f"[OK] {symbol} selected and added to Market Watch")
         print()
 
@@ -124,94 +452,373 @@ def export_data(symbol, period_str, num_bars, output_dir="C:\\Users\\crossover\\
         print(f"[OK] Timeframe: {period_str}")
         print()
 
+        if indicator_params is None:
+            indicator_params = default_indicator_params(
+                laguerre_atr_period, laguerre_price_smooth_period, laguerre_price_smooth_method
+            )
+
+        output_path = Path(output_dir)
+        filename = export_filename(symbol, period_str, fmt)
+        filepath = output_path / filename
+        state_path = filepath.with_suffix('.state.json')
+
+        if append:
+            state = load_export_state(filepath, state_path, symbol, period_str, indicator_params)
+            if state is not None:
+                appended = append_export(symbol, timeframe, period_str, filepath, state_path, state, indicator_params)
+                if appended is not None:
+                    return appended
+            print(f"[INFO] No usable append state for {filename} - running a full export")
+            print()
+
         # Step 4: Fetch OHLC data
         print(f"[4/6] Fetching {num_bars} bars of {symbol} {period_str} data...")
 
-        # Fetch extra bars for RSI calculation warmup (need 14 bars minimum)
-        bars_to_fetch = num_bars + 50  # Extra buffer for RSI calculation
-
-        # Use copy_rates_from_pos - fetches from most recent bar backwards
-        # This is more reliable than date ranges, especially for non-24/7 markets
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars_to_fetch)
+        # Fetch exactly the declared warmup of the slowest indicator on top of the requested bars
+        bars_to_fetch = bars_needed(num_bars, indicator_params)
+        print(f"  Warmup: {bars_to_fetch - num_bars} bars (fetching {bars_to_fetch})")
 
-        if rates is None or len(rates) == 0:
-            error_code, error_msg = mt5.last_error()
-            raise RuntimeError(
-                f"Failed to fetch {symbol} {period_str} data\n"
-                f"Error code: {error_code}\n"
-                f"Message: {error_msg}\n"
-                f"Check if symbol has data available for this timeframe"
-            )
+        rates = fetch_rates(symbol, timeframe, period_str, bars_to_fetch)
 
         print(f"[OK] Fetched {len(rates)} bars")
         print(f"  Date range: {datetime.fromtimestamp(rates[0]['time'])} to {datetime.fromtimestamp(rates[-1]['time'])}")
+        print_quality(scan_rates(rates, period_str))
         print()
 
         # Step 5: Calculate indicators
         print(f"[5/7] Calculating indicators...")
+        for name, params in indicator_params.items():
+            print(f"  - {registry.get_spec(name).title} ({', '.join(f'{k}={v}' for k, v in params.items())})...")
+
+        export_df = compute_export(rates, num_bars, indicator_params)
+
+        print(f"[OK] Indicators calculated for {len(export_df)} bars")
+        for name in indicator_params:
+            column = registry.get_spec(name).buffers[0].column
+            values = export_df[column]
+            print(f"  {column}: min={values.min():.4f}, max={values.max():.4f}, mean={values.mean():.4f}")
+        print()
+
+        # Step 6: Export
+        print(f"[6/7] Exporting to {fmt.upper()}...")
+        write_export(export_df, filepath, fmt)
+
+        if append:
+            # State after the last closed bar; the newest bar is still forming
+            _, snapshot = streaming_snapshot(rates, indicator_params)
+            save_export_state(state_path, {
+                'version': STATE_VERSION,
+                'symbol': symbol,
+                'period': period_str,
+                'params': indicator_params,
+                'forming_time': int(rates[-1]['time']),
+                'indicators': snapshot,
+            })
+            print(f"[OK] Append state saved: {state_path}")
+        elif state_path.exists():
+            state_path.unlink()  # Stale: no longer matches the rewritten CSV
+
+        print(f"[OK] Exported to: {filepath}")
+        print(f"  Rows: {len(export_df)}")
+        print(f"  Columns: {', '.join(export_df.columns)}")
+        print()
+
+        return filepath
+
+    finally:
+        # Always shutdown MT5
+        print("[7/7] Shutting down MT5...")
+        mt5.shutdown()
+        print("[OK] MT5 shutdown cleanly")
+        print()
+
+
+def prime_streaming(symbol, timeframe, date_from, indicator_params):
+    """
+    Create streaming indicators advanced over the warmup bars before date_from
+
+    Returns:
+        (indicators, primed, warmup): {name: StreamingIndicator}, bars actually
+        available for priming, and the declared warmup
+    """
+    indicators = {name: registry.create_streaming(name, params) for name, params in indicator_params.items()}
+    warmup = bars_needed(0, indicator_params)
+    primer = mt5.copy_rates_from(symbol, timeframe, date_from, warmup + 1)
+    if primer is None or warmup == 0:
+        return indicators, 0, warmup
+
+    primer = primer[primer['time'] < int(date_from.timestamp())][-warmup:]
+    for bar in primer:
+        for ind in indicators.values():
+            ind.update(bar)
+    return indicators, len(primer), warmup
+
+
+def export_range(symbol, period_str, date_from, date_to=None, output_dir="C:\\Users\\crossover\\exports", indicator_params=None, fmt='csv', chunk_days=30):
+    """
+    Export a date range in fixed-size windows with bounded memory
+
+    Streaming indicators are primed with the declared warmup bars before
+    date_from, then advanced window by window; each window's rows are written
+    to a part file as soon as it completes, so peak memory depends on
+    chunk_days, not on the length of the range.
+
+    Args:
+        symbol: Trading symbol (e.g., 'EURUSD', 'XAUUSD')
+        period_str: Timeframe string (e.g., 'M1', 'H1')
+        date_from: First bar time (datetime; naive values are taken as UTC)
+        date_to: End of range (default: now)
+        output_dir: Output directory path (parts go to a subdirectory)
+        indicator_params: {registry indicator name: params} (default: RSI + Laguerre RSI)
+        fmt: Part file format ('csv', 'parquet', 'feather', 'npz')
+        chunk_days: Calendar days per fetch window
 
-        # Convert to DataFrame
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-
-        # Calculate RSI
-        print(f"  - RSI (14-period)...")
-        df['rsi'] = calculate_rsi(df['close'], period=14)
-
-        # Calculate Laguerre RSI
-        print(f"  - Laguerre RSI (ATR period={laguerre_atr_period}, smoothing={laguerre_price_smooth_method}({laguerre_price_smooth_period}))...")
-        laguerre_result = calculate_laguerre_rsi_indicator(
-            df,
-            atr_period=laguerre_atr_period,
-            price_type='close',
-            price_smooth_period=laguerre_price_smooth_period,
-            price_smooth_method=laguerre_price_smooth_method
+    Returns:
+        Path to the partition directory
+
+    Raises:
+        ValueError: If the range or chunk size is invalid
+    """
+    if date_from.tzinfo is None:
+        date_from = date_from.replace(tzinfo=timezone.utc)
+    date_to = date_to or datetime.now(timezone.utc)
+    if date_to.tzinfo is None:
+        date_to = date_to.replace(tzinfo=timezone.utc)
+    if date_to <= date_from:
+        raise ValueError(f"Invalid range: {date_from} .. {date_to}")
+    if chunk_days < 1:
+        raise ValueError(f"chunk_days must be >= 1, got {chunk_days}")
+
+    indicator_params = indicator_params or default_indicator_params()
+
+    print("=" * 70)
+    print(f"MT5 Range Export - {symbol} {period_str} {date_from:%Y-%m-%d} .. {date_to:%Y-%m-%d}")
+    print("=" * 70)
+    print()
+
+    print(f"[1/4] Initializing MT5 connection...")
+    if not mt5.initialize():
+        error_code, error_msg = mt5.last_error()
+        raise ConnectionError(
+            f"MT5 initialization failed\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Ensure MT5 terminal is running and logged in"
         )
+    print(f"[OK] MT5 initialized")
+    print()
 
-        df['laguerre_rsi'] = laguerre_result['laguerre_rsi']
-        df['laguerre_signal'] = laguerre_result['signal']
-        df['adaptive_period'] = laguerre_result['adaptive_period']
-        df['atr'] = laguerre_result['atr']
+    try:
+        select_symbol(symbol)
+        timeframe = parse_timeframe(period_str)
+
+        # Prime the streaming indicators with the warmup bars preceding the range
+        print(f"[2/4] Priming indicators...")
+        indicators, primed, warmup = prime_streaming(symbol, timeframe, date_from, indicator_params)
+        start_time = int(date_from.timestamp())
+        print(f"[OK] Primed with {primed} of {warmup} warmup bars")
+        print()
+
+        print(f"[3/4] Exporting in {chunk_days}-day windows...")
+        part_dir = Path(output_dir) / Path(export_filename(symbol, period_str)).stem
+        part_dir.mkdir(parents=True, exist_ok=True)
+
+        window_start = date_from
+        last_time = start_time - 1
+        parts = 0
+        total = 0
+        quality = None
+        while window_start < date_to:
+            window_end = min(window_start + timedelta(days=chunk_days), date_to)
+            rates = mt5.copy_rates_range(symbol, timeframe, window_start, window_end)
+            window_start = window_end
+
+            if rates is None:
+                error_code, error_msg = mt5.last_error()
+                raise RuntimeError(
+                    f"Failed to fetch {symbol} {period_str} range\n"
+                    f"Error code: {error_code}\n"
+                    f"Message: {error_msg}"
+                )
+
+            # Window edges are inclusive; drop bars already exported
+            rates = rates[rates['time'] > last_time]
+            if len(rates) == 0:
+                continue
+            window_quality = scan_rates(rates, period_str, previous_time=last_time if parts else None)
+            quality = window_quality if quality is None else quality.combine(window_quality)
+            last_time = int(rates[-1]['time'])
+
+            results = {name: ind.run(rates) for name, ind in indicators.items()}
+            export_df = build_export_frame(BarSeries(rates).to_dataframe(), results, indicator_params)
 
-        # Take only the requested number of bars (most recent)
-        df = df.tail(num_bars)
+            part_path = part_dir / f"part-{format_time(rates[0]['time'])[:10].replace('.', '')}.{fmt}"
+            write_export(export_df, part_path, fmt)
+            parts += 1
+            total += len(rates)
+            print(f"  {part_path.name}: {len(rates)} bars ({format_time(rates[0]['time'])} .. {format_time(rates[-1]['time'])})")
 
-        print(f"[OK] Indicators calculated for {len(df)} bars")
-        print(f"  RSI: min={df['rsi'].min():.2f}, max={df['rsi'].max():.2f}, mean={df['rsi'].mean():.2f}")
-        print(f"  Laguerre RSI: min={df['laguerre_rsi'].min():.4f}, max={df['laguerre_rsi'].max():.4f}, mean={df['laguerre_rsi'].mean():.4f}")
+        print(f"[OK] {total} bars in {parts} parts")
+        if quality is not None:
+            print_quality(quality)
         print()
 
-        # Step 6: Export to CSV
-        print(f"[6/7] Exporting to CSV...")
+        return part_dir
 
-        # Create output directory if it doesn't exist
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+    finally:
+        print("[4/4] Shutting down MT5...")
+        mt5.shutdown()
+        print("[OK] MT5 shutdown cleanly")
+        print()
 
-        # Generate filename matching ExportAligned.mq5 format
-        filename = f"Export_{symbol}_PERIOD_{period_str}.csv"
-        filepath = output_path / filename
 
-        # Select and rename columns to match MT5 export format
-        export_df = df[['time', 'open', 'high', 'low', 'close', 'tick_volume', 'rsi', 'laguerre_rsi', 'laguerre_signal', 'adaptive_period', 'atr']].copy()
-        export_df.columns = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume', 'RSI', 'Laguerre_RSI', 'Laguerre_Signal', 'Adaptive_Period', 'ATR']
+def export_ticks(symbol, timeframe_str, date_from, date_to=None, output_dir="C:\\Users\\crossover\\exports", indicator_params=None, fmt='parquet', page_minutes=60, price='bid', intrabar=False):
+    """
+    Export raw ticks and the bars aggregated from them, in bounded memory
 
-        # Format time column
-        export_df['Time'] = export_df['Time'].dt.strftime('%Y.%m.%d %H:%M:%S')
+    Ticks are fetched in copy_ticks_range pages of page_minutes and written
+    as-is (MqlTick fields) to Ticks_<symbol>/; each page also feeds a
+    streaming TickBarAggregator whose closed bars, with streaming indicator
+    values, go to Export_<symbol>_PERIOD_<timeframe>/. Only one page and the
+    forming bar are held in memory, so multi-day ranges of 10M+ ticks are
+    fine. With intrabar=True the indicators are also evaluated on the
+    forming bar at every tick (Intrabar_<symbol>_PERIOD_<timeframe>/).
 
-        # Export to CSV
-        export_df.to_csv(filepath, index=False, float_format='%.5f')
+    Args:
+        symbol: Trading symbol (e.g., 'EURUSD')
+        timeframe_str: Bar timeframe, MT5 (M1, H1, ...) or custom (S30, M12, H2, ...)
+        date_from: Start of range (datetime; naive values are taken as UTC), moved back
+            to the open of the bar containing it so the first bar is complete
+        date_to: End of range, exclusive (default: now)
+        output_dir: Output directory path (parts go to subdirectories)
+        indicator_params: {registry indicator name: params} (default: RSI + Laguerre RSI)
+        fmt: Part file format ('csv', 'parquet', 'feather', 'npz')
+        page_minutes: Minutes of ticks per copy_ticks_range page
+        price: Tick price the bars are built from ('bid', 'ask', 'last')
+        intrabar: Also write per-tick indicator values of the forming bar
 
-        print(f"[OK] Exported to: {filepath}")
-        print(f"  Rows: {len(export_df)}")
-        print(f"  Columns: {', '.join(export_df.columns)}")
+    Returns:
+        Path to the bar partition directory
+
+    Raises:
+        ValueError: If the range, timeframe or page size is invalid
+    """
+    if date_from.tzinfo is None:
+        date_from = date_from.replace(tzinfo=timezone.utc)
+    date_to = date_to or datetime.now(timezone.utc)
+    if date_to.tzinfo is None:
+        date_to = date_to.replace(tzinfo=timezone.utc)
+    if date_to <= date_from:
+        raise ValueError(f"Invalid range: {date_from} .. {date_to}")
+    if page_minutes < 1:
+        raise ValueError(f"page_minutes must be >= 1, got {page_minutes}")
+
+    bar_seconds = parse_bar_seconds(timeframe_str)
+    indicator_params = indicator_params or default_indicator_params()
+
+    # A --from inside a bar would split it: priming would use the whole MT5 bar and
+    # the ticks would rebuild it again from date_from on, so start at its open instead
+    first_open = int(bar_open(int(date_from.timestamp()), bar_seconds))
+    if first_open != int(date_from.timestamp()):
+        date_from = datetime.fromtimestamp(first_open, timezone.utc)
+
+    print("=" * 70)
+    print(f"MT5 Tick Export - {symbol} {timeframe_str} {date_from:%Y-%m-%d %H:%M} .. {date_to:%Y-%m-%d %H:%M}")
+    print("=" * 70)
+    print()
+
+    print(f"[1/4] Initializing MT5 connection...")
+    if not mt5.initialize():
+        error_code, error_msg = mt5.last_error()
+        raise ConnectionError(
+            f"MT5 initialization failed\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Ensure MT5 terminal is running and logged in"
+        )
+    print(f"[OK] MT5 initialized")
+    print()
+
+    try:
+        select_symbol(symbol)
+        info = mt5.symbol_info(symbol)
+        point = info.point if info is not None else None
+
+        # Standard timeframes can be primed from MT5 bars; custom ones start cold
+        print(f"[2/4] Priming indicators...")
+        try:
+            timeframe = parse_timeframe(timeframe_str)
+        except ValueError:
+            timeframe = None
+        if timeframe is not None:
+            indicators, primed, warmup = prime_streaming(symbol, timeframe, date_from, indicator_params)
+            print(f"[OK] Primed with {primed} of {warmup} warmup bars")
+        else:
+            indicators = {name: registry.create_streaming(name, params) for name, params in indicator_params.items()}
+            print(f"[WARN] Custom timeframe {timeframe_str}: no MT5 bars to prime from, "
+                  f"first {bars_needed(0, indicator_params)} bars are warmup")
         print()
 
-        return filepath
+        aggregator = TickBarAggregator(bar_seconds, indicators, price=price, point=point, intrabar=intrabar)
+        base = Path(output_dir)
+        bar_dir = base / Path(export_filename(symbol, timeframe_str)).stem
+        tick_dir = base / f"Ticks_{symbol}"
+        intrabar_dir = base / f"Intrabar_{symbol}_PERIOD_{timeframe_str}"
+
+        def part_name(epoch_seconds):
+            return f"part-{pd.Timestamp(int(epoch_seconds), unit='s'):%Y%m%d-%H%M}.{fmt}"
+
+        def write_batch(batch):
+            if len(batch.bars):
+                export_df = build_export_frame(BarSeries(batch.bars).to_dataframe(), batch.bar_values, indicator_params)
+                write_export(export_df, bar_dir / part_name(batch.bars[0]['time']), fmt)
+            if batch.tick_values is not None and len(batch.tick_time_msc):
+                intrabar_df = pd.DataFrame({'time_msc': batch.tick_time_msc})
+                for name in indicator_params:
+                    for buffer in registry.get_spec(name).buffers:
+                        intrabar_df[buffer.column] = batch.tick_values[name][buffer.output].to_numpy()
+                write_export(intrabar_df, intrabar_dir / part_name(batch.tick_time_msc[0] // 1000), fmt)
+            return len(batch.bars)
+
+        print(f"[3/4] Exporting ticks in {page_minutes}-minute pages...")
+        window_start = date_from
+        total_ticks = 0
+        total_bars = 0
+        while window_start < date_to:
+            window_end = min(window_start + timedelta(minutes=page_minutes), date_to)
+            ticks = mt5.copy_ticks_range(symbol, window_start, window_end, mt5.COPY_TICKS_ALL)
+
+            if ticks is None:
+                error_code, error_msg = mt5.last_error()
+                raise RuntimeError(
+                    f"Failed to fetch {symbol} ticks\n"
+                    f"Error code: {error_code}\n"
+                    f"Message: {error_msg}"
+                )
+
+            # Keep [window_start, window_end) so adjacent pages never overlap
+            start_ms = int(window_start.timestamp() * 1000)
+            end_ms = int(window_end.timestamp() * 1000)
+            msc = ticks['time_msc']
+            ticks = ticks[(msc >= start_ms) & (msc < end_ms)]
+            window_start = window_end
+            if len(ticks) == 0:
+                continue
+
+            write_export(pd.DataFrame(ticks), tick_dir / part_name(ticks[0]['time']), fmt)
+            bars = write_batch(aggregator.add(ticks))
+            total_ticks += len(ticks)
+            total_bars += bars
+            print(f"  {format_time(ticks[0]['time'])}: {len(ticks)} ticks, {bars} bars closed")
+
+        total_bars += write_batch(aggregator.flush())
+        print(f"[OK] {total_ticks} ticks, {total_bars} bars")
+        print()
+
+        return bar_dir
 
     finally:
-        # Always shutdown MT5
-        print("[7/7] Shutting down MT5...")
+        print("[4/4] Shutting down MT5...")
         mt5.shutdown()
         print("[OK] MT5 shutdown cleanly")
         print()
@@ -227,6 +834,10 @@ Examples:
   python export_aligned.py --symbol EURUSD --period M1 --bars 5000
   python export_aligned.py --symbol XAUUSD --period H1 --bars 5000
   python export_aligned.py --symbol GBPUSD --period H4 --bars 1000
+  python export_aligned.py --symbol EURUSD --period M1 --append
+  python export_aligned.py --symbol EURUSD --period M1 --bars 1000000 --format parquet
+  python export_aligned.py --symbol EURUSD --period M1 --from 2015-01-01 --to 2025-01-01 --format parquet
+  python export_aligned.py --symbol EURUSD --period M12 --ticks --from 2025-01-06 --to 2025-01-11 --intrabar
 
 Valid periods: M1, M5, M15, M30, H1, H4, D1, W1, MN1
         """
@@ -257,6 +868,67 @@ Valid periods: M1, M5, M15, M30, H1, H4, D1, W1, MN1
         help='Output directory (default: C:\\Users\\crossover\\exports)'
     )
 
+    parser.add_argument(
+        '--format',
+        default='csv',
+        choices=EXPORT_FORMATS,
+        help='Output format (default: csv; parquet/feather keep full precision and need pyarrow)'
+    )
+
+    parser.add_argument(
+        '--from',
+        dest='date_from',
+        type=datetime.fromisoformat,
+        help='Export a date range (YYYY-MM-DD, UTC) in bounded-memory windows instead of --bars'
+    )
+
+    parser.add_argument(
+        '--to',
+        dest='date_to',
+        type=datetime.fromisoformat,
+        help='End of the --from range (default: now)'
+    )
+
+    parser.add_argument(
+        '--chunk-days',
+        type=int,
+        default=30,
+        help='Calendar days per fetch window in range mode (default: 30)'
+    )
+
+    parser.add_argument(
+        '--ticks',
+        action='store_true',
+        help='Tick mode (needs --from): export ticks and build --period bars from them; '
+             '--period may be custom (S30, M12, H2)'
+    )
+
+    parser.add_argument(
+        '--page-minutes',
+        type=int,
+        default=60,
+        help='Minutes of ticks per fetch page in tick mode (default: 60)'
+    )
+
+    parser.add_argument(
+        '--tick-price',
+        default='bid',
+        choices=['bid', 'ask', 'last'],
+        help='Tick price bars are built from in tick mode (default: bid)'
+    )
+
+    parser.add_argument(
+        '--intrabar',
+        action='store_true',
+        help='Tick mode: also export indicator values of the forming bar at every tick'
+    )
+
+    parser.add_argument(
+        '--append',
+        action='store_true',
+        help='Append new bars to an existing export using saved indicator state'
+    )
+
     parser.add_argument(
         '--laguerre-atr-period',
         type=int,
@@ -280,16 +952,54 @@ Valid periods: M1, M5, M15, M30, H1, H4, D1, W1, MN1
 
     args = parser.parse_args()
 
+    if args.date_from is not None and args.append:
+        parser.error("--from cannot be combined with --append")
+    if args.ticks and args.date_from is None:
+        parser.error("--ticks requires --from")
+    if args.intrabar and not args.ticks:
+        parser.error("--intrabar requires --ticks")
+
+    indicator_params = default_indicator_params(
+        args.laguerre_atr_period, args.laguerre_price_smooth_period, args.laguerre_price_smooth_method
+    )
+
     try:
-        filepath = export_data(
-            symbol=args.symbol.upper(),
-            period_str=args.period.upper(),
-            num_bars=args.bars,
-            output_dir=args.output,
-            laguerre_atr_period=args.laguerre_atr_period,
-            laguerre_price_smooth_period=args.laguerre_price_smooth_period,
-            laguerre_price_smooth_method=args.laguerre_price_smooth_method
-        )
+        if args.ticks:
+            filepath = export_ticks(
+                symbol=args.symbol.upper(),
+                timeframe_str=args.period.upper(),
+                date_from=args.date_from,
+                date_to=args.date_to,
+                output_dir=args.output,
+                indicator_params=indicator_params,
+                fmt=args.format,
+                page_minutes=args.page_minutes,
+                price=args.tick_price,
+                intrabar=args.intrabar
+            )
+        elif args.date_from is not None:
+            filepath = export_range(
+                symbol=args.symbol.upper(),
+                period_str=args.period.upper(),
+                date_from=args.date_from,
+                date_to=args.date_to,
+                output_dir=args.output,
+                indicator_params=indicator_params,
+                fmt=args.format,
+                chunk_days=args.chunk_days
+            )
+        else:
+            filepath = export_data(
+                symbol=args.symbol.upper(),
+                period_str=args.period.upper(),
+                num_bars=args.bars,
+                output_dir=args.output,
+                laguerre_atr_period=args.laguerre_atr_period,
+                laguerre_price_smooth_period=args.laguerre_price_smooth_period,
+                laguerre_price_smooth_method=args.laguerre_price_smooth_method,
+                append=args.append,
+                fmt=args.format
+            )
 
         print("=" * 70)
         print("Export completed successfully!")
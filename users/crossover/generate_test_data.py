@@ -33,6 +33,7 @@ def main():
         import MetaTrader5 as mt5
         import pandas as pd
         import numpy as np
+        from indicators.cci import CCIFamily
     except ImportError as e:
         print(f"ERROR: Missing dependency: {e}")
         print("Required: MetaTrader5, pandas, numpy")
@@ -108,27 +109,13 @@ def main():
     # CCI parameters (match indicator defaults)
     cci_period = 20
 
-    # Calculate typical price
-    df['tp'] = (df['high'] + df['low'] + df['close']) / 3
-
-    # Calculate SMA of typical price
-    df['sma_tp'] = df['tp'].rolling(window=cci_period).mean()
-
-    # Calculate mean absolute deviation
-    def mad(x):
-        """Mean Absolute Deviation."""
-        if len(x) < 2:
-            return 0.0
-        mean = x.mean()
-        return np.abs(x - mean).mean()
-
-    df['mad_tp'] = df['tp'].rolling(window=cci_period).apply(mad, raw=False)
-
-    # Calculate CCI
-    df['cci'] = (df['tp'] - df['sma_tp']) / (0.015 * df['mad_tp'])
-
-    # Handle division by zero
-    df['cci'] = df['cci'].replace([np.inf, -np.inf], np.nan)
+    # Typical price, SMA, MAD and CCI computed once by the CCI family engine
+    # (matches iCCI: CCI = 0.0 where mean absolute deviation is zero)
+    cci_family = CCIFamily(df['high'], df['low'], df['close'])
+    df['tp'] = cci_family.tp
+    df['sma_tp'] = cci_family.sma(cci_period)
+    df['mad_tp'] = cci_family.mad(cci_period)
+    df['cci'] = cci_family.cci(cci_period)
 
     # Count valid CCI values
     valid_cci = df['cci'].notna().sum()
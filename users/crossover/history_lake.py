@@ -0,0 +1,412 @@
+"""
+history_lake.py - Local partitioned bar store shared by the export and validation scripts
+
+Bars are stored once, partitioned by symbol / timeframe / month:
+
+    <lake>/manifest.json                 partition index (rows, first/last bar time)
+    <lake>/EURUSD/M1/2024-01.npy         MqlRates structured array (memory-mapped)
+    <lake>/EURUSD/M1/2024-02.npy
+    <lake>/XAUUSD/H1/2024-01.parquet     (lakes created with fmt='parquet')
+
+Ingestion is append-only and deduplicates on bar time: incoming bars are
+merged into their month partitions, a bar whose time already exists
+replaces the stored one (the latest fetch wins, which updates a bar that
+was still forming), and only partitions that actually change are rewritten.
+Export files are imported with replace=False: their CSV-rounded rows lack
+spread and real_volume, so they only fill bar times the lake does not have.
+Files and the manifest are replaced atomically. Range reads consult the
+manifest and open only the partitions overlapping the range.
+
+Readers:
+    lake = HistoryLake('history')
+    rates = lake.read('EURUSD', 'M1', start=datetime(2024, 1, 1), end=datetime(2024, 3, 1))
+    bars = BarSeries(lake.tail('EURUSD', 'M1', 5000))
+    python mt5_offline.py --store history export_aligned.py ...   # lake served as MT5
+    python validate_indicator.py --csv Export_EURUSD_PERIOD_M1.csv --lake history
+
+Usage:
+    python history_lake.py ingest --lake history --symbol EURUSD --period M1 --bars 100000
+    python history_lake.py import --lake history exports/Export_EURUSD_PERIOD_M1.csv
+    python history_lake.py info --lake history
+
+A lake has one writer at a time; any number of processes may read.
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from indicators.bars import RATES_DTYPE, BarSeries
+from indicators.ticks import parse_bar_seconds
+
+
+LAKE_VERSION = 1
+LAKE_FORMATS = ('npy', 'parquet')
+MANIFEST = 'manifest.json'
+
+
+def normalize_period(period):
+    """Upper-case timeframe name (M1, H4, MN1, custom S30/M12, ...)
+
+    Raises:
+        ValueError: If the timeframe is malformed
+    """
+    period = period.upper()
+    if period != 'MN1':
+        parse_bar_seconds(period)
+    return period
+
+
+def to_epoch(value):
+    """Seconds since epoch for a datetime (naive = UTC), pandas Timestamp or number"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, pd.Timestamp)):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def as_rates(rates):
+    """Copy of a structured array in RATES_DTYPE (missing fields are zero)"""
+    converted = np.zeros(len(rates), dtype=RATES_DTYPE)
+    for name in RATES_DTYPE.names:
+        if name in rates.dtype.names:
+            converted[name] = rates[name]
+    return converted
+
+
+def dedupe_last(rates):
+    """Sort by time, keeping the last occurrence of each bar time"""
+    if len(rates) < 2:
+        return rates
+    reversed_times = rates['time'][::-1]
+    _, first_in_reversed = np.unique(reversed_times, return_index=True)
+    return rates[len(rates) - 1 - first_in_reversed]
+
+
+class HistoryLake:
+    """
+    Partitioned bar store (see module docstring)
+
+    Args:
+        root: Lake directory (created on first ingest)
+        fmt: Partition format for a new lake ('npy' memory-mapped or 'parquet');
+             an existing lake keeps its format
+    """
+
+    def __init__(self, root, fmt='npy'):
+        if fmt not in LAKE_FORMATS:
+            raise ValueError(f"Invalid lake format: {fmt} (valid: {', '.join(LAKE_FORMATS)})")
+
+        self.root = Path(root)
+        manifest_path = self.root / MANIFEST
+        if manifest_path.exists():
+            self.manifest = json.loads(manifest_path.read_text())
+            if self.manifest.get('version') != LAKE_VERSION:
+                raise ValueError(f"{manifest_path}: unsupported lake version {self.manifest.get('version')}")
+        else:
+            self.manifest = {'version': LAKE_VERSION, 'format': fmt, 'partitions': {}}
+        self.fmt = self.manifest['format']
+
+    @staticmethod
+    def is_lake(root):
+        """True if root contains a lake manifest"""
+        return (Path(root) / MANIFEST).exists()
+
+    # -- index --------------------------------------------------------------
+
+    def symbols(self):
+        return sorted({key.split('/')[0] for key in self.manifest['partitions']})
+
+    def periods(self, symbol):
+        prefix = f"{symbol.upper()}/"
+        return sorted({key.split('/')[1] for key in self.manifest['partitions'] if key.startswith(prefix)})
+
+    def partitions(self, symbol, period):
+        """[(month, meta)] of one series in time order; meta has rows, first, last, file"""
+        prefix = f"{symbol.upper()}/{normalize_period(period)}/"
+        return sorted(
+            (key[len(prefix):], meta) for key, meta in self.manifest['partitions'].items() if key.startswith(prefix)
+        )
+
+    def _save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / MANIFEST
+        tmp = path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+
+    # -- partition files ----------------------------------------------------
+
+    def _load_partition(self, meta, mmap=True):
+        path = self.root / meta['file']
+        if self.fmt == 'npy':
+            return np.load(path, mmap_mode='r' if mmap else None)
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        rates = np.zeros(table.num_rows, dtype=RATES_DTYPE)
+        for name in RATES_DTYPE.names:
+            rates[name] = table.column(name).to_numpy()
+        return rates
+
+    def _write_partition(self, relative, rates):
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        if self.fmt == 'npy':
+            with open(tmp, 'wb') as f:
+                np.save(f, rates)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.table({name: rates[name] for name in RATES_DTYPE.names}), tmp, compression='zstd')
+        os.replace(tmp, path)
+
+    # -- ingestion ----------------------------------------------------------
+
+    def ingest(self, symbol, period, rates, replace=True):
+        """
+        Merge bars into the lake (deduplicated on time)
+
+        Args:
+            symbol: Trading symbol
+            period: Timeframe name
+            rates: Structured array with MqlRates fields (any order, may overlap stored bars)
+            replace: Incoming bars replace stored bars with the same time; if False,
+                     only bar times the lake does not have are added
+
+        Returns:
+            Dict with added, replaced and written (partitions rewritten)
+        """
+        symbol = symbol.upper()
+        period = normalize_period(period)
+        incoming = dedupe_last(as_rates(rates))
+        stats = {'added': 0, 'replaced': 0, 'written': 0}
+        if len(incoming) == 0:
+            return stats
+
+        months = incoming['time'].astype('datetime64[s]').astype('datetime64[M]')
+        starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        ends = np.r_[starts[1:], len(incoming)]
+
+        for start, end in zip(starts, ends):
+            month = str(months[start])
+            key = f"{symbol}/{period}/{month}"
+            new = incoming[start:end]
+            meta = self.manifest['partitions'].get(key)
+
+            if meta is None:
+                merged = new
+                stats['added'] += len(new)
+            else:
+                stored = self._load_partition(meta, mmap=False)
+                times = stored['time']
+                if new['time'][0] > times[-1]:
+                    merged = np.concatenate([stored, new])  # Pure append
+                    stats['added'] += len(new)
+                else:
+                    pos = np.searchsorted(times, new['time'])
+                    found = pos < len(times)
+                    found[found] = times[pos[found]] == new['time'][found]
+                    changed = found.copy()
+                    changed[found] = stored[pos[found]] != new[found]
+                    if not replace:
+                        new = new[~found]
+                        changed[:] = False
+                    if found.all() and not changed.any():
+                        continue  # Nothing new in this partition
+                    merged = dedupe_last(np.concatenate([stored, new]))
+                    stats['added'] += int((~found).sum())
+                    stats['replaced'] += int(changed.sum())
+
+            relative = f"{key}.{self.fmt}"
+            self._write_partition(relative, merged)
+            self.manifest['partitions'][key] = {
+                'file': relative,
+                'rows': int(len(merged)),
+                'first': int(merged['time'][0]),
+                'last': int(merged['time'][-1]),
+            }
+            stats['written'] += 1
+
+        if stats['written']:
+            self._save_manifest()
+        return stats
+
+    # -- reads --------------------------------------------------------------
+
+    def read(self, symbol, period, start=None, end=None):
+        """
+        Bars with start <= time <= end, touching only overlapping partitions
+
+        Args:
+            start, end: datetime (naive = UTC) or epoch seconds; None = unbounded
+
+        Returns:
+            RATES_DTYPE array (oldest first)
+        """
+        start, end = to_epoch(start), to_epoch(end)
+        pieces = []
+        for _, meta in self.partitions(symbol, period):
+            if (start is not None and meta['last'] < start) or (end is not None and meta['first'] > end):
+                continue
+            rates = self._load_partition(meta)
+            lo = 0 if start is None else np.searchsorted(rates['time'], start, side='left')
+            hi = len(rates) if end is None else np.searchsorted(rates['time'], end, side='right')
+            pieces.append(rates[lo:hi])
+        if not pieces:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        return np.concatenate(pieces)
+
+    def tail(self, symbol, period, count, end=None):
+        """The last `count` bars with time <= end (default: the newest bars)"""
+        end = to_epoch(end)
+        pieces = []
+        needed = count
+        for _, meta in reversed(self.partitions(symbol, period)):
+            if needed <= 0:
+                break
+            if end is not None and meta['first'] > end:
+                continue
+            rates = self._load_partition(meta)
+            hi = len(rates) if end is None else np.searchsorted(rates['time'], end, side='right')
+            piece = rates[max(0, hi - needed):hi]
+            pieces.append(piece)
+            needed -= len(piece)
+        if not pieces:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        return np.concatenate(pieces[::-1])
+
+    def read_frame(self, symbol, period, start=None, end=None):
+        """read() as a bar DataFrame (time as datetime64)"""
+        return BarSeries(self.read(symbol, period, start, end)).to_dataframe()
+
+
+def parse_export_name(path):
+    """(symbol, period) from an export file name (Export_<SYMBOL>_PERIOD_<PERIOD>.<ext>)
+
+    Returns:
+        (symbol, period); either is None if the name does not follow the pattern
+    """
+    parts = Path(path).stem.split('_')
+    symbol = parts[1] if len(parts) > 1 else None
+    if 'PERIOD' in parts[2:]:
+        index = parts.index('PERIOD', 2)
+        period = parts[index + 1] if index + 1 < len(parts) else None
+    else:
+        period = parts[2] if len(parts) > 2 else None
+    return symbol, period
+
+
+def ingest_from_mt5(lake, symbol, period, num_bars):
+    """Fetch the most recent num_bars from MT5 and ingest them"""
+    import MetaTrader5 as mt5
+    import export_aligned
+
+    if not mt5.initialize():
+        error_code, error_msg = mt5.last_error()
+        raise ConnectionError(
+            f"MT5 initialization failed\n"
+            f"Error code: {error_code}\n"
+            f"Message: {error_msg}\n"
+            f"Ensure MT5 terminal is running and logged in"
+        )
+    try:
+        export_aligned.select_symbol(symbol)
+        timeframe = export_aligned.parse_timeframe(period)
+        rates = export_aligned.fetch_rates(symbol, timeframe, period, num_bars)
+    finally:
+        mt5.shutdown()
+    return lake.ingest(symbol, period, rates)
+
+
+def ingest_export_file(lake, path):
+    """Ingest the bar columns of an export file (CSV/Parquet/Feather/NPZ), keeping bars already stored"""
+    from validate_indicator import load_mql5_csv
+
+    symbol, period = parse_export_name(path)
+    if symbol is None or period is None:
+        raise ValueError(f"Cannot infer symbol/period from {path} (expected Export_<SYMBOL>_PERIOD_<PERIOD>)")
+
+    df = load_mql5_csv(path, buffer_prefixes=[])
+    rates = np.zeros(len(df), dtype=RATES_DTYPE)
+    rates['time'] = df['time'].to_numpy().astype('datetime64[s]').astype(np.int64)
+    for name in ('open', 'high', 'low', 'close'):
+        rates[name] = df[name].to_numpy()
+    if 'volume' in df.columns:
+        rates['tick_volume'] = df['volume'].to_numpy()
+    return symbol, period, lake.ingest(symbol, period, rates, replace=False)
+
+
+def print_info(lake):
+    """Print per-series partition counts, rows and time span"""
+    print(f"{'Symbol':<10} {'Period':<7} {'Parts':>6} {'Rows':>12}  Range")
+    print("-" * 70)
+    for symbol in lake.symbols():
+        for period in lake.periods(symbol):
+            parts = lake.partitions(symbol, period)
+            rows = sum(meta['rows'] for _, meta in parts)
+            first = pd.Timestamp(parts[0][1]['first'], unit='s')
+            last = pd.Timestamp(parts[-1][1]['last'], unit='s')
+            print(f"{symbol:<10} {period:<7} {len(parts):>6} {rows:>12,}  {first} .. {last}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Local partitioned bar store (symbol / timeframe / month)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python history_lake.py ingest --lake history --symbol EURUSD --period M1 --bars 100000
+  python history_lake.py import --lake history exports/Export_EURUSD_PERIOD_M1.csv
+  python history_lake.py info --lake history
+        """
+    )
+    # Lake options follow the subcommand (history_lake.py info --lake history)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--lake', default='history', help='Lake directory (default: ./history)')
+    common.add_argument('--format', default='npy', choices=LAKE_FORMATS, help='Partition format for a new lake (default: npy)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', parents=[common], help='Fetch recent bars from MT5')
+    ingest.add_argument('--symbol', required=True, help='Trading symbol')
+    ingest.add_argument('--period', required=True, help='Timeframe (M1, M5, ..., MN1)')
+    ingest.add_argument('--bars', type=int, default=100_000, help='Bars to fetch (default: 100000)')
+
+    imports = commands.add_parser('import', parents=[common], help='Ingest bar columns of export files (adds missing bars only)')
+    imports.add_argument('files', nargs='+', help='Export_<SYMBOL>_PERIOD_<PERIOD>.* files')
+
+    commands.add_parser('info', parents=[common], help='Show stored series')
+
+    args = parser.parse_args()
+
+    try:
+        lake = HistoryLake(args.lake, fmt=args.format)
+        if args.command == 'ingest':
+            stats = ingest_from_mt5(lake, args.symbol.upper(), args.period.upper(), args.bars)
+            print(f"[OK] {args.symbol.upper()} {args.period.upper()}: {stats['added']} added, "
+                  f"{stats['replaced']} replaced, {stats['written']} partitions written")
+        elif args.command == 'import':
+            for path in args.files:
+                symbol, period, stats = ingest_export_file(lake, path)
+                print(f"[OK] {Path(path).name} -> {symbol} {period}: {stats['added']} added, "
+                      f"{stats['replaced']} replaced, {stats['written']} partitions written")
+        else:
+            print_info(lake)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Array-Backed Bar Container.
+
+Python counterpart of the BarSeries struct in DataExport/DataExportCore.mqh
+(MqlRates data[] + count). mt5.copy_rates_from_pos() and friends return a
+NumPy structured array; BarSeries wraps its fields as zero-copy strided views
+instead of copying them into a DataFrame (and again for pd.to_datetime):
+
+    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 5000)
+    bars = BarSeries(rates)
+    bars.close          # float64 view into rates, no copy
+    bars.times          # time as datetime64[s], also a view
+
+Indicator kernels accept a BarSeries wherever they take a bar DataFrame:
+bars['close'] returns a pandas Series over the same memory, and `columns`,
+`index` and len() behave like the DataFrame equivalents. Conversion to a real
+DataFrame happens only at the edges (CSV export) via to_dataframe().
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import numpy as np
+import pandas as pd
+
+
+# MqlRates layout as returned by the MetaTrader5 package (packed, 60 bytes)
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+BAR_FIELDS = RATES_DTYPE.names
+
+
+class BarSeries:
+    """Zero-copy view over an MT5 rates structured array.
+
+    Attributes:
+        data: Underlying structured array (MqlRates records, oldest first)
+        count: Number of bars
+        index: Bar positions (RangeIndex; slices keep their original positions)
+        time, open, high, low, close, tick_volume, spread, real_volume:
+            Field views into data (time is epoch seconds, as in MqlRates)
+    """
+
+    __slots__ = ('data', 'count', 'index') + BAR_FIELDS
+
+    def __init__(self, rates: np.ndarray, start: int = 0):
+        """Wrap a structured rates array.
+
+        Args:
+            rates: Structured array with (at least) the MqlRates fields
+            start: Position of the first bar (used by slices to keep alignment)
+
+        Raises:
+            ValueError: If rates is not a structured array or lacks OHLC fields
+        """
+        names = rates.dtype.names
+        if names is None:
+            raise ValueError("BarSeries requires a structured array (mt5.copy_rates_* output)")
+
+        missing = [f for f in ('time', 'open', 'high', 'low', 'close') if f not in names]
+        if missing:
+            raise ValueError(f"Rates array missing required fields: {missing}")
+
+        self.data = rates
+        self.count = len(rates)
+        self.index = pd.RangeIndex(start, start + self.count)
+        for field in BAR_FIELDS:
+            setattr(self, field, rates[field] if field in names else None)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'BarSeries':
+        """Build a BarSeries from a bar DataFrame (copies; for CSV/test inputs).
+
+        A datetime 'time' column is converted to epoch seconds; missing volume
+        and spread columns are zero-filled.
+        """
+        rates = np.zeros(len(df), dtype=RATES_DTYPE)
+        for field in BAR_FIELDS:
+            if field not in df.columns:
+                continue
+            values = df[field].to_numpy()
+            if field == 'time' and np.issubdtype(values.dtype, np.datetime64):
+                values = values.astype('datetime64[s]').astype(np.int64)
+            rates[field] = values
+        return cls(rates)
+
+    @property
+    def columns(self) -> tuple:
+        """Available bar fields (DataFrame-compatible membership tests)."""
+        return tuple(f for f in BAR_FIELDS if getattr(self, f) is not None)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Bar open times as datetime64[s] (view, no copy)."""
+        return self.time.view('datetime64[s]')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, key):
+        """bars['close'] -> pandas Series over the field view; bars[a:b] -> BarSeries slice."""
+        if isinstance(key, slice):
+            start, _, step = key.indices(self.count)
+            if step != 1:
+                raise ValueError("BarSeries slices must be contiguous")
+            return BarSeries(self.data[key], start=self.index.start + start)
+
+        values = getattr(self, key, None) if key in BAR_FIELDS else None
+        if values is None:
+            raise KeyError(key)
+        return pd.Series(values, index=self.index, name=key, copy=False)
+
+    def tail(self, n: int) -> 'BarSeries':
+        """Last n bars (view)."""
+        return self[max(0, self.count - n):]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materialize as a DataFrame with a datetime 'time' column (edge conversion)."""
+        columns = {f: getattr(self, f) for f in self.columns}
+        columns['time'] = self.times
+        return pd.DataFrame(columns, index=self.index)
+
+    def __repr__(self) -> str:
+        if self.count == 0:
+            return "BarSeries(count=0)"
+        return f"BarSeries(count={self.count}, {self.times[0]} .. {self.times[-1]})"
@@ -0,0 +1,206 @@
+"""Content-Addressed Indicator Result Cache.
+
+Caches indicator outputs on disk keyed by a hash of:
+- the input bar columns (INPUT_COLUMNS: dtype, shape and raw bytes; other
+  columns, e.g. the MQL5 buffers of an export frame, are ignored)
+- the resolved indicator parameters
+- the indicator module's __version__
+
+Each entry is a directory of .npy files (one per output column) plus a small
+meta.json. Hits are loaded with np.load(mmap_mode='r') and wrapped without
+copying, so a cache hit costs a few page mappings regardless of series size.
+
+Concurrency: entries are written to a private temp directory and published
+with an atomic rename, so concurrent processes either see a complete entry or
+none. Eviction is LRU by meta.json mtime (touched on every hit) with a total
+size cap; evicted entries are renamed away before deletion.
+
+Usage:
+    cache = IndicatorCache()
+    result = cache.compute('laguerre_rsi', df, {'atr_period': 32})
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from indicators import registry
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    'MQL5_CROSSOVER_CACHE', Path.home() / '.cache' / 'mql5-crossover'
+))
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+
+# Bar columns indicators read; only these are part of the cache key
+INPUT_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume')
+
+
+def hash_inputs(df: pd.DataFrame, columns=None) -> str:
+    """Hash DataFrame columns by dtype, shape and raw bytes (index is ignored).
+
+    Args:
+        df: Input bars
+        columns: Columns to hash (default: all columns)
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for col in (columns if columns is not None else df.columns):
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+        values = np.ascontiguousarray(values)
+        digest.update(f"{col}|{values.dtype.str}|{values.shape}|".encode())
+        digest.update(values.reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """On-disk LRU cache of indicator results.
+
+    Attributes:
+        root: Cache directory
+        max_bytes: Size cap; least recently used entries are evicted beyond it
+        hits, misses: Counters for this instance
+    """
+
+    def __init__(self, root: Path | str | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root) if root is not None else DEFAULT_CACHE_DIR / 'results'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, name: str, df: pd.DataFrame, params: dict | None = None) -> str:
+        """Content address for an indicator call."""
+        resolved = registry.resolve_params(name, params)
+        version = getattr(registry.load_module(name), '__version__', '0')
+        spec = repr((name, version, sorted(resolved.items())))
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(spec.encode())
+        columns = [col for col in df.columns if col in INPUT_COLUMNS] or None
+        digest.update(hash_inputs(df, columns).encode())
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def load(self, key: str, index=None) -> pd.DataFrame | None:
+        """Return a memory-mapped result DataFrame, or None on a miss."""
+        entry = self._entry_dir(key)
+        meta_path = entry / 'meta.json'
+        try:
+            meta = json.loads(meta_path.read_text())
+            columns = {
+                col: np.load(entry / f"{i}.npy", mmap_mode='r')
+                for i, col in enumerate(meta['columns'])
+            }
+            os.utime(meta_path)  # LRU touch
+        except (FileNotFoundError, NotADirectoryError, ValueError, KeyError):
+            return None
+
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def store(self, key: str, result: pd.DataFrame) -> None:
+        """Publish a result atomically, then enforce the size cap."""
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return
+
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.parent / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            for i, col in enumerate(result.columns):
+                np.save(tmp / f"{i}.npy", np.ascontiguousarray(result[col].to_numpy()))
+            (tmp / 'meta.json').write_text(json.dumps({
+                'columns': [str(c) for c in result.columns],
+                'rows': len(result),
+                'created': time.time(),
+            }))
+            os.rename(tmp, entry)
+        except OSError:
+            # Another process published the same key first (or the write failed)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def compute(self, name: str, df: pd.DataFrame, params: dict | None = None) -> pd.DataFrame:
+        """Return the indicator result, computing and caching it on a miss.
+
+        Args:
+            name: Registered indicator name
+            df: Input bars
+            params: Indicator parameters (Python or MQL5 names)
+
+        Returns:
+            Result DataFrame indexed like df (memory-mapped, read-only on hits)
+        """
+        key = self.key(name, df, params)
+        result = self.load(key, index=df.index)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = registry.load_function(name)(df, **registry.resolve_params(name, params))
+        self.store(key, result)
+        return result
+
+    def entries(self) -> list:
+        """List (last_used, size_bytes, path) for all published entries."""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for meta_path in self.root.glob('*/*/meta.json'):
+            entry = meta_path.parent
+            if entry.name.startswith('.'):
+                continue  # Unpublished temp / evicting entry
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((meta_path.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                continue  # Evicted concurrently
+        return entries
+
+    def evict(self) -> int:
+        """Evict least recently used entries until total size <= max_bytes.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            doomed = entry.parent / f".evict-{uuid.uuid4().hex}"
+            try:
+                os.rename(entry, doomed)
+            except OSError:
+                continue  # Already evicted by another process
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+            evicted += 1
+
+        return evicted
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        shutil.rmtree(self.root, ignore_errors=True)
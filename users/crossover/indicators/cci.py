@@ -0,0 +1,283 @@
+"""CCI Family Engine.
+
+Computes the Commodity Channel Index once per bar set and period, then derives
+the outputs of the CCI-based MQL5 indicators from it:
+- CCI_Graduated_Dots.mq5: 4-tier dot classification (InpThreshold1..4)
+- CCI_Neutrality_Bars.mq5 / ScoreOnly: in-channel flags and rolling window
+  sums (sum_b, sum_cci, sum_cci2, sum_excess)
+- Woodie_CCI_System.mq5: CCI / Turbo CCI lines and trend histogram colors
+
+Typical price is shared across all periods; SMA, mean absolute deviation and
+CCI are memoized per period, so multi-indicator exports pay for each CCI once.
+
+CCI formula (matches iCCI with PRICE_TYPICAL):
+    tp[i]  = (high[i] + low[i] + close[i]) / 3
+    sma[i] = mean(tp[i-period+1 .. i])
+    mad[i] = mean(|tp[j] - sma[i]|) for j in window
+    cci[i] = (tp[i] - sma[i]) / (0.015 * mad[i])   (0.0 when mad == 0)
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Rows per block when reducing sliding windows (bounds temporary memory)
+_CHUNK_ROWS = 1 << 16
+
+
+def calculate_typical_price(high, low, close) -> np.ndarray:
+    """Calculate typical price (high + low + close) / 3.
+
+    Raises:
+        ValueError: If inputs have mismatched lengths or are empty
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+
+    if len(high) != len(low) or len(high) != len(close):
+        raise ValueError(f"Input length mismatch: high={len(high)}, low={len(low)}, close={len(close)}")
+
+    if len(high) == 0:
+        raise ValueError("Input arrays are empty")
+
+    return (high + low + close) / 3.0
+
+
+def calculate_cci(tp: np.ndarray, period: int = 20) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate SMA, mean absolute deviation and CCI of typical price.
+
+    Windows are reduced block-wise over a strided view, so memory stays at
+    O(n + block * period) regardless of series length.
+
+    Args:
+        tp: Typical price
+        period: CCI period
+
+    Returns:
+        Tuple of (sma, mad, cci); the first period-1 values are NaN
+
+    Raises:
+        ValueError: If period < 1
+    """
+    if period < 1:
+        raise ValueError(f"Period must be >= 1, got {period}")
+
+    tp = np.asarray(tp, dtype=np.float64)
+    n = len(tp)
+    sma = np.full(n, np.nan)
+    mad = np.full(n, np.nan)
+    cci = np.full(n, np.nan)
+
+    if n < period:
+        return sma, mad, cci
+
+    windows = sliding_window_view(tp, period)
+    for start in range(0, len(windows), _CHUNK_ROWS):
+        block = windows[start:start + _CHUNK_ROWS]
+        out = slice(start + period - 1, start + period - 1 + len(block))
+        mean = block.mean(axis=1)
+        sma[out] = mean
+        mad[out] = np.abs(block - mean[:, None]).mean(axis=1)
+
+    valid = slice(period - 1, n)
+    denom = 0.015 * mad[valid]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cci[valid] = np.where(denom != 0.0, (tp[valid] - sma[valid]) / denom, 0.0)
+
+    return sma, mad, cci
+
+
+def _rolling_sum(values: np.ndarray, window: int, start: int) -> np.ndarray:
+    """Exact rolling sum over `window` values; NaN until the window fills from `start`."""
+    n = len(values)
+    result = np.full(n, np.nan)
+    first = start + window - 1
+    if n <= first:
+        return result
+
+    windows = sliding_window_view(values[start:], window)
+    for offset in range(0, len(windows), _CHUNK_ROWS):
+        block = windows[offset:offset + _CHUNK_ROWS]
+        result[first + offset:first + offset + len(block)] = block.sum(axis=1)
+
+    return result
+
+
+class CCIFamily:
+    """CCI computed once per period, with derived indicator outputs.
+
+    Usage:
+        family = CCIFamily(df['high'], df['low'], df['close'])
+        dots = family.dot_tiers(period=20)
+        sums = family.rolling_sums(period=20, window=30)
+        woodie = family.woodie(cci_period=14, turbo_period=5)
+
+    Derived outputs treat CCI as valid from bar `period` onwards, matching the
+    `startPos = InpCCILength` warmup used by the MQL5 CCI indicators.
+    """
+
+    def __init__(self, high, low, close, index=None):
+        self.index = index if index is not None else getattr(close, 'index', None)
+        self.tp = calculate_typical_price(high, low, close)
+        self._by_period = {}
+
+    def __len__(self):
+        return len(self.tp)
+
+    def _components(self, period: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if period not in self._by_period:
+            self._by_period[period] = calculate_cci(self.tp, period)
+        return self._by_period[period]
+
+    def sma(self, period: int = 20) -> np.ndarray:
+        """SMA of typical price."""
+        return self._components(period)[0]
+
+    def mad(self, period: int = 20) -> np.ndarray:
+        """Mean absolute deviation of typical price."""
+        return self._components(period)[1]
+
+    def cci(self, period: int = 20) -> np.ndarray:
+        """CCI values (memoized per period)."""
+        return self._components(period)[2]
+
+    def _valid_cci(self, period: int) -> np.ndarray:
+        cci = self.cci(period).copy()
+        cci[:period] = np.nan
+        return cci
+
+    def dot_tiers(self, period: int = 20, thresholds: tuple = (100.0, 200.0, 300.0, 400.0)) -> np.ndarray:
+        """Signed dot tier per bar (CCI_Graduated_Dots GetTier()).
+
+        Args:
+            period: CCI period (InpCCILength)
+            thresholds: (InpThreshold1, InpThreshold2, InpThreshold3, InpThreshold4)
+
+        Returns:
+            int8 array: +1..+4 for CCI >= 0 (green), -1..-4 for CCI < 0 (red),
+            0 for neutral or warmup bars
+
+        Raises:
+            ValueError: If thresholds are not 4 ascending values
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        if thresholds.shape != (4,) or np.any(np.diff(thresholds) <= 0):
+            raise ValueError(f"Expected 4 ascending thresholds, got {thresholds.tolist()}")
+
+        cci = self._valid_cci(period)
+        tier = np.searchsorted(thresholds, np.abs(np.nan_to_num(cci)), side='right').astype(np.int8)
+        tier[np.isnan(cci)] = 0
+        return np.where(cci >= 0, tier, -tier).astype(np.int8)
+
+    def in_channel(self, period: int = 20, level: float = 100.0) -> np.ndarray:
+        """In-channel flag b = 1.0 where |CCI| <= level (NaN during warmup)."""
+        cci = self._valid_cci(period)
+        flag = (np.abs(cci) <= level).astype(np.float64)
+        flag[np.isnan(cci)] = np.nan
+        return flag
+
+    def rolling_sums(self, period: int = 20, window: int = 30, level: float = 100.0) -> pd.DataFrame:
+        """Rolling window sums used by the CCI Neutrality score.
+
+        Args:
+            period: CCI period (InpCCILength)
+            window: Statistics window W (InpWindow)
+            level: Channel level (default 100)
+
+        Returns:
+            DataFrame with columns 'cci', 'in_channel', 'sum_b', 'sum_cci',
+            'sum_cci2', 'sum_excess'; sums are NaN until bar period + window - 1
+
+        Raises:
+            ValueError: If window < 2
+        """
+        if window < 2:
+            raise ValueError(f"Window must be >= 2, got {window}")
+
+        cci = self._valid_cci(period)
+        b = self.in_channel(period, level)
+        excess = np.maximum(np.abs(cci) - level, 0.0)
+
+        return pd.DataFrame({
+            'cci': cci,
+            'in_channel': b,
+            'sum_b': _rolling_sum(b, window, period),
+            'sum_cci': _rolling_sum(cci, window, period),
+            'sum_cci2': _rolling_sum(cci * cci, window, period),
+            'sum_excess': _rolling_sum(excess, window, period),
+        }, index=self.index)
+
+    def woodie(self, cci_period: int = 14, turbo_period: int = 5, trend_period: int = 6) -> pd.DataFrame:
+        """Woodie CCI lines and trend histogram colors (Woodie_CCI_System.mq5).
+
+        Trend state is recursive (each bar depends on the previous bar's
+        trend), so the classification is a single forward loop over the
+        already-computed CCI array.
+
+        Args:
+            cci_period: CCI period (CCIPeriod)
+            turbo_period: Turbo CCI period (TurboCCIPeriod)
+            trend_period: Bars determining trend (TrendPeriod)
+
+        Returns:
+            DataFrame with columns:
+            - 'cci': CCI line
+            - 'turbo_cci': Turbo CCI line
+            - 'trend': +1 uptrend, -1 downtrend, 0 none
+            - 'color': Histogram color index (0=neutral, 1=up, 2=down, 3=trend forming)
+
+        Raises:
+            ValueError: If trend_period < 2
+        """
+        if trend_period < 2:
+            raise ValueError(f"Trend period must be >= 2, got {trend_period}")
+
+        cci = self.cci(max(cci_period, 1))
+        turbo = self.cci(max(turbo_period, 1))
+        n = len(cci)
+
+        trend = np.zeros(n, dtype=np.int8)
+        color = np.zeros(n, dtype=np.int8)
+
+        for i in range(n):
+            s = 0
+            if cci[i] > 0:
+                if i > 0 and trend[i - 1] == 1:
+                    s = trend_period
+                else:
+                    s = 1
+                    for k in range(1, trend_period):
+                        if i - k < 0 or trend[i - k] == -1:
+                            break
+                        s += 1
+            elif cci[i] < 0:
+                if i > 0 and trend[i - 1] == -1:
+                    s = -trend_period
+                else:
+                    s = -1
+                    for k in range(1, trend_period):
+                        if i - k < 0 or trend[i - k] == 1:
+                            break
+                        s -= 1
+
+            if s == trend_period:
+                trend[i] = 1
+                color[i] = 1
+            elif s == -trend_period:
+                trend[i] = -1
+                color[i] = 2
+            if abs(s) == trend_period - 1:
+                color[i] = 3
+
+        return pd.DataFrame({
+            'cci': cci,
+            'turbo_cci': turbo,
+            'trend': trend,
+            'color': color,
+        }, index=self.index)
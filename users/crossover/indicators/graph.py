@@ -0,0 +1,203 @@
+"""Shared-Intermediate Computation Graph.
+
+Multi-indicator exports recompute the same building blocks (price diffs, true
+range, typical price, rolling sums). This module evaluates indicators as a DAG
+of memoized nodes over one bar set:
+
+    graph = ComputeGraph(df)
+    results = graph.evaluate_indicators({
+        'rsi': {'period': 14},
+        'laguerre_rsi': {'atr_period': 32},
+    })
+
+Node keys are strings or tuples:
+    'close', 'high', ...              Source columns of the bar DataFrame (or BarSeries)
+    'prev_close'                      close shifted by one bar
+    'tr'                              True Range (first bar = high - low)
+    'typical_price', 'median_price'   (H+L+C)/3, (H+L)/2
+    ('diff', col)                     col[i] - col[i-1]
+    ('rolling_sum', col, n)           Sum over the last n bars
+    ('rolling_mean', col, n)          rolling_sum / n
+    ('indicator', name, params)       Registered indicator (see registry.py)
+
+Indicators declare the intermediates they consume through a module-level
+graph_inputs(**params) -> {kwarg: node_key} hook; the graph computes each
+node once and passes it to the indicator function as a keyword argument.
+Independent nodes run concurrently on a thread pool (NumPy/pandas kernels
+release the GIL), so an export with many indicators costs close to the union
+of its unique intermediates.
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+import pandas as pd
+
+from indicators import registry
+
+
+def _build_prev_close(close):
+    return close.shift(1)
+
+
+def _build_tr(high, low, prev_close):
+    tr = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    tr.iloc[0] = high.iloc[0] - low.iloc[0]
+    return tr
+
+
+def _build_typical_price(high, low, close):
+    return (high + low + close) / 3.0
+
+
+def _build_median_price(high, low):
+    return (high + low) / 2.0
+
+
+def _builtin_node(key):
+    """Return (func, deps) for a built-in intermediate, or None."""
+    if key == 'prev_close':
+        return _build_prev_close, ('close',)
+    if key == 'tr':
+        return _build_tr, ('high', 'low', 'prev_close')
+    if key == 'typical_price':
+        return _build_typical_price, ('high', 'low', 'close')
+    if key == 'median_price':
+        return _build_median_price, ('high', 'low')
+
+    if isinstance(key, tuple):
+        kind = key[0]
+        if kind == 'diff':
+            return (lambda x: x.diff()), (key[1],)
+        if kind == 'rolling_sum':
+            n = key[2]
+            return (lambda x: x.rolling(window=n).sum()), (key[1],)
+        if kind == 'rolling_mean':
+            n = key[2]
+            return (lambda s: s / n), (('rolling_sum', key[1], n),)
+
+    return None
+
+
+def indicator_key(name: str, params: dict | None = None) -> tuple:
+    """Graph key of a registered indicator with resolved parameters."""
+    resolved = registry.resolve_params(name, params)
+    return ('indicator', name, tuple(sorted(resolved.items())))
+
+
+class ComputeGraph:
+    """Memoized DAG evaluator over one bar set.
+
+    Attributes:
+        df: Bar DataFrame (source columns are graph nodes)
+        output_start: First bar whose indicator outputs are needed (not part of node keys)
+        computed: Number of nodes actually computed (cache misses)
+    """
+
+    def __init__(self, df: pd.DataFrame, max_workers: int | None = None, output_start: int = 0):
+        self.df = df
+        self.output_start = output_start  # Passed to indicators supporting it (registry.output_kwargs)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.computed = 0
+        self._values = {}
+        self._nodes = {}
+
+    def add_node(self, key, func, deps=()) -> None:
+        """Register a custom node: func(*dep_values) -> value."""
+        self._nodes[key] = (func, tuple(deps))
+
+    def _node(self, key):
+        if key in self._nodes:
+            return self._nodes[key]
+
+        if isinstance(key, str) and key in self.df.columns:
+            node = ((lambda: self.df[key]), ())
+        elif isinstance(key, tuple) and key[0] == 'indicator':
+            node = self._indicator_node(key)
+        else:
+            node = _builtin_node(key)
+
+        if node is None:
+            raise KeyError(f"Unknown graph node: {key!r}")
+
+        self._nodes[key] = node
+        return node
+
+    def _indicator_node(self, key):
+        name, params = key[1], dict(key[2])
+        module = registry.load_module(name)
+        inputs = module.graph_inputs(**params) if hasattr(module, 'graph_inputs') else {}
+        kwargs = list(inputs)
+        func = registry.load_function(name)
+        output = registry.output_kwargs(name, self.output_start)
+
+        def compute(*values):
+            return func(self.df, **params, **output, **dict(zip(kwargs, values)))
+
+        return compute, tuple(inputs.values())
+
+    def evaluate(self, keys) -> dict:
+        """Compute the requested nodes (and their dependencies) once each.
+
+        Args:
+            keys: Iterable of node keys
+
+        Returns:
+            Dictionary {key: value}
+        """
+        keys = list(keys)
+
+        # Collect the pending sub-graph
+        pending = {}
+        stack = [k for k in keys if k not in self._values]
+        while stack:
+            key = stack.pop()
+            if key in pending or key in self._values:
+                continue
+            func, deps = self._node(key)
+            pending[key] = (func, deps)
+            stack.extend(d for d in deps if d not in self._values)
+
+        # Kahn-style scheduling: submit nodes as soon as their dependencies are ready
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                running = {}
+                while pending or running:
+                    ready = [k for k, (_, deps) in pending.items()
+                             if all(d in self._values for d in deps)]
+                    for key in ready:
+                        func, deps = pending.pop(key)
+                        args = [self._values[d] for d in deps]
+                        running[pool.submit(func, *args)] = key
+
+                    if not running:
+                        raise ValueError(f"Dependency cycle among graph nodes: {list(pending)}")
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._values[running.pop(future)] = future.result()
+                        self.computed += 1
+
+        return {k: self._values[k] for k in keys}
+
+    def get(self, key):
+        """Compute (or fetch) a single node."""
+        return self.evaluate([key])[key]
+
+    def evaluate_indicators(self, indicators: dict) -> dict:
+        """Evaluate several registered indicators sharing intermediates.
+
+        Args:
+            indicators: {indicator_name: params}
+
+        Returns:
+            {indicator_name: result DataFrame}
+        """
+        keys = {name: indicator_key(name, params) for name, params in indicators.items()}
+        values = self.evaluate(keys.values())
+        return {name: values[key] for name, key in keys.items()}
@@ -9,9 +9,15 @@ Status: Implementation complete, validation pending
 
 __version__ = '1.0.0'
 
+import math
+from collections import deque
+
 import numpy as np
 import pandas as pd
 
+from indicators.registry import decay_warmup_bars
+from indicators.streaming import StreamingIndicator, ewm_alpha, ewm_step
+
 
 def calculate_true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
     """Calculate True Range.
@@ -328,7 +334,7 @@ def calculate_laguerre_filter(prices: pd.Series, period: pd.Series) -> pd.DataFr
     }, index=prices.index)
 
 
-def calculate_laguerre_rsi(laguerre_df: pd.DataFrame) -> pd.Series:
+def calculate_laguerre_rsi(laguerre_df: pd.DataFrame, start: int = 0) -> pd.Series:
     """Calculate RSI from Laguerre filter stages.
 
     RSI is calculated by comparing consecutive filter stages and summing
@@ -339,6 +345,7 @@ def calculate_laguerre_rsi(laguerre_df: pd.DataFrame) -> pd.Series:
 
     Args:
         laguerre_df: DataFrame with columns ['L0', 'L1', 'L2', 'L3']
+        start: First bar to calculate; earlier bars are left as NaN
 
     Returns:
         Laguerre RSI values (0.0 to 1.0)
@@ -356,8 +363,9 @@ def calculate_laguerre_rsi(laguerre_df: pd.DataFrame) -> pd.Series:
 
     n = len(laguerre_df)
     rsi = np.zeros(n)
+    rsi[:start] = np.nan
 
-    for i in range(n):
+    for i in range(start, n):
         CU = 0.0  # Cumulative Up
         CD = 0.0  # Cumulative Down
 
@@ -419,7 +427,9 @@ def calculate_laguerre_rsi_indicator(
     price_smooth_period: int = 5,
     price_smooth_method: str = 'ema',
     level_up: float = 0.85,
-    level_down: float = 0.15
+    level_down: float = 0.15,
+    tr: pd.Series | None = None,
+    output_start: int = 0
 ) -> pd.DataFrame:
     """Calculate ATR Adaptive Smoothed Laguerre RSI.
 
@@ -440,6 +450,10 @@ def calculate_laguerre_rsi_indicator(
         price_smooth_method: Price smoothing method ('sma', 'ema', 'smma', 'lwma')
         level_up: Upper threshold for bullish signal (default 0.85)
         level_down: Lower threshold for bearish signal (default 0.15)
+        tr: Precomputed True Range (optional, shared via indicators.graph)
+        output_start: First bar whose Laguerre RSI is needed; the recursive
+                      ATR/filter state still runs over all bars, but RSI values
+                      for earlier (warmup) bars are left as NaN
 
     Returns:
         DataFrame with columns:
@@ -453,7 +467,8 @@ def calculate_laguerre_rsi_indicator(
         ValueError: If input validation fails (propagates from sub-functions)
     """
     # Step 1: Calculate True Range
-    tr = calculate_true_range(df['high'], df['low'], df['close'])
+    if tr is None:
+        tr = calculate_true_range(df['high'], df['low'], df['close'])
 
     # Step 2: Calculate ATR
     atr = calculate_atr(tr, period=atr_period)
@@ -472,7 +487,7 @@ def calculate_laguerre_rsi_indicator(
     laguerre_df = calculate_laguerre_filter(prices, adaptive_period)
 
     # Step 7: Calculate Laguerre RSI from filter stages
-    laguerre_rsi = calculate_laguerre_rsi(laguerre_df)
+    laguerre_rsi = calculate_laguerre_rsi(laguerre_df, start=output_start)
 
     # Step 8: Classify signal
     signal = classify_signal(laguerre_rsi, level_up, level_down)
@@ -485,3 +500,181 @@ def calculate_laguerre_rsi_indicator(
         'atr': atr,
         'tr': tr
     }, index=df.index)
+
+
+def graph_inputs(**params) -> dict:
+    """Shared intermediates consumed by calculate_laguerre_rsi_indicator (see indicators/graph.py)."""
+    return {'tr': 'tr'}
+
+
+def warmup_bars(
+    atr_period: int = 32,
+    price_smooth_period: int = 5,
+    price_smooth_method: str = 'ema',
+    **_
+) -> int:
+    """Bars before Laguerre RSI is independent of its initial state.
+
+    Sum of:
+    - ATR window plus ATR min/max window (atr_period used twice)
+    - Price smoothing (EMA/SMMA convergence, or SMA/LWMA window)
+    - Four-stage Laguerre filter at its slowest gamma (adaptive period = 1.75 * atr_period)
+    """
+    atr_bars = 2 * atr_period - 1
+
+    if price_smooth_period <= 1:
+        smooth_bars = 0
+    elif price_smooth_method == 'ema':
+        smooth_bars = decay_warmup_bars(1.0 - 2.0 / (price_smooth_period + 1))
+    elif price_smooth_method == 'smma':
+        smooth_bars = decay_warmup_bars(1.0 - 1.0 / price_smooth_period)
+    else:
+        smooth_bars = price_smooth_period - 1
+
+    gamma_max = 1.0 - 10.0 / (atr_period * 1.75 + 9.0)
+    filter_bars = decay_warmup_bars(gamma_max, stages=4)
+
+    return atr_bars + smooth_bars + filter_bars
+
+
+class StreamingLaguerreRSI(StreamingIndicator):
+    """Bar-by-bar ATR Adaptive Laguerre RSI matching calculate_laguerre_rsi_indicator.
+
+    Carries the TR/ATR windows, price smoothing state and the four Laguerre
+    filter stages. EMA/SMMA/LWMA smoothing reproduce the batch values exactly;
+    SMA smoothing matches to floating-point rounding (pandas' rolling mean
+    uses a compensated running sum).
+
+    Args:
+        atr_period: ATR period (default 32)
+        price_type: Price to use ('close', 'open', 'high', 'low', 'median', 'typical', 'weighted')
+        price_smooth_period: Price smoothing period (default 5)
+        price_smooth_method: Price smoothing method ('sma', 'ema', 'smma', 'lwma')
+        level_up: Upper threshold for bullish signal (default 0.85)
+        level_down: Lower threshold for bearish signal (default 0.15)
+    """
+
+    PARAMS = ('atr_period', 'price_type', 'price_smooth_period', 'price_smooth_method', 'level_up', 'level_down')
+    STATE = ('count', 'prev_close', 'tr_window', 'atr_window', 'price_window', 'smoothed', 'stages')
+
+    def __init__(
+        self,
+        atr_period: int = 32,
+        price_type: str = 'close',
+        price_smooth_period: int = 5,
+        price_smooth_method: str = 'ema',
+        level_up: float = 0.85,
+        level_down: float = 0.15
+    ):
+        if atr_period < 1:
+            raise ValueError(f"ATR period must be >= 1, got {atr_period}")
+        if price_smooth_period < 1:
+            raise ValueError(f"Smooth period must be >= 1, got {price_smooth_period}")
+        if price_smooth_method not in ('sma', 'ema', 'smma', 'lwma'):
+            raise ValueError(f"Invalid smooth_method: {price_smooth_method}")
+        if price_type not in ('close', 'open', 'high', 'low', 'median', 'typical', 'weighted'):
+            raise ValueError(f"Invalid price_type: {price_type}")
+        if not 0.0 <= level_down < level_up <= 1.0:
+            raise ValueError(f"Invalid thresholds: level_down={level_down}, level_up={level_up} (must be 0.0 <= level_down < level_up <= 1.0)")
+
+        self.atr_period = atr_period
+        self.price_type = price_type
+        self.price_smooth_period = price_smooth_period
+        self.price_smooth_method = price_smooth_method
+        self.level_up = level_up
+        self.level_down = level_down
+
+        self.count = 0
+        self.prev_close = None
+        self.tr_window = deque(maxlen=atr_period)
+        self.atr_window = deque(maxlen=atr_period)
+        self.price_window = deque(maxlen=price_smooth_period)
+        self.smoothed = math.nan
+        self.stages = None
+
+    def _price(self, bar) -> float:
+        if self.price_type in ('close', 'open', 'high', 'low'):
+            return float(bar[self.price_type])
+        high, low, close = float(bar['high']), float(bar['low']), float(bar['close'])
+        if self.price_type == 'median':
+            return (high + low) / 2.0
+        if self.price_type == 'typical':
+            return (high + low + close) / 3.0
+        return (high + low + 2 * close) / 4.0
+
+    def _smooth(self, price: float) -> float:
+        period = self.price_smooth_period
+        if period == 1:
+            return price
+        if self.price_smooth_method in ('ema', 'smma'):
+            alpha = ewm_alpha(span=period) if self.price_smooth_method == 'ema' else ewm_alpha(alpha=1.0 / period)
+            self.smoothed = ewm_step(self.smoothed, price, alpha)
+            return self.smoothed
+
+        self.price_window.append(price)
+        if len(self.price_window) < period:
+            return math.nan
+        window = np.array(self.price_window)
+        if self.price_smooth_method == 'sma':
+            return window.sum() / period
+        weights = np.arange(1, period + 1)
+        return np.dot(window, weights) / weights.sum()
+
+    def update(self, bar) -> dict:
+        high, low, close = float(bar['high']), float(bar['low']), float(bar['close'])
+        period = self.atr_period
+
+        # True Range and ATR (expanding sum / period, then sliding mean)
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high, self.prev_close) - min(low, self.prev_close)
+        self.prev_close = close
+        self.tr_window.append(tr)
+        atr = float(np.array(self.tr_window).sum() / period)
+
+        # Adaptive period from ATR position within its min/max window
+        self.atr_window.append(atr)
+        min_atr = min(min(self.atr_window), atr)
+        max_atr = max(max(self.atr_window), atr)
+        coeff = 0.5 if min_atr == max_atr else 1.0 - (atr - min_atr) / (max_atr - min_atr)
+        adaptive_period = period * (coeff + 0.75)
+
+        # Four-stage Laguerre filter
+        price = float(self._smooth(self._price(bar)))
+        if self.stages is None:
+            self.stages = [price] * 4
+        else:
+            g = 1.0 - 10.0 / (adaptive_period + 9.0)
+            L0p, L1p, L2p, L3p = self.stages
+            L0 = price + g * (L0p - price)
+            L1 = L0p + g * (L1p - L0)
+            L2 = L1p + g * (L2p - L1)
+            L3 = L2p + g * (L3p - L2)
+            self.stages = [L0, L1, L2, L3]
+        self.count += 1
+
+        # RSI from filter stages
+        CU = 0.0
+        CD = 0.0
+        L = self.stages
+        for j in range(3):
+            if L[j] >= L[j + 1]:
+                CU += L[j] - L[j + 1]
+            else:
+                CD += L[j + 1] - L[j]
+        rsi = CU / (CU + CD) if (CU + CD) != 0 else 0.0
+
+        signal = 0
+        if rsi > self.level_up:
+            signal = 1
+        elif rsi < self.level_down:
+            signal = 2
+
+        return {
+            'laguerre_rsi': rsi,
+            'signal': signal,
+            'adaptive_period': adaptive_period,
+            'atr': atr,
+            'tr': tr,
+        }
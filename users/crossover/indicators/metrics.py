@@ -0,0 +1,465 @@
+"""Single-Pass Validation Metrics.
+
+Accumulates MQL5-vs-Python comparison metrics chunk by chunk in constant
+memory, so exports larger than memory validate without holding either series:
+
+    acc = MetricsAccumulator()
+    for mql5_chunk, python_chunk in chunks:
+        acc.update(mql5_chunk, python_chunk)
+    metrics = acc.result('Laguerre_RSI')   # correlation, mae, rmse, max_diff, min/max/mean
+
+All buffers of an indicator go through one accumulator at once: chunks may be
+2-D, (n_buffers, n_bars), and every statistic is an axis-wise reduction with a
+per-row NaN mask, so seven VWAP lines cost one vectorized pass instead of
+seven:
+
+    acc.update(np.vstack(mql5_columns), np.vstack(python_columns))
+    acc.results(['VWAP', 'Upper1', ...])
+
+Each chunk is reduced once (means, centred second moments and co-moment,
+absolute/squared diff sums, extremes) and merged into the running totals with
+the pairwise Welford/Chan update, which stays accurate for long series where
+the naive sum-of-squares formula cancels. Pairs where either side is NaN are
+skipped. The accumulator optionally keeps the top_k largest absolute diffs
+(bar index, time, both values) per buffer for bar-level diff storage.
+
+DivergenceProfiler locates where two series part (first bar over tolerance,
+windowed correlation/error profile); best_lag() checks whether they match
+better when shifted, the signature of off-by-one and reversed-indexing bugs.
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import numpy as np
+
+
+class MetricsAccumulator:
+    """Running Pearson correlation, MAE, RMSE, max diff and per-side min/max/mean, per buffer row."""
+
+    def __init__(self, top_k: int = 0):
+        """
+        Args:
+            top_k: Largest absolute diffs to keep per buffer (0 keeps none)
+        """
+        self.top_k = top_k
+        self.rows = None  # Number of buffers, fixed by the first update
+        self.bars = 0  # Pairs seen per row, including NaN ones (default bar index offset)
+        self._top = None  # dict of (rows, <= top_k) arrays: bar_index, bar_time, mql5, python, diff
+
+    def _start(self, rows: int) -> None:
+        zeros = lambda: np.zeros(rows)
+        self.rows = rows
+        self.n = np.zeros(rows, dtype=np.int64)
+        self.mean_x, self.mean_y = zeros(), zeros()  # x: MQL5, y: Python
+        self.m2_x, self.m2_y, self.c_xy = zeros(), zeros(), zeros()
+        self.abs_sum, self.sq_sum, self.max_diff = zeros(), zeros(), zeros()
+        self.min_x, self.min_y = np.full(rows, np.inf), np.full(rows, np.inf)
+        self.max_x, self.max_y = np.full(rows, -np.inf), np.full(rows, -np.inf)
+
+    def update(self, mql5_values, python_values, index=None, times=None) -> None:
+        """Add one chunk of paired values.
+
+        Args:
+            mql5_values, python_values: Arrays of shape (n_bars,) or (n_buffers, n_bars)
+            index: Bar indices of the chunk's columns (default: continues from previous chunks)
+            times: Bar times of the chunk's columns (kept with the top diffs)
+        """
+        x = np.atleast_2d(np.asarray(mql5_values, dtype=np.float64))
+        y = np.atleast_2d(np.asarray(python_values, dtype=np.float64))
+        if x.shape != y.shape:
+            raise ValueError(f"Chunk shape mismatch: {x.shape} MQL5 vs {y.shape} Python values")
+        if self.rows is None:
+            self._start(len(x))
+        elif len(x) != self.rows:
+            raise ValueError(f"Expected {self.rows} buffer rows, got {len(x)}")
+        if index is None:
+            index = np.arange(self.bars, self.bars + x.shape[1])
+        self.bars += x.shape[1]
+        if x.shape[1] == 0:
+            return
+
+        diff = x - y
+        mask = ~np.isnan(diff)  # NaN on either side
+        dense = mask.all()
+        if dense:
+            m = np.full(len(x), x.shape[1])
+            mean_x, mean_y = x.mean(axis=1), y.mean(axis=1)
+            dx, dy = x - mean_x[:, None], y - mean_y[:, None]
+        else:
+            m = mask.sum(axis=1)
+            mean_x = np.where(mask, x, 0.0).sum(axis=1) / np.maximum(m, 1)
+            mean_y = np.where(mask, y, 0.0).sum(axis=1) / np.maximum(m, 1)
+            dx = np.where(mask, x - mean_x[:, None], 0.0)
+            dy = np.where(mask, y - mean_y[:, None], 0.0)
+            diff[~mask] = 0.0
+        seen = m > 0
+        abs_diff = np.abs(diff)
+
+        # Pairwise merge of (n, mean, M2, C) with the chunk's, row by row
+        n = self.n + m
+        n_safe = np.maximum(n, 1)
+        delta_x, delta_y = mean_x - self.mean_x, mean_y - self.mean_y
+        weight = self.n * m / n_safe
+        self.m2_x += np.einsum('ij,ij->i', dx, dx) + delta_x * delta_x * weight
+        self.m2_y += np.einsum('ij,ij->i', dy, dy) + delta_y * delta_y * weight
+        self.c_xy += np.einsum('ij,ij->i', dx, dy) + delta_x * delta_y * weight
+        self.mean_x = np.where(seen, self.mean_x + delta_x * m / n_safe, self.mean_x)
+        self.mean_y = np.where(seen, self.mean_y + delta_y * m / n_safe, self.mean_y)
+        self.n = n
+
+        self.abs_sum += abs_diff.sum(axis=1)
+        self.sq_sum += np.einsum('ij,ij->i', diff, diff)
+        self.max_diff = np.maximum(self.max_diff, abs_diff.max(axis=1))
+        if dense:
+            self.min_x, self.max_x = np.minimum(self.min_x, x.min(axis=1)), np.maximum(self.max_x, x.max(axis=1))
+            self.min_y, self.max_y = np.minimum(self.min_y, y.min(axis=1)), np.maximum(self.max_y, y.max(axis=1))
+        else:
+            self.min_x = np.minimum(self.min_x, np.where(mask, x, np.inf).min(axis=1))
+            self.max_x = np.maximum(self.max_x, np.where(mask, x, -np.inf).max(axis=1))
+            self.min_y = np.minimum(self.min_y, np.where(mask, y, np.inf).min(axis=1))
+            self.max_y = np.maximum(self.max_y, np.where(mask, y, -np.inf).max(axis=1))
+
+        if self.top_k:
+            rank = np.where(mask, abs_diff, -1.0)  # NaN pairs rank last and are dropped in result()
+            columns = np.broadcast_to(np.arange(x.shape[1]), x.shape)
+            if x.shape[1] > self.top_k:
+                columns = np.argpartition(rank, -self.top_k, axis=1)[:, -self.top_k:]
+            take = lambda a: np.take_along_axis(a, columns, axis=1)
+            self._merge_top({
+                'bar_index': np.asarray(index)[columns],
+                'bar_time': None if times is None else np.asarray(times)[columns],
+                'mql5': take(x),
+                'python': take(y),
+                'diff': take(diff),
+                'rank': take(rank),
+            })
+
+    def _merge_top(self, chunk: dict) -> None:
+        if self._top is not None:
+            chunk = {
+                key: None if chunk[key] is None or self._top[key] is None
+                else np.concatenate([self._top[key], chunk[key]], axis=1)
+                for key in chunk
+            }
+        if chunk['rank'].shape[1] > self.top_k:
+            columns = np.argpartition(chunk['rank'], -self.top_k, axis=1)[:, -self.top_k:]
+            chunk = {key: None if value is None else np.take_along_axis(value, columns, axis=1)
+                     for key, value in chunk.items()}
+        self._top = chunk
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation per row (NaN when either side is constant)"""
+        denominator = np.sqrt(self.m2_x * self.m2_y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, self.c_xy / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+    def results(self, buffer_names) -> list:
+        """Metrics dicts (validate_indicator.calculate_metrics keys), one per buffer row.
+
+        With top_k, each also has 'diff', 'bar_index', 'bar_time', 'mql5_values'
+        and 'python_values' for its largest absolute diffs, largest first.
+        """
+        if self.rows is None:
+            self._start(len(buffer_names))
+        if len(buffer_names) != self.rows:
+            raise ValueError(f"Expected {self.rows} buffer names, got {len(buffer_names)}")
+
+        n = np.where(self.n > 0, self.n, np.nan)
+        mae = self.abs_sum / n
+        rmse = np.sqrt(self.sq_sum / n)
+        correlation = self.correlation
+
+        results = []
+        for row, buffer_name in enumerate(buffer_names):
+            metrics = {
+                "buffer_name": buffer_name,
+                "count": int(self.n[row]),
+                "correlation": float(correlation[row]),
+                "mae": float(mae[row]),
+                "rmse": float(rmse[row]),
+                "max_diff": float(self.max_diff[row]),
+                "mql5_min": float(self.min_x[row]),
+                "mql5_max": float(self.max_x[row]),
+                "mql5_mean": float(self.mean_x[row]),
+                "python_min": float(self.min_y[row]),
+                "python_max": float(self.max_y[row]),
+                "python_mean": float(self.mean_y[row]),
+            }
+            if self._top is not None:
+                rank = self._top['rank'][row]
+                order = np.argsort(-rank, kind='stable')
+                order = order[rank[order] >= 0]
+                metrics.update({
+                    "diff": self._top['diff'][row][order],
+                    "bar_index": self._top['bar_index'][row][order],
+                    "bar_time": None if self._top['bar_time'] is None else self._top['bar_time'][row][order],
+                    "mql5_values": self._top['mql5'][row][order],
+                    "python_values": self._top['python'][row][order],
+                })
+            results.append(metrics)
+        return results
+
+    def result(self, buffer_name: str) -> dict:
+        """Metrics dict of a single-buffer accumulator"""
+        return self.results([buffer_name])[0]
+
+
+class DivergenceProfiler:
+    """Where MQL5 and Python diverge: first bar over tolerance and a windowed correlation/error profile.
+
+    Bars are reduced into blocks of `step` bars (count, sums of x, y, x², y²,
+    xy and |diff|, max |diff|) as chunks arrive; a window is `window // step`
+    consecutive blocks, so window statistics come from block prefix sums (and
+    a sliding max) in O(n) overall, with memory O(n / step). Sums are taken
+    around each row's first-chunk mean to avoid cancellation. Rows are
+    buffers, as in MetricsAccumulator.
+    """
+
+    def __init__(self, window: int = 1000, step: int | None = None, tolerance: float = 1e-6):
+        """
+        Args:
+            window: Bars per profile window
+            step: Bars between window starts (default: window, i.e. adjacent windows)
+            tolerance: |diff| above which a bar counts as diverged
+        """
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        step = step or window
+        if step <= 0 or window % step:
+            raise ValueError(f"window ({window}) must be a positive multiple of step ({step})")
+        self.window = window
+        self.step = step
+        self.tolerance = tolerance
+        self.rows = None
+        self.bars = 0
+        self._blocks = []  # Per flushed chunk: dict of (rows, k) block statistics
+        self._carry = None  # Bars not yet filling a block: (x, y, index, times)
+
+    def _start(self, x) -> None:
+        self.rows = len(x)
+        with np.errstate(invalid='ignore'):
+            shift = np.nanmean(np.where(np.isnan(x), np.nan, x), axis=1) if x.shape[1] else np.zeros(len(x))
+        self.shift = np.nan_to_num(shift)
+        self.first_index = np.full(self.rows, -1, dtype=np.int64)
+        self.first_time = [None] * self.rows
+        self.first_diff = np.full(self.rows, np.nan)
+
+    def update(self, mql5_values, python_values, index=None, times=None) -> None:
+        """Add one chunk of paired values ((n_bars,) or (n_buffers, n_bars), like MetricsAccumulator)."""
+        x = np.atleast_2d(np.asarray(mql5_values, dtype=np.float64))
+        y = np.atleast_2d(np.asarray(python_values, dtype=np.float64))
+        if x.shape != y.shape:
+            raise ValueError(f"Chunk shape mismatch: {x.shape} MQL5 vs {y.shape} Python values")
+        if self.rows is None:
+            self._start(x)
+        index = np.arange(self.bars, self.bars + x.shape[1]) if index is None else np.asarray(index)
+        times = None if times is None else np.asarray(times)
+        self.bars += x.shape[1]
+
+        # First divergence: one vectorized argmax per row still searching; skipped once all rows are found
+        searching = self.first_index < 0
+        if searching.any() and x.shape[1]:
+            with np.errstate(invalid='ignore'):
+                exceeds = np.abs(x[searching] - y[searching]) > self.tolerance
+            hit = exceeds.any(axis=1)
+            first = exceeds.argmax(axis=1)
+            for row, column in zip(np.flatnonzero(searching)[hit], first[hit]):
+                self.first_index[row] = index[column]
+                self.first_time[row] = None if times is None else times[column]
+                self.first_diff[row] = x[row, column] - y[row, column]
+
+        if self._carry is not None:
+            cx, cy, ci, ct = self._carry
+            x, y = np.concatenate([cx, x], axis=1), np.concatenate([cy, y], axis=1)
+            index = np.concatenate([ci, index])
+            times = None if times is None or ct is None else np.concatenate([ct, times])
+        full = x.shape[1] // self.step * self.step
+        if full:
+            self._add_blocks(x[:, :full], y[:, :full], index[:full], None if times is None else times[:full])
+        self._carry = (x[:, full:], y[:, full:], index[full:], None if times is None else times[full:])
+
+    def _add_blocks(self, x, y, index, times) -> None:
+        rows, k = len(x), x.shape[1] // self.step
+        x = (x - self.shift[:, None]).reshape(rows, k, -1)
+        y = (y - self.shift[:, None]).reshape(rows, k, -1)
+        mask = ~(np.isnan(x) | np.isnan(y))
+        x, y = np.where(mask, x, 0.0), np.where(mask, y, 0.0)
+        abs_diff = np.abs(x - y)
+        starts = index[::x.shape[2]]
+        ends = index[x.shape[2] - 1::x.shape[2]] + 1
+        self._blocks.append({
+            'n': mask.sum(axis=2), 'sx': x.sum(axis=2), 'sy': y.sum(axis=2),
+            'sxx': (x * x).sum(axis=2), 'syy': (y * y).sum(axis=2), 'sxy': (x * y).sum(axis=2),
+            'sabs': abs_diff.sum(axis=2), 'max_abs': abs_diff.max(axis=2),
+            'start': starts, 'end': ends,
+            'start_time': None if times is None else times[::x.shape[2]],
+            'end_time': None if times is None else times[x.shape[2] - 1::x.shape[2]],
+        })
+
+    def results(self, buffer_names) -> list:
+        """Per buffer: first divergence and the window profile.
+
+        Returns:
+            List of dicts with tolerance, first_index (-1 if none), first_time,
+            first_diff and 'windows': dict of arrays start, end, start_time,
+            end_time, bars, correlation, mae, max_abs_diff (windows of the last,
+            partial block are included)
+        """
+        if self.rows is None:
+            self._start(np.empty((len(buffer_names), 0)))
+        if len(buffer_names) != self.rows:
+            raise ValueError(f"Expected {self.rows} buffer names, got {len(buffer_names)}")
+
+        blocks = list(self._blocks)
+        cx, cy, ci, ct = self._carry if self._carry is not None else (None, None, [], None)
+        if len(ci):
+            # Flush the partial block (a snapshot; later updates still extend the carry)
+            saved = self._blocks
+            self._blocks = []
+            step, self.step = self.step, len(ci)
+            self._add_blocks(cx, cy, ci, ct)
+            blocks.append(self._blocks[0])
+            self._blocks, self.step = saved, step
+
+        span = self.window // self.step
+        if blocks:
+            stats = {key: np.concatenate([b[key] for b in blocks], axis=-1) if blocks[0][key] is not None else None
+                     for key in blocks[0]}
+        else:
+            stats = None
+
+        windows = [None] * self.rows
+        if stats is not None:
+            nblocks = stats['n'].shape[1]
+            width = min(span, nblocks)
+            count = nblocks - width + 1
+
+            def window_sum(values):
+                prefix = np.concatenate([np.zeros((len(values), 1)), np.cumsum(values, axis=1)], axis=1)
+                return prefix[:, width:] - prefix[:, :count]
+
+            n = window_sum(stats['n'])
+            sx, sy = window_sum(stats['sx']), window_sum(stats['sy'])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                n_safe = np.where(n > 0, n, np.nan)
+                cov = window_sum(stats['sxy']) - sx * sy / n_safe
+                var_x = window_sum(stats['sxx']) - sx * sx / n_safe
+                var_y = window_sum(stats['syy']) - sy * sy / n_safe
+                denominator = np.sqrt(var_x * var_y)
+                correlation = np.where(denominator > 0, cov / np.where(denominator > 0, denominator, 1.0), np.nan)
+                mae = window_sum(stats['sabs']) / n_safe
+            max_abs = np.lib.stride_tricks.sliding_window_view(stats['max_abs'], width, axis=1).max(axis=-1)
+            for row in range(self.rows):
+                windows[row] = {
+                    'start': stats['start'][:count],
+                    'end': stats['end'][width - 1:],
+                    'start_time': None if stats['start_time'] is None else stats['start_time'][:count],
+                    'end_time': None if stats['end_time'] is None else stats['end_time'][width - 1:],
+                    'bars': n[row].astype(np.int64),
+                    'correlation': correlation[row],
+                    'mae': mae[row],
+                    'max_abs_diff': max_abs[row],
+                }
+
+        return [
+            {
+                'buffer_name': buffer_name,
+                'tolerance': self.tolerance,
+                'window': self.window,
+                'first_index': int(self.first_index[row]),
+                'first_time': self.first_time[row],
+                'first_diff': float(self.first_diff[row]),
+                'windows': windows[row],
+            }
+            for row, buffer_name in enumerate(buffer_names)
+        ]
+
+
+def _cross_correlate(a_spectrum, b_spectrum, nfft, max_lag):
+    """sum_t a[t] * b[t + lag] for lag = -max_lag..max_lag from rfft spectra"""
+    full = np.fft.irfft(np.conj(a_spectrum) * b_spectrum, nfft)
+    return np.concatenate([full[nfft - max_lag:], full[:max_lag + 1]])
+
+
+def lag_correlation(mql5_values, python_values, max_lag: int):
+    """Pearson correlation of mql5[t] with python[t + lag] for every lag in -max_lag..max_lag.
+
+    All lags at once in O(n log n): the per-lag overlap count, sums and sums of
+    squares of each side and the co-moment are cross-correlations of the
+    series, their squares and their NaN masks, each one FFT product. Pairs
+    with NaN on either side are excluded at every lag.
+
+    Args:
+        mql5_values, python_values: Equal-length 1-D arrays
+        max_lag: Largest shift in bars, either direction
+
+    Returns:
+        (lags, correlation) arrays of length 2 * max_lag + 1
+    """
+    x = np.asarray(mql5_values, dtype=np.float64)
+    y = np.asarray(python_values, dtype=np.float64)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError(f"Expected equal-length 1-D arrays, got {x.shape} and {y.shape}")
+    max_lag = min(max_lag, max(len(x) - 1, 0))
+    lags = np.arange(-max_lag, max_lag + 1)
+    if len(x) == 0:
+        return lags, np.full(len(lags), np.nan)
+
+    mask_x, mask_y = ~np.isnan(x), ~np.isnan(y)
+    # Centre (sums of squares then stay small) and zero out missing values
+    x = np.where(mask_x, x - (x[mask_x].mean() if mask_x.any() else 0.0), 0.0)
+    y = np.where(mask_y, y - (y[mask_y].mean() if mask_y.any() else 0.0), 0.0)
+
+    nfft = 1 << int(len(x) + max_lag - 1).bit_length()
+    fx, fxx, fmx = (np.fft.rfft(a, nfft) for a in (x, x * x, mask_x.astype(np.float64)))
+    fy, fyy, fmy = (np.fft.rfft(a, nfft) for a in (y, y * y, mask_y.astype(np.float64)))
+
+    n = np.rint(_cross_correlate(fmx, fmy, nfft, max_lag))
+    sx = _cross_correlate(fx, fmy, nfft, max_lag)
+    sy = _cross_correlate(fmx, fy, nfft, max_lag)
+    sxx = _cross_correlate(fxx, fmy, nfft, max_lag)
+    syy = _cross_correlate(fmx, fyy, nfft, max_lag)
+    sxy = _cross_correlate(fx, fy, nfft, max_lag)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_safe = np.where(n > 1, n, np.nan)
+        cov = sxy - sx * sy / n_safe
+        denominator = np.sqrt((sxx - sx * sx / n_safe) * (syy - sy * sy / n_safe))
+        correlation = np.where(denominator > 0, cov / np.where(denominator > 0, denominator, 1.0), np.nan)
+    return lags, correlation
+
+
+# Lag 0 wins unless another lag correlates better by more than FFT round-off
+LAG_EPSILON = 1e-9
+
+
+def best_lag(mql5_values, python_values, max_lag: int) -> dict:
+    """Shift that best aligns the two series (lag_correlation), preferring lag 0 on ties.
+
+    A positive lag means MQL5 bar t matches Python bar t + lag (MQL5 leads by
+    lag bars, negative: it trails); a non-zero best lag points at an
+    off-by-one or series indexing error rather than a calculation difference.
+
+    Returns:
+        dict with max_lag, best_lag, best_correlation, lag0_correlation, misaligned
+    """
+    lags, correlation = lag_correlation(mql5_values, python_values, max_lag)
+    zero = int(np.flatnonzero(lags == 0)[0]) if len(lags) else None
+    lag0 = float(correlation[zero]) if zero is not None else float('nan')
+    if len(lags) == 0 or np.isnan(correlation).all():
+        best, best_correlation = 0, lag0
+    else:
+        i = int(np.nanargmax(correlation))
+        best, best_correlation = int(lags[i]), float(correlation[i])
+        if not np.isnan(lag0) and best_correlation - lag0 <= LAG_EPSILON:
+            best, best_correlation = 0, lag0
+    return {
+        'max_lag': int(lags[-1]) if len(lags) else 0,
+        'best_lag': best,
+        'best_correlation': best_correlation,
+        'lag0_correlation': lag0,
+        'misaligned': best != 0,
+    }
@@ -0,0 +1,306 @@
+"""Indicator Registry.
+
+Declarative mapping between MQL5 indicators/export modules and their Python
+implementations (productionized from archive/experiments/spike_2_registry_pattern.py).
+
+Each entry records:
+- MQL5 source file, ExportAligned.mq5 enable flag and input parameters
+- Python module/function and how MQL5 inputs (including enums) map to kwargs
+- Buffer metadata: exported CSV column prefix -> Python output column
+- Validation config: warmup bars and correlation threshold
+
+Streaming: entries may name a bar-by-bar class (indicators/streaming.py) used
+by incremental exports; create_streaming() instantiates it.
+
+Warmup: modules may define warmup_bars(**params) -> int, the number of leading
+bars an indicator needs before its outputs are valid and independent of the
+initial state. Exporters fetch exactly requested + max(warmup) bars.
+
+Indicator modules are imported lazily, only when an indicator is selected, so
+CLI start-up (argparse choices, --help) does not import numpy/pandas or any
+indicator implementation. New ports plug in with register() or by adding an
+entry to REGISTRY - validate_indicator.py and run_validation.py need no edits.
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import importlib
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    """Python parameter mapped from an MQL5 input."""
+    name: str
+    default: object
+    mql5_param: str | None = None
+    mapping: dict | None = None  # MQL5 enum value -> Python value
+
+
+@dataclass(frozen=True)
+class BufferSpec:
+    """Indicator buffer exported to CSV."""
+    column: str   # CSV column name/prefix (e.g. "Laguerre_RSI" matches "Laguerre_RSI_32")
+    output: str   # Column in the Python implementation's result DataFrame
+    index: int = 0
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """Registry entry for one indicator."""
+    name: str
+    title: str
+    module: str
+    function: str
+    buffers: tuple
+    parameters: tuple = ()
+    mql5_file: str | None = None
+    export_flag: str | None = None  # ExportAligned.mq5 input enabling this module
+    warmup_bars: int = 0
+    threshold: float = 0.999
+    streaming: str | None = None  # Bar-by-bar class in `module` (see streaming.py)
+    output_start: bool = False  # Function accepts output_start= (skip outputs for leading bars)
+
+    def defaults(self) -> dict:
+        """Default Python kwargs."""
+        return {p.name: p.default for p in self.parameters}
+
+
+PRICE_MAPPING = {
+    'PRICE_CLOSE': 'close',
+    'PRICE_OPEN': 'open',
+    'PRICE_HIGH': 'high',
+    'PRICE_LOW': 'low',
+    'PRICE_MEDIAN': 'median',
+    'PRICE_TYPICAL': 'typical',
+    'PRICE_WEIGHTED': 'weighted',
+}
+
+MA_METHOD_MAPPING = {
+    'MODE_SMA': 'sma',
+    'MODE_EMA': 'ema',
+    'MODE_SMMA': 'smma',
+    'MODE_LWMA': 'lwma',
+}
+
+
+REGISTRY = {
+    'laguerre_rsi': IndicatorSpec(
+        name='laguerre_rsi',
+        title='ATR Adaptive Laguerre RSI',
+        module='indicators.laguerre_rsi',
+        function='calculate_laguerre_rsi_indicator',
+        mql5_file='PythonInterop/ATR_Adaptive_Laguerre_RSI.mq5',
+        export_flag='InpUseLaguerreRSI',
+        streaming='StreamingLaguerreRSI',
+        output_start=True,
+        buffers=(
+            BufferSpec('Laguerre_RSI', 'laguerre_rsi', 0),
+            BufferSpec('Laguerre_Signal', 'signal', 1),
+            BufferSpec('Adaptive_Period', 'adaptive_period', 2),
+            BufferSpec('ATR', 'atr', 3),
+        ),
+        parameters=(
+            ParamSpec('atr_period', 32, 'inpAtrPeriod'),
+            ParamSpec('price_type', 'close', 'inpRsiPrice', PRICE_MAPPING),
+            ParamSpec('price_smooth_period', 5, 'inpRsiMaPeriod'),
+            ParamSpec('price_smooth_method', 'ema', 'inpRsiMaType', MA_METHOD_MAPPING),
+            ParamSpec('level_up', 0.85, 'inpLevelUp'),
+            ParamSpec('level_down', 0.15, 'inpLevelDown'),
+        ),
+        warmup_bars=100,
+    ),
+    'rsi': IndicatorSpec(
+        name='rsi',
+        title='Relative Strength Index',
+        module='indicators.rsi',
+        function='calculate_rsi_indicator',
+        mql5_file='DataExport/modules/RSIModule.mqh',
+        export_flag='InpUseRSI',
+        streaming='StreamingRSI',
+        buffers=(
+            BufferSpec('RSI', 'rsi', 0),
+        ),
+        parameters=(
+            ParamSpec('period', 14, 'InpRSIPeriod'),
+        ),
+        warmup_bars=100,
+    ),
+    'sma': IndicatorSpec(
+        name='sma',
+        title='Simple Moving Average',
+        module='indicators.simple_sma',
+        function='calculate_sma',
+        mql5_file='DataExport/modules/SMAModule.mqh',
+        export_flag='InpUseSMA',
+        buffers=(
+            BufferSpec('SMA', 'sma', 0),
+        ),
+        parameters=(
+            ParamSpec('period', 14, 'InpSMAPeriod'),
+        ),
+        warmup_bars=14,
+    ),
+}
+
+# Residual influence of the initial state below which a recursive filter counts as warmed up
+WARMUP_TOLERANCE = 1e-4
+
+_functions = {}
+
+
+def register(spec: IndicatorSpec) -> None:
+    """Register (or replace) an indicator spec."""
+    REGISTRY[spec.name] = spec
+    _functions.pop(spec.name, None)
+
+
+def available_indicators() -> list:
+    """Names of all registered indicators (cheap: no indicator modules are imported)."""
+    return sorted(REGISTRY)
+
+
+def get_spec(name: str) -> IndicatorSpec:
+    """Look up an indicator spec.
+
+    Raises:
+        KeyError: If the indicator is not registered
+    """
+    if name not in REGISTRY:
+        raise KeyError(f"Unknown indicator: {name} (registered: {', '.join(available_indicators())})")
+    return REGISTRY[name]
+
+
+def load_function(name: str):
+    """Import the indicator's module on first use and return its calculate function."""
+    if name not in _functions:
+        spec = get_spec(name)
+        module = importlib.import_module(spec.module)
+        _functions[name] = getattr(module, spec.function)
+    return _functions[name]
+
+
+def load_module(name: str):
+    """Import and return the indicator's implementation module."""
+    return importlib.import_module(get_spec(name).module)
+
+
+def create_streaming(name: str, params: dict | None = None, state: dict | None = None):
+    """Instantiate the indicator's bar-by-bar implementation.
+
+    Args:
+        name: Registered indicator name
+        params: Python or MQL5 parameters (defaults applied)
+        state: Snapshot from a previous instance's state() to resume from
+
+    Raises:
+        ValueError: If the indicator has no streaming implementation
+    """
+    spec = get_spec(name)
+    if spec.streaming is None:
+        raise ValueError(f"Indicator {name} has no streaming implementation")
+    cls = getattr(load_module(name), spec.streaming)
+    if state is not None:
+        return cls.from_state(state)
+    return cls(**resolve_params(name, params))
+
+
+def resolve_params(name: str, params: dict | None = None) -> dict:
+    """Merge user parameters with defaults.
+
+    Accepts Python parameter names (atr_period=32) or MQL5 input names
+    (inpAtrPeriod=32, inpRsiMaType=MODE_EMA); MQL5 enum values are mapped.
+
+    Raises:
+        ValueError: If a parameter is unknown or an enum value has no mapping
+    """
+    spec = get_spec(name)
+    resolved = spec.defaults()
+    by_mql5 = {p.mql5_param: p for p in spec.parameters if p.mql5_param}
+    by_name = {p.name: p for p in spec.parameters}
+
+    for key, value in (params or {}).items():
+        param = by_name.get(key) or by_mql5.get(key)
+        if param is None:
+            raise ValueError(
+                f"Unknown parameter for {name}: {key} "
+                f"(valid: {', '.join(sorted(by_name))})"
+            )
+        if param.mapping is not None and value in param.mapping:
+            value = param.mapping[value]
+        elif param.mapping is not None and value not in param.mapping.values():
+            raise ValueError(f"Invalid value for {key}: {value} (valid: {', '.join(param.mapping)})")
+        resolved[param.name] = value
+
+    return resolved
+
+
+def output_kwargs(name: str, output_start: int = 0) -> dict:
+    """Output-slicing keywords for an indicator function (not parameters: never part of cache/graph keys)."""
+    if output_start and get_spec(name).output_start:
+        return {'output_start': output_start}
+    return {}
+
+
+def calculate(name: str, df, params: dict | None = None, cache=None, output_start: int = 0) -> dict:
+    """Run the Python implementation and return buffers keyed by CSV column prefix.
+
+    Args:
+        name: Registered indicator name
+        df: DataFrame with OHLC data
+        params: Python or MQL5 parameters (defaults applied)
+        cache: Optional indicators.cache.IndicatorCache to reuse previous results
+        output_start: First bar whose outputs are needed; indicators that support
+            it may leave earlier bars NaN (ignored with a cache, which keeps full results)
+
+    Returns:
+        Dictionary {csv_column_prefix: values}
+    """
+    spec = get_spec(name)
+    if cache is not None:
+        result = cache.compute(name, df, params)
+    else:
+        result = load_function(name)(df, **resolve_params(name, params), **output_kwargs(name, output_start))
+    return {buffer.column: result[buffer.output] for buffer in spec.buffers}
+
+
+def decay_warmup_bars(decay: float, stages: int = 1, tolerance: float = WARMUP_TOLERANCE) -> int:
+    """Bars until a recursive filter forgets its initial state.
+
+    For `stages` cascaded first-order filters with per-bar decay factor
+    `decay`, the initial-state influence after k bars is bounded by
+    C(k + stages - 1, stages - 1) * decay**k.
+
+    Args:
+        decay: Per-bar decay factor (e.g. 1 - alpha for an EMA), 0 <= decay < 1
+        stages: Number of cascaded stages (1 for EMA, 4 for the Laguerre filter)
+        tolerance: Residual influence threshold
+
+    Returns:
+        Number of warmup bars
+    """
+    if decay <= 0.0:
+        return 0
+    if stages == 1:
+        return int(math.ceil(math.log(tolerance) / math.log(decay)))
+
+    bars = 0
+    while math.comb(bars + stages - 1, stages - 1) * decay ** bars >= tolerance:
+        bars += 1
+    return bars
+
+
+def warmup_bars(name: str, params: dict | None = None) -> int:
+    """Declared warmup requirement of an indicator for the given parameters.
+
+    Uses the module's warmup_bars(**params) hook when present, otherwise the
+    registry's static warmup_bars.
+    """
+    spec = get_spec(name)
+    module = load_module(name)
+    if hasattr(module, 'warmup_bars'):
+        return int(module.warmup_bars(**resolve_params(name, params)))
+    return spec.warmup_bars
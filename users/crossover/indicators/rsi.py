@@ -0,0 +1,126 @@
+"""Relative Strength Index (RSI) - Python Implementation.
+
+Wilder's RSI as exported by export_aligned.py and ExportAligned.mq5 (RSIModule.mqh).
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import math
+
+import pandas as pd
+
+from indicators.registry import decay_warmup_bars
+from indicators.streaming import StreamingIndicator, ewm_alpha, ewm_step
+
+
+def calculate_rsi(prices: pd.Series, period: int = 14, delta: pd.Series | None = None) -> pd.Series:
+    """Calculate RSI (Relative Strength Index).
+
+    Formula:
+        RSI = 100 - (100 / (1 + RS))
+        where RS = Average Gain / Average Loss
+
+    Args:
+        prices: Close prices
+        period: RSI period (default 14)
+        delta: Precomputed price changes (optional, shared via indicators.graph)
+
+    Returns:
+        RSI values (NaN for the first period-1 bars)
+
+    Raises:
+        ValueError: If period < 1
+    """
+    if period < 1:
+        raise ValueError(f"Period must be >= 1, got {period}")
+
+    # Calculate price changes
+    if delta is None:
+        delta = prices.diff()
+
+    # Separate gains and losses
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+
+    # Calculate exponential moving average (Wilder's smoothing)
+    # alpha=1/period is the correct Wilder's method for RSI
+    avg_gain = gain.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1/period, min_periods=period, adjust=False).mean()
+
+    # Calculate RS and RSI
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+
+    return rsi
+
+
+def calculate_rsi_indicator(
+    df: pd.DataFrame,
+    period: int = 14,
+    price_col: str = 'close',
+    delta: pd.Series | None = None
+) -> pd.DataFrame:
+    """Calculate RSI over a bar DataFrame.
+
+    Args:
+        df: DataFrame with OHLC data
+        period: RSI period (default 14)
+        price_col: Column to use for calculation (default: close)
+        delta: Precomputed price changes (optional, shared via indicators.graph)
+
+    Returns:
+        DataFrame with 'rsi' column
+    """
+    return pd.DataFrame({'rsi': calculate_rsi(df[price_col], period=period, delta=delta)}, index=df.index)
+
+
+def graph_inputs(period: int = 14, price_col: str = 'close') -> dict:
+    """Shared intermediates consumed by calculate_rsi_indicator (see indicators/graph.py)."""
+    return {'delta': ('diff', price_col)}
+
+
+def warmup_bars(period: int = 14, **_) -> int:
+    """Bars before RSI is valid (period) and Wilder smoothing has converged."""
+    return period + decay_warmup_bars(1.0 - 1.0 / period)
+
+
+class StreamingRSI(StreamingIndicator):
+    """Bar-by-bar RSI matching calculate_rsi_indicator.
+
+    Args:
+        period: RSI period (default 14)
+        price_col: Bar field to use (default: close)
+    """
+
+    PARAMS = ('period', 'price_col')
+    STATE = ('count', 'prev_price', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int = 14, price_col: str = 'close', **_):
+        if period < 1:
+            raise ValueError(f"Period must be >= 1, got {period}")
+        self.period = period
+        self.price_col = price_col
+        self.count = 0
+        self.prev_price = None
+        self.avg_gain = math.nan
+        self.avg_loss = math.nan
+
+    def update(self, bar) -> dict:
+        price = float(bar[self.price_col])
+        delta = 0.0 if self.prev_price is None else price - self.prev_price
+        alpha = ewm_alpha(alpha=1 / self.period)
+
+        self.avg_gain = ewm_step(self.avg_gain, delta if delta > 0 else 0.0, alpha)
+        self.avg_loss = ewm_step(self.avg_loss, -delta if delta < 0 else 0.0, alpha)
+        self.prev_price = price
+        self.count += 1
+
+        if self.count < self.period:
+            return {'rsi': math.nan}
+        if self.avg_loss == 0.0:
+            rs = math.inf if self.avg_gain > 0 else math.nan
+        else:
+            rs = self.avg_gain / self.avg_loss
+        return {'rsi': 100 - (100 / (1 + rs))}
@@ -0,0 +1,328 @@
+"""Trading Session Calendar (New York / London / Tokyo with DST).
+
+Python counterpart of Trading_Sessions_Lines.mq5. Instead of converting every
+bar through broker server time -> UTC -> local session time, the session
+boundaries for whole years are precomputed into one sorted edge array with a
+session bitmask per segment. Tagging any number of bars is then a single
+np.searchsorted call.
+
+DST rules match CacheDSTBoundaries() in the MQL5 indicator:
+    New York: 2nd Sunday of March -> 1st Sunday of November (EST -5 / EDT -4)
+    London:   last Sunday of March -> last Sunday of October (GMT 0 / BST +1)
+    Tokyo:    no DST (JST +9)
+
+Calendars are cached in memory and on disk (npz), so repeated runs over the
+same years reuse the same boundary arrays.
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from indicators.cache import DEFAULT_CACHE_DIR
+
+
+SECONDS_PER_DAY = 86400
+
+# Session definitions: (open_hour, open_minute, close_hour, close_minute, dst_rule, standard_gmt_offset)
+# Defaults match the InpNY*/InpLondon*/InpTokyo* inputs of Trading_Sessions_Lines.mq5
+DEFAULT_SESSIONS = {
+    'new_york': (9, 30, 16, 0, 'us', -5),
+    'london': (8, 0, 16, 30, 'uk', 0),
+    'tokyo': (9, 0, 15, 0, None, 9),
+}
+
+
+def _day_of_week(days: np.ndarray) -> np.ndarray:
+    """Day of week for datetime64[D] values (0=Sunday, matching MqlDateTime.day_of_week)."""
+    return (days.astype(np.int64) + 4) % 7
+
+
+def dst_boundaries(years: np.ndarray, rule: str) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate DST start/end dates for each year.
+
+    Args:
+        years: Integer years
+        rule: 'us' (2nd Sunday Mar -> 1st Sunday Nov) or 'uk' (last Sunday Mar -> last Sunday Oct)
+
+    Returns:
+        Tuple of (dst_start, dst_end) as datetime64[D] arrays; DST is active for
+        local dates in [dst_start, dst_end)
+
+    Raises:
+        ValueError: If rule is unknown
+    """
+    years = np.asarray(years, dtype=np.int64)
+    base = (years - 1970).astype('datetime64[Y]')
+
+    if rule == 'us':
+        march_1 = base.astype('datetime64[M]') + np.timedelta64(2, 'M')
+        march_1 = march_1.astype('datetime64[D]')
+        nov_1 = (base.astype('datetime64[M]') + np.timedelta64(10, 'M')).astype('datetime64[D]')
+        start = march_1 + ((7 - _day_of_week(march_1)) % 7) + 7
+        end = nov_1 + ((7 - _day_of_week(nov_1)) % 7)
+    elif rule == 'uk':
+        march_31 = (base.astype('datetime64[M]') + np.timedelta64(2, 'M')).astype('datetime64[D]') + 30
+        oct_31 = (base.astype('datetime64[M]') + np.timedelta64(9, 'M')).astype('datetime64[D]') + 30
+        start = march_31 - _day_of_week(march_31)
+        end = oct_31 - _day_of_week(oct_31)
+    else:
+        raise ValueError(f"Invalid DST rule: {rule}")
+
+    return start, end
+
+
+def _gmt_offset_hours(days: np.ndarray, rule: str | None, standard_offset: int) -> np.ndarray:
+    """GMT offset (hours) in effect on each local date."""
+    if rule is None:
+        return np.full(len(days), standard_offset, dtype=np.int64)
+
+    years = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    unique_years, inverse = np.unique(years, return_inverse=True)
+    start, end = dst_boundaries(unique_years, rule)
+    in_dst = (days >= start[inverse]) & (days < end[inverse])
+    return standard_offset + in_dst.astype(np.int64)
+
+
+class SessionCalendar:
+    """Precomputed session boundaries in broker server time.
+
+    Attributes:
+        names: Session names; bit k of a mask refers to names[k]
+        edges: Sorted server-time boundaries (int64 seconds)
+        masks: Session bitmask for each segment (len(edges) + 1);
+               masks[i] applies to times in [edges[i-1], edges[i])
+        start_year, end_year: Inclusive year range covered
+    """
+
+    __slots__ = ('names', 'edges', 'masks', 'start_year', 'end_year')
+
+    def __init__(self, names, edges, masks, start_year, end_year):
+        self.names = tuple(names)
+        self.edges = edges
+        self.masks = masks
+        self.start_year = int(start_year)
+        self.end_year = int(end_year)
+
+    def tag(self, times) -> np.ndarray:
+        """Return the session bitmask for each server time (one searchsorted call).
+
+        Args:
+            times: Broker server times (int seconds as returned by MT5, or datetime64)
+
+        Returns:
+            uint8 bitmask array (bit k set when inside names[k])
+        """
+        return self.masks[np.searchsorted(self.edges, _as_seconds(times), side='right')]
+
+    def in_session(self, times, name: str) -> np.ndarray:
+        """Boolean array: True where the server time is inside the named session."""
+        bit = np.uint8(1 << self.names.index(name))
+        return (self.tag(times) & bit) != 0
+
+
+def _as_seconds(times) -> np.ndarray:
+    """Convert MT5 int seconds / datetime64 / pandas datetimes to int64 seconds."""
+    if isinstance(times, (pd.Series, pd.Index)):
+        times = times.to_numpy()
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[s]').astype(np.int64)
+    return times.astype(np.int64, copy=False)
+
+
+def build_session_calendar(
+    start_year: int,
+    end_year: int,
+    broker_gmt_offset: int = 2,
+    broker_dst: str | None = None,
+    sessions: dict | None = None
+) -> SessionCalendar:
+    """Build the session calendar for a year range.
+
+    Args:
+        start_year: First year (inclusive)
+        end_year: Last year (inclusive)
+        broker_gmt_offset: Broker server standard GMT offset in hours (InpBrokerGMTOffset)
+        broker_dst: DST rule followed by the broker server (None = fixed offset
+                    as in the MQL5 indicator, 'us' for NY-close servers GMT+2/+3)
+        sessions: Session definitions (default: DEFAULT_SESSIONS)
+
+    Returns:
+        SessionCalendar
+
+    Raises:
+        ValueError: If year range is invalid or more than 8 sessions are given
+    """
+    if end_year < start_year:
+        raise ValueError(f"Invalid year range: {start_year}..{end_year}")
+
+    sessions = sessions or DEFAULT_SESSIONS
+    if len(sessions) > 8:
+        raise ValueError(f"At most 8 sessions supported, got {len(sessions)}")
+
+    # Local trading dates (Mon-Fri) covering the range, padded by a day either side
+    first = np.datetime64(f"{start_year:04d}-01-01") - 1
+    last = np.datetime64(f"{end_year + 1:04d}-01-01") + 1
+    days = np.arange(first, last, dtype='datetime64[D]')
+    days = days[(_day_of_week(days) >= 1) & (_day_of_week(days) <= 5)]
+    day_seconds = days.astype(np.int64) * SECONDS_PER_DAY
+
+    names = list(sessions)
+    times = []
+    deltas = []
+
+    for bit, name in enumerate(names):
+        open_h, open_m, close_h, close_m, rule, standard_offset = sessions[name]
+        offset = _gmt_offset_hours(days, rule, standard_offset)
+
+        open_utc = day_seconds + (open_h * 3600 + open_m * 60) - offset * 3600
+        close_utc = day_seconds + (close_h * 3600 + close_m * 60) - offset * 3600
+        close_utc = np.where(close_utc <= open_utc, close_utc + SECONDS_PER_DAY, close_utc)
+
+        # UTC -> broker server time
+        if broker_dst is None:
+            open_srv = open_utc + broker_gmt_offset * 3600
+            close_srv = close_utc + broker_gmt_offset * 3600
+        else:
+            utc_days = (open_utc // SECONDS_PER_DAY).astype('datetime64[D]')
+            broker_offset = _gmt_offset_hours(utc_days, broker_dst, broker_gmt_offset)
+            open_srv = open_utc + broker_offset * 3600
+            close_srv = close_utc + broker_offset * 3600
+
+        delta = np.zeros((2 * len(days), len(names)), dtype=np.int64)
+        delta[:len(days), bit] = 1
+        delta[len(days):, bit] = -1
+        times.append(np.concatenate([open_srv, close_srv]))
+        deltas.append(delta)
+
+    times = np.concatenate(times)
+    deltas = np.concatenate(deltas)
+
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    active = np.cumsum(deltas[order], axis=0) > 0
+
+    # Collapse coincident boundaries: keep the state after the last event at each time
+    last_of_run = np.append(times[1:] != times[:-1], True)
+    edges = times[last_of_run]
+    weights = (1 << np.arange(len(names))).astype(np.uint8)
+    segment_masks = (active[last_of_run] * weights).sum(axis=1).astype(np.uint8)
+    masks = np.concatenate([np.zeros(1, dtype=np.uint8), segment_masks])
+
+    return SessionCalendar(names, edges, masks, start_year, end_year)
+
+
+def _calendar_key(broker_gmt_offset, broker_dst, sessions) -> str:
+    """Stable hash of calendar parameters (used for on-disk cache names)."""
+    spec = repr((__version__, broker_gmt_offset, broker_dst, sorted(sessions.items())))
+    return hashlib.sha1(spec.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=32)
+def _load_cached(start_year, end_year, broker_gmt_offset, broker_dst, sessions_items, cache_dir):
+    sessions = dict(sessions_items)
+    key = _calendar_key(broker_gmt_offset, broker_dst, sessions)
+    path = None
+
+    if cache_dir is not None:
+        path = Path(cache_dir) / 'sessions' / f"calendar_{key}_{start_year}_{end_year}.npz"
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                return SessionCalendar(
+                    [str(n) for n in data['names']], data['edges'], data['masks'],
+                    start_year, end_year
+                )
+
+    calendar = build_session_calendar(start_year, end_year, broker_gmt_offset, broker_dst, sessions)
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, names=np.array(calendar.names), edges=calendar.edges, masks=calendar.masks)
+        os.replace(tmp_path, path)
+
+    return calendar
+
+
+def get_session_calendar(
+    start_year: int,
+    end_year: int,
+    broker_gmt_offset: int = 2,
+    broker_dst: str | None = None,
+    sessions: dict | None = None,
+    cache_dir: Path | str | None = DEFAULT_CACHE_DIR
+) -> SessionCalendar:
+    """Get a session calendar, reusing in-memory and on-disk cached copies.
+
+    Args:
+        start_year: First year (inclusive)
+        end_year: Last year (inclusive)
+        broker_gmt_offset: Broker server standard GMT offset in hours
+        broker_dst: Broker server DST rule (None, 'us' or 'uk')
+        sessions: Session definitions (default: DEFAULT_SESSIONS)
+        cache_dir: On-disk cache root (None disables the disk cache)
+
+    Returns:
+        SessionCalendar
+    """
+    sessions = sessions or DEFAULT_SESSIONS
+    return _load_cached(
+        int(start_year), int(end_year), broker_gmt_offset, broker_dst,
+        tuple(sessions.items()), str(cache_dir) if cache_dir is not None else None
+    )
+
+
+def tag_sessions(
+    times,
+    broker_gmt_offset: int = 2,
+    broker_dst: str | None = None,
+    day_roll_hour: int = 0,
+    sessions: dict | None = None,
+    cache_dir: Path | str | None = DEFAULT_CACHE_DIR
+) -> pd.DataFrame:
+    """Tag each bar with its trading sessions and trading day.
+
+    Args:
+        times: Broker server bar times (MT5 int seconds or datetime64)
+        broker_gmt_offset: Broker server standard GMT offset in hours
+        broker_dst: Broker server DST rule (None, 'us' or 'uk')
+        day_roll_hour: Server hour at which the trading day rolls over (0 = server midnight)
+        sessions: Session definitions (default: DEFAULT_SESSIONS)
+        cache_dir: On-disk calendar cache root (None disables the disk cache)
+
+    Returns:
+        DataFrame with columns:
+        - 'session_mask': uint8 bitmask of active sessions
+        - 'trading_day': Trading day (datetime64[D])
+        - 'in_<session>': Boolean flag per session
+    """
+    seconds = _as_seconds(times)
+    sessions = sessions or DEFAULT_SESSIONS
+
+    if len(seconds) == 0:
+        start_year = end_year = 1970
+    else:
+        years = np.array([seconds.min(), seconds.max()]).astype('datetime64[s]').astype('datetime64[Y]')
+        start_year, end_year = (years.astype(np.int64) + 1970).tolist()
+
+    calendar = get_session_calendar(start_year, end_year, broker_gmt_offset, broker_dst, sessions, cache_dir)
+    mask = calendar.tag(seconds)
+
+    result = {
+        'session_mask': mask,
+        'trading_day': ((seconds - day_roll_hour * 3600) // SECONDS_PER_DAY).astype('datetime64[D]'),
+    }
+    for bit, name in enumerate(calendar.names):
+        result[f'in_{name}'] = (mask & np.uint8(1 << bit)) != 0
+
+    index = times.index if isinstance(times, pd.Series) else None
+    return pd.DataFrame(result, index=index)
@@ -2,6 +2,8 @@
 Simple Moving Average (SMA) - Python Implementation
 Test indicator for workflow validation
 """
+__version__ = '1.0.0'
+
 import pandas as pd
 import numpy as np
 
@@ -9,7 +11,8 @@ import numpy as np
 def calculate_sma(
     df: pd.DataFrame,
     period: int = 14,
-    price_col: str = 'close'
+    price_col: str = 'close',
+    rolling_sum: pd.Series | None = None
 ) -> pd.DataFrame:
     """
     Calculate Simple Moving Average.
@@ -18,12 +21,17 @@ def calculate_sma(
         df: DataFrame with OHLC data
         period: SMA period
         price_col: Column to use for calculation (default: close)
+        rolling_sum: Precomputed rolling sum over `period` bars (optional, shared via indicators.graph)
 
     Returns:
         DataFrame with 'sma' column
     """
     result = pd.DataFrame(index=df.index)
 
+    if rolling_sum is not None:
+        result['sma'] = rolling_sum / period
+        return result
+
     # Calculate SMA matching MQL5 behavior
     # MQL5: SMA[i] = sum(close[i-period+1 .. i]) / period
     sma = pd.Series(index=df.index, dtype=float)
@@ -41,3 +49,13 @@ def calculate_sma(
     result['sma'] = sma
 
     return result
+
+
+def graph_inputs(period: int = 14, price_col: str = 'close') -> dict:
+    """Shared intermediates consumed by calculate_sma (see indicators/graph.py)."""
+    return {'rolling_sum': ('rolling_sum', price_col, period)}
+
+
+def warmup_bars(period: int = 14, **_) -> int:
+    """Bars before the first full SMA window."""
+    return period - 1
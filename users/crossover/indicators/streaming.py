@@ -0,0 +1,134 @@
+"""Streaming (Bar-by-Bar) Indicator Support.
+
+Batch kernels recompute an indicator over the whole series. Incremental
+exports (export_aligned.py --append) instead advance an indicator one bar at
+a time from a saved state. Streaming implementations live next to their
+batch kernels (rsi.StreamingRSI, laguerre_rsi.StreamingLaguerreRSI) and
+reproduce the batch output bar for bar, including pandas' ewm(adjust=False)
+arithmetic.
+
+State is plain JSON-serializable data:
+
+    ind = registry.create_streaming('rsi', {'period': 14})
+    for bar in rates:
+        values = ind.update(bar)          # {'rsi': ...}
+    saved = ind.state()                   # dict, json.dumps-able
+    ind = type(ind).from_state(saved)     # resume later
+
+peek(bar) evaluates a still-forming bar without committing it, for intrabar
+(tick-by-tick) values; see indicators/ticks.py.
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+import abc
+import copy
+import math
+from collections import deque
+
+import pandas as pd
+
+
+def ewm_alpha(span: float | None = None, alpha: float | None = None) -> float:
+    """Smoothing factor exactly as pandas derives it (via center of mass).
+
+    Args:
+        span: EWM span (alpha = 2 / (span + 1))
+        alpha: Explicit smoothing factor
+
+    Returns:
+        alpha used by pandas' ewm kernels
+
+    Raises:
+        ValueError: If neither or both of span/alpha are given
+    """
+    if (span is None) == (alpha is None):
+        raise ValueError("Pass exactly one of span or alpha")
+    com = (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+    return 1.0 / (1.0 + float(com))
+
+
+def ewm_step(weighted: float, value: float, alpha: float) -> float:
+    """One step of pandas' ewm(adjust=False).mean() recursion.
+
+    Args:
+        weighted: Previous smoothed value (NaN before the first observation)
+        value: New observation
+        alpha: Smoothing factor from ewm_alpha()
+
+    Returns:
+        New smoothed value
+    """
+    if math.isnan(weighted):
+        return value
+    if math.isnan(value) or weighted == value:
+        return weighted
+    old_wt = 1.0 - alpha
+    return (old_wt * weighted + alpha * value) / (old_wt + alpha)
+
+
+class StreamingIndicator(abc.ABC):
+    """Base class: JSON state round-trip and batch replay.
+
+    Subclasses set PARAMS (constructor arguments) and STATE (mutable
+    attributes) and implement update(bar) -> {output_column: value}, where
+    bar is anything indexable by field name (an MT5 rates record, a dict or
+    a DataFrame row).
+    """
+
+    PARAMS = ()
+    STATE = ()
+
+    @abc.abstractmethod
+    def update(self, bar) -> dict:
+        """Advance the state by one closed bar and return its outputs."""
+
+    def peek(self, bar) -> dict:
+        """Outputs for a still-forming bar without advancing the state.
+
+        Intrabar evaluation: call peek() on every tick of the current bar and
+        update() once when the bar closes.
+        """
+        saved = {name: copy.copy(getattr(self, name)) for name in self.STATE}
+        try:
+            return self.update(bar)
+        finally:
+            for name, value in saved.items():
+                setattr(self, name, value)
+
+    def state(self) -> dict:
+        """Serializable snapshot of parameters and state."""
+        state = {}
+        for name in self.STATE:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, deque) else value
+        return {
+            'params': {name: getattr(self, name) for name in self.PARAMS},
+            'state': state,
+        }
+
+    @classmethod
+    def from_state(cls, snapshot: dict) -> 'StreamingIndicator':
+        """Restore an indicator saved with state()."""
+        indicator = cls(**snapshot['params'])
+        for name, value in snapshot['state'].items():
+            current = getattr(indicator, name)
+            if isinstance(current, deque):
+                value = deque(value, maxlen=current.maxlen)
+            setattr(indicator, name, value)
+        return indicator
+
+    def run(self, bars, index=None) -> pd.DataFrame:
+        """Advance over a sequence of bars and collect the outputs.
+
+        Args:
+            bars: Iterable of bars (structured rates array, BarSeries.data, ...)
+            index: Index for the result (default: RangeIndex)
+
+        Returns:
+            DataFrame with one row per bar
+        """
+        rows = [self.update(bar) for bar in bars]
+        return pd.DataFrame(rows, index=index)
@@ -0,0 +1,233 @@
+"""Streaming Tick-to-Bar Aggregation.
+
+Builds MT5-style bars from tick pages (mt5.copy_ticks_range output) for any
+timeframe, including custom ones (S30, M12, H2, ...), and drives streaming
+indicators (indicators/streaming.py) as bars form:
+
+    agg = TickBarAggregator(parse_bar_seconds('M1'), indicators, intrabar=True)
+    for ticks in pages:
+        batch = agg.add(ticks)      # closed bars + indicator values
+    batch = agg.flush()             # close the last bar
+
+Each page is reduced with vectorized segment operations (reduceat); only the
+still-forming bar is carried between pages, so memory is bounded by the page
+size regardless of the total tick count. With intrabar=True every tick also
+yields the indicator values of the forming bar (StreamingIndicator.peek),
+which is what an MQL5 indicator reports when it recalculates on each tick.
+
+Bars follow MqlRates: time is the bar open (epoch seconds), OHLC from the
+chosen price field (bid by default, as MT5 builds forex bars), tick_volume is
+the tick count, real_volume the summed tick volume and spread the last
+tick's ask - bid in points (when the symbol point is given).
+
+Version: 1.0.0
+"""
+
+__version__ = '1.0.0'
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from indicators.bars import RATES_DTYPE
+
+
+# MqlTick layout as returned by mt5.copy_ticks_range
+TICKS_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('last', '<f8'),
+    ('volume', '<u8'),
+    ('time_msc', '<i8'),
+    ('flags', '<u4'),
+    ('volume_real', '<f8'),
+])
+
+_UNIT_SECONDS = {'S': 1, 'M': 60, 'H': 3600, 'D': 86400, 'W': 7 * 86400}
+
+# Weekly bars open on Sunday 00:00; the epoch (1970-01-01) was a Thursday
+_WEEK_ANCHOR = -4 * 86400
+
+
+def parse_bar_seconds(timeframe: str) -> int:
+    """Bar length in seconds for MT5 (M1, H4, D1, W1) or custom (S30, M12) timeframes.
+
+    Raises:
+        ValueError: If the timeframe is malformed or not fixed-length (MN1)
+    """
+    timeframe = timeframe.upper()
+    unit, count = timeframe[:1], timeframe[1:]
+    if unit not in _UNIT_SECONDS or not count.isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid timeframe: {timeframe} (e.g. S30, M1, M12, H4, D1, W1; MN1 is not fixed-length)")
+    return _UNIT_SECONDS[unit] * int(count)
+
+
+def bar_open(seconds, bar_seconds: int):
+    """Open time of the bar containing `seconds` (epoch seconds, scalar or array)."""
+    anchor = _WEEK_ANCHOR if bar_seconds % (7 * 86400) == 0 else 0
+    return seconds - (seconds - anchor) % bar_seconds
+
+
+@dataclass
+class TickBatch:
+    """Output of one aggregation step."""
+    bars: np.ndarray                 # Closed bars (RATES_DTYPE)
+    bar_values: dict                 # {indicator: DataFrame, one row per closed bar}
+    tick_time_msc: np.ndarray | None = None  # Ticks with intrabar values
+    tick_values: dict | None = None  # {indicator: DataFrame, one row per tick}
+
+
+class TickBarAggregator:
+    """Streaming tick-to-bar aggregator driving streaming indicators.
+
+    Args:
+        bar_seconds: Bar length in seconds (see parse_bar_seconds)
+        indicators: {name: StreamingIndicator} advanced on every closed bar
+        price: Tick price field used for OHLC ('bid', 'ask' or 'last')
+        point: Symbol point size; enables the spread field
+        intrabar: Also evaluate indicators on the forming bar at every tick
+    """
+
+    def __init__(self, bar_seconds: int, indicators: dict | None = None, price: str = 'bid',
+                 point: float | None = None, intrabar: bool = False):
+        if bar_seconds < 1:
+            raise ValueError(f"bar_seconds must be >= 1, got {bar_seconds}")
+        if price not in ('bid', 'ask', 'last'):
+            raise ValueError(f"Invalid price field: {price} (valid: bid, ask, last)")
+
+        self.bar_seconds = bar_seconds
+        self.indicators = indicators or {}
+        self.price = price
+        self.point = point
+        self.intrabar = intrabar
+        self.forming = None  # Still-forming bar (dict of MqlRates fields)
+
+    def _empty_batch(self) -> TickBatch:
+        values = {name: pd.DataFrame() for name in self.indicators}
+        if self.intrabar:
+            return TickBatch(np.zeros(0, RATES_DTYPE), values, np.zeros(0, np.int64), dict(values))
+        return TickBatch(np.zeros(0, RATES_DTYPE), values)
+
+    def _commit(self, bar, rows: dict) -> None:
+        for name, indicator in self.indicators.items():
+            rows[name].append(indicator.update(bar))
+
+    def add(self, ticks: np.ndarray) -> TickBatch:
+        """Aggregate one page of ticks (time-ordered, continuing the previous page).
+
+        Returns:
+            TickBatch with the bars closed by this page
+        """
+        price = np.asarray(ticks[self.price], dtype=np.float64)
+        valid = price > 0  # Ticks that did not change this price carry 0
+        if not valid.all():
+            ticks = ticks[valid]
+            price = price[valid]
+
+        n = len(price)
+        if n == 0:
+            return self._empty_batch()
+
+        seconds = ticks['time_msc'] // 1000
+        bucket = bar_open(seconds, self.bar_seconds)
+        new_bar = np.empty(n, dtype=bool)
+        new_bar[0] = True
+        np.not_equal(bucket[1:], bucket[:-1], out=new_bar[1:])
+        starts = np.flatnonzero(new_bar)
+        ends = np.append(starts[1:], n)
+
+        volume = np.asarray(ticks['volume'], dtype=np.uint64)
+        if self.point:
+            spread = np.rint((ticks['ask'] - ticks['bid']) / self.point).astype(np.int32)
+        else:
+            spread = np.zeros(n, dtype=np.int32)
+
+        segments = np.zeros(len(starts), dtype=RATES_DTYPE)
+        segments['time'] = bucket[starts]
+        segments['open'] = price[starts]
+        segments['high'] = np.maximum.reduceat(price, starts)
+        segments['low'] = np.minimum.reduceat(price, starts)
+        segments['close'] = price[ends - 1]
+        segments['tick_volume'] = ends - starts
+        segments['real_volume'] = np.add.reduceat(volume, starts)
+        segments['spread'] = spread[ends - 1]
+
+        # Continue the carried bar, or close it if this page starts a new one
+        forming = self.forming
+        merged = forming is not None and forming['time'] == segments['time'][0]
+        if merged:
+            first = segments[0]
+            first['open'] = forming['open']
+            first['high'] = max(first['high'], forming['high'])
+            first['low'] = min(first['low'], forming['low'])
+            first['tick_volume'] += forming['tick_volume']
+            first['real_volume'] += forming['real_volume']
+
+        carried = []
+        if forming is not None and not merged:
+            carried = [tuple(forming[f] for f in RATES_DTYPE.names)]
+        closed = np.concatenate([np.array(carried, dtype=RATES_DTYPE), segments[:-1]])
+        last = segments[-1]
+        self.forming = {f: last[f].item() for f in RATES_DTYPE.names}
+
+        rows = {name: [] for name in self.indicators}
+        if not self.intrabar:
+            for bar in closed:
+                self._commit(bar, rows)
+            return TickBatch(closed, {name: pd.DataFrame(r) for name, r in rows.items()})
+
+        # Intrabar: running OHLC of the forming bar at every tick
+        bar_index = np.cumsum(new_bar) - 1
+        grouped = pd.Series(price).groupby(bar_index)
+        run_high = grouped.cummax().to_numpy(copy=True)
+        run_low = grouped.cummin().to_numpy(copy=True)
+        run_count = grouped.cumcount().to_numpy() + 1
+        run_volume = pd.Series(volume.astype(np.float64)).groupby(bar_index).cumsum().to_numpy(copy=True)
+        if merged:
+            head = bar_index == 0
+            run_high[head] = np.maximum(run_high[head], forming['high'])
+            run_low[head] = np.minimum(run_low[head], forming['low'])
+            run_count[head] += forming['tick_volume']
+            run_volume[head] += forming['real_volume']
+        run_open = segments['open'][bar_index]
+        run_time = segments['time'][bar_index]
+
+        tick_rows = {name: [] for name in self.indicators}
+        next_closed = 0
+        if carried:
+            self._commit(closed[0], rows)
+            next_closed = 1
+        for i in range(n):
+            if i > 0 and new_bar[i]:
+                self._commit(closed[next_closed], rows)
+                next_closed += 1
+            bar = {
+                'time': run_time[i], 'open': run_open[i], 'high': run_high[i], 'low': run_low[i],
+                'close': price[i], 'tick_volume': run_count[i], 'real_volume': run_volume[i],
+                'spread': spread[i],
+            }
+            for name, indicator in self.indicators.items():
+                tick_rows[name].append(indicator.peek(bar))
+
+        return TickBatch(
+            closed,
+            {name: pd.DataFrame(r) for name, r in rows.items()},
+            np.asarray(ticks['time_msc'], dtype=np.int64),
+            {name: pd.DataFrame(r) for name, r in tick_rows.items()},
+        )
+
+    def flush(self) -> TickBatch:
+        """Close the forming bar (end of data)."""
+        if self.forming is None:
+            return self._empty_batch()
+
+        closed = np.array([tuple(self.forming[f] for f in RATES_DTYPE.names)], dtype=RATES_DTYPE)
+        self.forming = None
+        rows = {name: [] for name in self.indicators}
+        self._commit(closed[0], rows)
+        batch = self._empty_batch()
+        batch.bars = closed
+        batch.bar_values = {name: pd.DataFrame(r) for name, r in rows.items()}
+        return batch
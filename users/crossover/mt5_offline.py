@@ -0,0 +1,498 @@
+"""
+mt5_offline.py - Offline MetaTrader5-compatible module backed by a local store
+
+Implements the subset of the MetaTrader5 Python API used by the export and
+validation scripts (initialize, shutdown, symbol_select, symbol_info,
+symbol_info_tick, copy_rates_from_pos, copy_rates_from, copy_rates_range,
+copy_ticks_from, copy_ticks_range, last_error, terminal_info, version and
+the TIMEFRAME_*/COPY_TICKS_* constants) without Wine or a terminal. Data is
+served as MT5-shaped structured arrays from a local store:
+
+    <store>/<SYMBOL>/<PERIOD>.npy|.npz|.parquet   rates (MqlRates fields)
+    <store>/<SYMBOL>/ticks.npy|.npz|.parquet      ticks (MqlTick fields)
+    <store>/<SYMBOL>/symbol.json                  symbol_info overrides
+
+.npy stores are memory-mapped, so large histories are not loaded up front.
+A history lake (history_lake.py) can be used as the store directly; its
+bars are then read partition by partition.
+
+Optional injected latency (a fixed delay per call plus a delay per 1000
+rows returned) approximates the terminal IPC cost, which makes full-pipeline
+throughput tests reproducible.
+
+Like the real module, calls return None on failure and last_error() reports
+(code, message).
+
+Usage:
+    # Run an unmodified script against the store
+    python mt5_offline.py --store ./mt5_store --latency-ms 5 export_aligned.py --symbol EURUSD --period M1
+
+    # Or in-process
+    import mt5_offline
+    mt5_offline.configure(store='./mt5_store', latency_ms=5)
+    mt5_offline.install()          # import MetaTrader5 now returns this module
+    mt5_offline.save_rates('./mt5_store', 'EURUSD', 'M1', rates)
+
+Environment: MT5_OFFLINE_STORE, MT5_OFFLINE_LATENCY_MS, MT5_OFFLINE_LATENCY_PER_1K_MS
+"""
+import os
+import sys
+import json
+import time
+import runpy
+import argparse
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from history_lake import HistoryLake
+from indicators.bars import RATES_DTYPE
+from indicators.ticks import TICKS_DTYPE
+
+
+# Timeframe constants (values of the real MetaTrader5 package)
+TIMEFRAMES = {
+    'M1': 1, 'M2': 2, 'M3': 3, 'M4': 4, 'M5': 5, 'M6': 6, 'M10': 10, 'M12': 12, 'M15': 15, 'M20': 20, 'M30': 30,
+    'H1': 16385, 'H2': 16386, 'H3': 16387, 'H4': 16388, 'H6': 16390, 'H8': 16392, 'H12': 16396,
+    'D1': 16408, 'W1': 32769, 'MN1': 49153,
+}
+for _name, _value in TIMEFRAMES.items():
+    globals()[f'TIMEFRAME_{_name}'] = _value
+PERIOD_NAMES = {value: name for name, value in TIMEFRAMES.items()}
+
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+
+TICK_FLAG_BID = 2
+TICK_FLAG_ASK = 4
+TICK_FLAG_LAST = 8
+TICK_FLAG_VOLUME = 16
+
+# last_error() codes
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+RES_E_INTERNAL_FAIL_CONNECT = -10004
+
+STORE_FORMATS = ('npy', 'npz', 'parquet')
+
+SymbolInfo = namedtuple('SymbolInfo', [
+    'name', 'description', 'path', 'currency_base', 'currency_profit', 'digits', 'point',
+    'spread', 'trade_contract_size', 'visible', 'select',
+])
+Tick = namedtuple('Tick', list(TICKS_DTYPE.names))
+TerminalInfo = namedtuple('TerminalInfo', [
+    'build', 'company', 'name', 'path', 'data_path', 'connected', 'trade_allowed',
+])
+
+BUILD = 5000
+
+_config = {
+    'store': os.environ.get('MT5_OFFLINE_STORE', 'mt5_store'),
+    'latency_ms': float(os.environ.get('MT5_OFFLINE_LATENCY_MS', 0)),
+    'latency_per_1k_ms': float(os.environ.get('MT5_OFFLINE_LATENCY_PER_1K_MS', 0)),
+}
+_session = {'initialized': False, 'selected': set()}
+_last_error = [(RES_S_OK, 'Success')]
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def configure(store=None, latency_ms=None, latency_per_1k_ms=None):
+    """
+    Set the store directory and injected latency
+
+    Args:
+        store: Store root directory
+        latency_ms: Fixed delay per data call (milliseconds)
+        latency_per_1k_ms: Additional delay per 1000 rows returned (milliseconds)
+    """
+    if store is not None:
+        _config['store'] = str(store)
+        with _cache_lock:
+            _cache.clear()
+    if latency_ms is not None:
+        _config['latency_ms'] = float(latency_ms)
+    if latency_per_1k_ms is not None:
+        _config['latency_per_1k_ms'] = float(latency_per_1k_ms)
+
+
+def install():
+    """Register this module as MetaTrader5 so `import MetaTrader5 as mt5` resolves to it"""
+    sys.modules['MetaTrader5'] = sys.modules[__name__]
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def _store_file(symbol, stem):
+    folder = Path(_config['store']) / symbol
+    for fmt in STORE_FORMATS:
+        path = folder / f"{stem}.{fmt}"
+        if path.exists():
+            return path
+    return None
+
+
+def _read_array(path, dtype):
+    """Load a store file as a structured array with the given dtype"""
+    if path.suffix == '.npy':
+        array = np.load(path, mmap_mode='r')
+        if array.dtype == dtype:
+            return array
+        columns = {name: array[name] for name in array.dtype.names}
+    elif path.suffix == '.npz':
+        with np.load(path) as npz:
+            columns = {name: npz[name] for name in npz.files}
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=[n for n in dtype.names if n in pq.read_schema(path).names])
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+
+    if 'time' not in columns:
+        raise ValueError(f"{path}: store file has no 'time' column")
+    length = len(columns['time'])
+    array = np.zeros(length, dtype=dtype)
+    for name in dtype.names:
+        if name in columns:
+            array[name] = columns[name]
+    return array
+
+
+def _load(symbol, stem, dtype):
+    """Cached store array for (symbol, stem); None if the store has no such file"""
+    key = (_config['store'], symbol, stem)
+    with _cache_lock:
+        if key not in _cache:
+            path = _store_file(symbol, stem)
+            _cache[key] = None if path is None else _read_array(path, dtype)
+        return _cache[key]
+
+
+def _write_array(path, array):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.npy':
+        np.save(path, array)
+    elif path.suffix == '.npz':
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **{name: array[name] for name in array.dtype.names})
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({name: array[name] for name in array.dtype.names})
+        pq.write_table(table, path, compression='zstd')
+
+
+def _save(store, symbol, stem, array, dtype, fmt):
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Invalid store format: {fmt} (valid: {', '.join(STORE_FORMATS)})")
+    folder = Path(store) / symbol.upper()
+    for other in STORE_FORMATS:
+        (folder / f"{stem}.{other}").unlink(missing_ok=True)
+    converted = np.zeros(len(array), dtype=dtype)
+    for name in dtype.names:
+        if name in array.dtype.names:
+            converted[name] = array[name]
+    path = folder / f"{stem}.{fmt}"
+    _write_array(path, converted[np.argsort(converted['time'], kind='stable')])
+    with _cache_lock:
+        _cache.clear()
+    return path
+
+
+def save_rates(store, symbol, period, rates, fmt='npy'):
+    """
+    Write a rates array to the store (sorted by time; missing fields are zero)
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        ValueError: If period or fmt is invalid
+    """
+    if period not in TIMEFRAMES:
+        raise ValueError(f"Invalid period: {period} (valid: {', '.join(TIMEFRAMES)})")
+    return _save(store, symbol, period, rates, RATES_DTYPE, fmt)
+
+
+def save_ticks(store, symbol, ticks, fmt='npy'):
+    """Write a ticks array to the store (see save_rates)"""
+    return _save(store, symbol, 'ticks', ticks, TICKS_DTYPE, fmt)
+
+
+def save_symbol_info(store, symbol, **fields):
+    """Write symbol_info() overrides (point, digits, description, ...) for a symbol"""
+    unknown = set(fields) - set(SymbolInfo._fields)
+    if unknown:
+        raise ValueError(f"Unknown symbol_info fields: {', '.join(sorted(unknown))}")
+    path = Path(store) / symbol.upper() / 'symbol.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(fields, indent=2))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# MetaTrader5 API
+# ---------------------------------------------------------------------------
+
+def _fail(code, message):
+    _last_error[0] = (code, message)
+    return None
+
+
+def _ok(result):
+    _last_error[0] = (RES_S_OK, 'Success')
+    return result
+
+
+def _delay(rows=0):
+    delay_ms = _config['latency_ms'] + _config['latency_per_1k_ms'] * rows / 1000
+    if delay_ms > 0:
+        time.sleep(delay_ms / 1000)
+
+
+def _epoch(value):
+    """Seconds since epoch for a datetime (naive = UTC) or a number"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _symbol_exists(symbol):
+    return (Path(_config['store']) / symbol).is_dir()
+
+
+def _lake():
+    """HistoryLake when the store root is a history lake, else None"""
+    key = (_config['store'], 'lake')
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = HistoryLake(_config['store']) if HistoryLake.is_lake(_config['store']) else None
+        return _cache[key]
+
+
+def _rates(symbol, timeframe):
+    """Store rates (or the HistoryLake serving them) for a call, or None with last_error set"""
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    if timeframe not in PERIOD_NAMES:
+        return _fail(RES_E_INVALID_PARAMS, f'Invalid timeframe {timeframe}')
+    period = PERIOD_NAMES[timeframe]
+    lake = _lake()
+    if lake is not None:
+        rates = lake if period in lake.periods(symbol) else None
+    else:
+        rates = _load(symbol, period, RATES_DTYPE)
+    if rates is None:
+        return _fail(RES_E_NOT_FOUND, f'No {period} history for {symbol}')
+    return rates
+
+
+def _ticks(symbol):
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    ticks = _load(symbol, 'ticks', TICKS_DTYPE)
+    if ticks is None:
+        return _fail(RES_E_NOT_FOUND, f'No tick history for {symbol}')
+    return ticks
+
+
+def _result(array):
+    """Detached copy of a store slice, after the injected latency"""
+    result = np.array(array, dtype=array.dtype)
+    _delay(len(result))
+    return _ok(result)
+
+
+def initialize(path=None, **kwargs):
+    """Open the store (path/login/password/server arguments are accepted and ignored)"""
+    _delay()
+    if not Path(_config['store']).is_dir():
+        _session['initialized'] = False
+        _fail(RES_E_INTERNAL_FAIL_CONNECT, f"Offline store not found: {_config['store']}")
+        return False
+    _session['initialized'] = True
+    _ok(None)
+    return True
+
+
+def shutdown():
+    _session['initialized'] = False
+    _session['selected'].clear()
+    return True
+
+
+def last_error():
+    return _last_error[0]
+
+
+def version():
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    return _ok((500, BUILD, '01 Jan 2025'))
+
+
+def terminal_info():
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    store = str(Path(_config['store']).resolve())
+    return _ok(TerminalInfo(BUILD, 'Offline store', 'mt5_offline', store, store, True, False))
+
+
+def symbol_select(symbol, enable=True):
+    if not _session['initialized']:
+        _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+        return False
+    if not _symbol_exists(symbol):
+        _fail(RES_E_NOT_FOUND, f'Symbol {symbol} not found in store')
+        return False
+    if enable:
+        _session['selected'].add(symbol)
+    else:
+        _session['selected'].discard(symbol)
+    _ok(None)
+    return True
+
+
+def symbol_info(symbol):
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    if not _symbol_exists(symbol):
+        return _fail(RES_E_NOT_FOUND, f'Symbol {symbol} not found in store')
+
+    fields = {
+        'name': symbol, 'description': symbol, 'path': f'Offline\\{symbol}',
+        'currency_base': symbol[:3], 'currency_profit': symbol[3:6] or symbol,
+        'digits': 5, 'point': 1e-5, 'spread': 0, 'trade_contract_size': 100000.0,
+    }
+    overrides = Path(_config['store']) / symbol / 'symbol.json'
+    if overrides.exists():
+        fields.update(json.loads(overrides.read_text()))
+    selected = symbol in _session['selected']
+    fields.update(visible=selected, select=selected)
+    _delay()
+    return _ok(SymbolInfo(**fields))
+
+
+def symbol_info_tick(symbol):
+    """Last stored tick (or the last M1 bar close as bid/ask when there are no ticks)"""
+    if not _session['initialized']:
+        return _fail(RES_E_INTERNAL_FAIL_CONNECT, 'No IPC connection')
+    ticks = _load(symbol, 'ticks', TICKS_DTYPE)
+    if ticks is not None and len(ticks):
+        _delay()
+        return _ok(Tick(*ticks[-1].tolist()))
+    lake = _lake()
+    rates = lake.tail(symbol, 'M1', 1) if lake is not None else _load(symbol, 'M1', RATES_DTYPE)
+    if rates is None or len(rates) == 0:
+        return _fail(RES_E_NOT_FOUND, f'No ticks or M1 history for {symbol}')
+    bar = rates[-1]
+    close = float(bar['close'])
+    _delay()
+    return _ok(Tick(int(bar['time']), close, close, 0.0, 0, int(bar['time']) * 1000, 0, 0.0))
+
+
+def copy_rates_from_pos(symbol, timeframe, start_pos, count):
+    """`count` bars ending `start_pos` bars before the most recent one (oldest first)"""
+    rates = _rates(symbol, timeframe)
+    if rates is None:
+        return None
+    if start_pos < 0 or count < 0:
+        return _fail(RES_E_INVALID_PARAMS, 'start_pos and count must be >= 0')
+    if isinstance(rates, HistoryLake):
+        rates = rates.tail(symbol, PERIOD_NAMES[timeframe], start_pos + count)
+    end = max(0, len(rates) - start_pos)
+    return _result(rates[max(0, end - count):end])
+
+
+def copy_rates_from(symbol, timeframe, date_from, count):
+    """`count` bars opening at or before date_from (oldest first)"""
+    rates = _rates(symbol, timeframe)
+    if rates is None:
+        return None
+    if isinstance(rates, HistoryLake):
+        return _result(rates.tail(symbol, PERIOD_NAMES[timeframe], count, end=_epoch(date_from)))
+    end = np.searchsorted(rates['time'], _epoch(date_from), side='right')
+    return _result(rates[max(0, end - count):end])
+
+
+def copy_rates_range(symbol, timeframe, date_from, date_to):
+    """Bars opening within [date_from, date_to]"""
+    rates = _rates(symbol, timeframe)
+    if rates is None:
+        return None
+    if isinstance(rates, HistoryLake):
+        return _result(rates.read(symbol, PERIOD_NAMES[timeframe], _epoch(date_from), _epoch(date_to)))
+    times = rates['time']
+    start = np.searchsorted(times, _epoch(date_from), side='left')
+    end = np.searchsorted(times, _epoch(date_to), side='right')
+    return _result(rates[start:end])
+
+
+def _filter_ticks(ticks, flags):
+    if flags == COPY_TICKS_INFO:
+        return ticks[(ticks['flags'] & (TICK_FLAG_BID | TICK_FLAG_ASK)) != 0]
+    if flags == COPY_TICKS_TRADE:
+        return ticks[(ticks['flags'] & (TICK_FLAG_LAST | TICK_FLAG_VOLUME)) != 0]
+    return ticks
+
+
+def copy_ticks_from(symbol, date_from, count, flags):
+    """`count` ticks from date_from onwards"""
+    ticks = _ticks(symbol)
+    if ticks is None:
+        return None
+    start = np.searchsorted(ticks['time_msc'], _epoch(date_from) * 1000, side='left')
+    if flags == COPY_TICKS_ALL:
+        return _result(ticks[start:start + count])
+    return _result(_filter_ticks(ticks[start:], flags)[:count])
+
+
+def copy_ticks_range(symbol, date_from, date_to, flags):
+    """Ticks with time_msc within [date_from, date_to] (second resolution, inclusive)"""
+    ticks = _ticks(symbol)
+    if ticks is None:
+        return None
+    msc = ticks['time_msc']
+    start = np.searchsorted(msc, _epoch(date_from) * 1000, side='left')
+    end = np.searchsorted(msc, _epoch(date_to) * 1000, side='right')
+    return _result(_filter_ticks(ticks[start:end], flags))
+
+
+def main():
+    """Run a script with `import MetaTrader5` served from the offline store"""
+    parser = argparse.ArgumentParser(
+        description='Run a MetaTrader5 script against a local offline store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python mt5_offline.py --store ./mt5_store export_aligned.py --symbol EURUSD --period M1 --bars 5000
+  python mt5_offline.py --store ./mt5_store --latency-ms 5 --latency-per-1k-ms 2 batch_export.py --manifest nightly.json
+        """
+    )
+    parser.add_argument('--store', default=_config['store'], help='Store directory (default: $MT5_OFFLINE_STORE or ./mt5_store)')
+    parser.add_argument('--latency-ms', type=float, default=_config['latency_ms'], help='Injected delay per API call (ms)')
+    parser.add_argument('--latency-per-1k-ms', type=float, default=_config['latency_per_1k_ms'], help='Injected delay per 1000 rows returned (ms)')
+    parser.add_argument('script', help='Script to run')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments for the script')
+    args = parser.parse_args()
+
+    configure(store=args.store, latency_ms=args.latency_ms, latency_per_1k_ms=args.latency_per_1k_ms)
+    install()
+
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, str(Path(args.script).resolve().parent))
+    runpy.run_path(args.script, run_name='__main__')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
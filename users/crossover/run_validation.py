@@ -30,6 +30,8 @@ from pathlib import Path
 from datetime import datetime
 import os
 
+from indicators import registry
+
 
 class ValidationOrchestrationError(Exception):
     """Raised when orchestration workflow fails"""
@@ -44,7 +46,7 @@ def parse_args():
     parser.add_argument(
         "--indicator",
         required=True,
-        choices=["laguerre_rsi", "rsi"],
+        choices=registry.available_indicators(),
         help="Indicator to validate"
     )
     parser.add_argument(
@@ -155,16 +157,12 @@ def generate_config(symbol: str, period: str, bars: int, indicator: str, output_
     """
     print("[1/6] Generating MT5 config.ini...")
 
-    # Map indicator to script parameters
+    # Map indicator to script parameters (ExportAligned.mq5 module flag from registry)
     script_params = []
-    if indicator == "laguerre_rsi":
-        script_params = [
-            f"InpUseLaguerreRSI:true",
-            f"InpBars:{bars}"
-        ]
-    elif indicator == "rsi":
+    export_flag = registry.get_spec(indicator).export_flag
+    if export_flag:
         script_params = [
-            f"InpUseRSI:true",
+            f"{export_flag}:true",
             f"InpBars:{bars}"
         ]
 
@@ -0,0 +1,317 @@
+"""
+synthetic_data.py - Deterministic synthetic MT5 bars and ticks for benchmarks
+
+Generates MT5-shaped structured arrays (indicators.bars.RATES_DTYPE,
+indicators.ticks.TICKS_DTYPE) at any scale without network access or a
+terminal:
+
+- Prices: geometric Brownian motion ('gbm') or two-state regime switching
+  ('regime': calm/volatile runs of geometric length with a volatility multiplier)
+- Calendar: forex week in server time (Monday 00:00 - Friday 24:00), no
+  weekend bars, a price gap at every week open, and occasional missing bars
+  that are likelier in quiet hours
+- Session profile: hourly activity (Asia < London < London/New York overlap)
+  scales volatility, tick_volume and (inversely) the spread; the spread also
+  widens around the daily rollover
+
+Bars are produced in vectorized blocks. Block b uses the random stream
+(seed, b), so the output is fully determined by the seed and block size:
+
+    for block in iter_bars(50_000_000, period='M1', seed=7):
+        ...                                   # 1M-bar RATES_DTYPE arrays
+    rates = generate_bars(200_000, period='M12', model='regime')
+
+Usage:
+    python synthetic_data.py --symbol SYNTH --period M1 --bars 10000000 --store ./mt5_store
+    python synthetic_data.py --symbol SYNTH --period M12 --bars 200000 --model regime --ticks 5000000 --store ./mt5_store
+
+Stores are written as memory-mapped .npy files in the mt5_offline layout
+(<store>/<SYMBOL>/<PERIOD>.npy, ticks.npy), block by block, so memory stays
+bounded at any size.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from indicators.bars import RATES_DTYPE
+from indicators.ticks import TICKS_DTYPE, parse_bar_seconds
+
+
+DAY = 86400
+WEEK = 7 * DAY
+TRADING_WEEK = 5 * DAY  # Monday 00:00 - Friday 24:00 server time
+YEAR = 260 * DAY        # Trading seconds per year (volatility scaling)
+
+# Relative activity by server hour (GMT+2): Asia, London open, London/New York overlap
+SESSION_ACTIVITY = np.array([
+    0.35, 0.30, 0.35, 0.45, 0.55, 0.60, 0.60, 0.55, 0.60, 0.90, 1.20, 1.30,
+    1.20, 1.10, 1.20, 1.50, 1.70, 1.60, 1.30, 1.00, 0.80, 0.60, 0.45, 0.40,
+])
+SESSION_ACTIVITY = SESSION_ACTIVITY / SESSION_ACTIVITY.mean()
+
+MODELS = ('gbm', 'regime')
+BLOCK_BARS = 1_000_000
+
+TICK_FLAG_BID = 2
+TICK_FLAG_ASK = 4
+
+
+def _week_start(start):
+    """Epoch seconds of the Monday 00:00 on or before `start`"""
+    start = int(pd.Timestamp(start).timestamp())
+    monday_offset = 4 * DAY  # 1970-01-05 was a Monday
+    return start - (start - monday_offset) % WEEK
+
+
+def _calendar(trading_seconds, week_start):
+    """Map seconds of trading time (weekends removed) to epoch seconds"""
+    return week_start + (trading_seconds // TRADING_WEEK) * WEEK + trading_seconds % TRADING_WEEK
+
+
+def _activity(epoch_seconds):
+    return SESSION_ACTIVITY[(epoch_seconds // 3600) % 24]
+
+
+def _regime_path(n, rng, state, mean_calm, mean_volatile):
+    """Regime per bar (0 calm, 1 volatile); runs continue across blocks via `state`"""
+    regimes = np.empty(n, dtype=np.int8)
+    pos = min(state['left'], n)
+    regimes[:pos] = state['regime']
+    state['left'] -= pos
+    while pos < n:
+        state['regime'] ^= 1
+        length = int(rng.geometric(1.0 / (mean_volatile if state['regime'] else mean_calm)))
+        take = min(length, n - pos)
+        regimes[pos:pos + take] = state['regime']
+        pos += take
+        state['left'] = length - take
+    return regimes
+
+
+def iter_bars(num_bars, period='M1', start='2020-01-06', seed=0, model='gbm', price=1.1, annual_vol=0.08,
+              drift=0.0, digits=5, spread_points=10, ticks_per_minute=40.0, missing_rate=0.001,
+              weekend_gap_scale=1.0, volatile_mult=2.5, regime_bars=(2000, 300), block_bars=BLOCK_BARS):
+    """
+    Generate bars in vectorized blocks
+
+    Args:
+        num_bars: Total number of bars
+        period: Timeframe dividing a day (M1, M12, H4, D1, S30, ...)
+        start: First trading week (anything pd.Timestamp accepts)
+        seed: Random seed
+        model: 'gbm' or 'regime'
+        price: Initial price
+        annual_vol: Annualised volatility (per trading year of 260 days)
+        drift: Annualised log drift
+        digits: Price rounding (symbol digits)
+        spread_points: Typical spread in points at average activity
+        ticks_per_minute: Mean tick rate at average activity (drives tick_volume)
+        missing_rate: Probability of a missing bar at average activity (higher when quiet)
+        weekend_gap_scale: Weekend gap volatility in units of a trading day's volatility
+        volatile_mult: Volatility multiplier of the volatile regime
+        regime_bars: Mean (calm, volatile) run lengths in bars
+        block_bars: Bars per yielded block
+
+    Yields:
+        RATES_DTYPE arrays of up to block_bars bars, in time order
+
+    Raises:
+        ValueError: If the period does not divide a day or the model is unknown
+    """
+    period_s = parse_bar_seconds(period)
+    if DAY % period_s != 0:
+        raise ValueError(f"Period {period} must divide a day (W1/MN1 are not supported)")
+    if model not in MODELS:
+        raise ValueError(f"Invalid model: {model} (valid: {', '.join(MODELS)})")
+    if num_bars < 0 or block_bars < 1:
+        raise ValueError(f"num_bars must be >= 0 and block_bars >= 1, got {num_bars}, {block_bars}")
+
+    week_start = _week_start(start)
+    bar_vol = annual_vol * np.sqrt(period_s / YEAR)
+    gap_vol = weekend_gap_scale * annual_vol * np.sqrt(DAY / YEAR)
+    bars_per_week = TRADING_WEEK // period_s
+    regime_state = {'regime': 0, 'left': 0}
+
+    slot = int(pd.Timestamp(start).timestamp()) - week_start  # Slots in trading time
+    slot = -(-min(slot, TRADING_WEEK) // period_s)
+    log_close = np.log(price)
+
+    for block, first in enumerate(range(0, num_bars, block_bars)):
+        n = min(block_bars, num_bars - first)
+        rng = np.random.default_rng([seed, block])
+
+        # Missing bars: skip a slot with probability scaled by quietness
+        nominal = slot + np.arange(n)
+        quiet = 1.0 / _activity(_calendar(nominal * period_s, week_start))
+        steps = 1 + (rng.random(n) < missing_rate * quiet)
+        slots = slot + np.cumsum(steps) - 1
+        previous_week = (slot - 1) // bars_per_week if first else slots[0] // bars_per_week
+        slot = int(slots[-1]) + 1
+        times = _calendar(slots * period_s, week_start)
+        activity = _activity(times)
+
+        if model == 'regime':
+            regime = _regime_path(n, rng, regime_state, *regime_bars)
+            vol_mult = np.where(regime == 1, volatile_mult, 1.0)
+        else:
+            vol_mult = np.ones(n)
+        sigma = bar_vol * np.sqrt(activity) * vol_mult
+
+        returns = (drift * period_s / YEAR - 0.5 * sigma ** 2) + sigma * rng.standard_normal(n)
+        week_open = np.diff(slots // bars_per_week, prepend=previous_week) != 0
+        gaps = np.where(week_open, gap_vol * rng.standard_normal(n), 0.0)
+
+        closes = log_close + np.cumsum(gaps + returns)
+        opens = closes - returns
+        log_close = closes[-1]
+
+        rates = np.zeros(n, dtype=RATES_DTYPE)
+        rates['time'] = times
+        o, c = np.exp(opens), np.exp(closes)
+        wick = 0.5 * sigma
+        rates['open'] = np.round(o, digits)
+        rates['close'] = np.round(c, digits)
+        rates['high'] = np.round(np.maximum(o, c) * np.exp(wick * np.abs(rng.standard_normal(n))), digits)
+        rates['low'] = np.round(np.minimum(o, c) * np.exp(-wick * np.abs(rng.standard_normal(n))), digits)
+        rates['tick_volume'] = 1 + rng.poisson(ticks_per_minute * period_s / 60 * activity * np.sqrt(vol_mult))
+
+        rollover = ((times // 3600) % 24 == 0)
+        spread = spread_points / np.sqrt(activity) * np.where(rollover, 3.0, 1.0) * (1 + 0.3 * (vol_mult - 1))
+        rates['spread'] = np.maximum(1, np.rint(spread * rng.uniform(0.8, 1.2, n))).astype(np.int32)
+
+        yield rates
+
+
+def generate_bars(num_bars, **kwargs):
+    """All bars of iter_bars() in one array (see iter_bars for arguments)"""
+    blocks = list(iter_bars(num_bars, **kwargs))
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=RATES_DTYPE)
+
+
+def iter_ticks(num_ticks, start='2020-01-06', seed=0, price=1.1, annual_vol=0.08, digits=5, spread_points=10,
+               ticks_per_minute=40.0, weekend_gap_scale=1.0, block_ticks=BLOCK_BARS):
+    """
+    Generate bid/ask ticks in vectorized blocks
+
+    Arrival gaps are exponential with a rate following the session profile;
+    bid moves with volatility proportional to the square root of elapsed
+    time; ask = bid + spread. Ticks are INFO ticks (bid and ask flags).
+
+    Yields:
+        TICKS_DTYPE arrays of up to block_ticks ticks, in time order
+    """
+    week_start = _week_start(start)
+    point = 10.0 ** -digits
+    gap_vol = weekend_gap_scale * annual_vol * np.sqrt(DAY / YEAR)
+    mean_gap_ms = 60_000.0 / ticks_per_minute
+    trading_ms = min(int(pd.Timestamp(start).timestamp()) - week_start, TRADING_WEEK) * 1000
+    log_bid = np.log(price)
+
+    for block, first in enumerate(range(0, num_ticks, block_ticks)):
+        n = min(block_ticks, num_ticks - first)
+        rng = np.random.default_rng([seed, block, 1])
+
+        # Two passes: the arrival rate depends on the hour of the (nominal) arrival time
+        nominal = trading_ms + np.cumsum(rng.exponential(mean_gap_ms, n))
+        activity = _activity(_calendar(nominal.astype(np.int64) // 1000, week_start))
+        gaps_ms = np.maximum(1, np.rint(rng.exponential(mean_gap_ms, n) / activity)).astype(np.int64)
+        elapsed = trading_ms + np.cumsum(gaps_ms)
+        weeks = elapsed // (TRADING_WEEK * 1000)
+        week_open = np.diff(weeks, prepend=trading_ms // (TRADING_WEEK * 1000)) != 0
+        trading_ms = int(elapsed[-1])
+
+        msc = week_start * 1000 + weeks * WEEK * 1000 + elapsed % (TRADING_WEEK * 1000)
+        sigma = annual_vol * np.sqrt(gaps_ms / 1000 / YEAR)
+        moves = sigma * rng.standard_normal(n) + np.where(week_open, gap_vol * rng.standard_normal(n), 0.0)
+        bids = log_bid + np.cumsum(moves)
+        log_bid = bids[-1]
+
+        activity = _activity(msc // 1000)
+        spread = np.maximum(1, np.rint(spread_points / np.sqrt(activity) * rng.uniform(0.8, 1.2, n)))
+
+        ticks = np.zeros(n, dtype=TICKS_DTYPE)
+        ticks['time_msc'] = msc
+        ticks['time'] = msc // 1000
+        ticks['bid'] = np.round(np.exp(bids), digits)
+        ticks['ask'] = np.round(ticks['bid'] + spread * point, digits)
+        ticks['flags'] = TICK_FLAG_BID | TICK_FLAG_ASK
+        yield ticks
+
+
+def write_store(blocks, path, total, dtype):
+    """
+    Write blocks into a memory-mapped .npy file of `total` rows
+
+    Returns:
+        Number of rows written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for stale in path.parent.glob(f"{path.stem}.*"):
+        stale.unlink()
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(total,))
+    written = 0
+    for block in blocks:
+        out[written:written + len(block)] = block
+        written += len(block)
+    out.flush()
+    del out
+    return written
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Generate deterministic synthetic MT5 bars/ticks into an offline store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python synthetic_data.py --symbol SYNTH --period M1 --bars 10000000 --store ./mt5_store
+  python synthetic_data.py --symbol SYNTH --period M12 --bars 200000 --model regime --ticks 5000000
+  python mt5_offline.py --store ./mt5_store export_aligned.py --symbol SYNTH --period M1 --bars 100000
+        """
+    )
+    parser.add_argument('--symbol', default='SYNTH', help='Symbol name in the store (default: SYNTH)')
+    parser.add_argument('--period', default='M1', help='Bar timeframe (default: M1)')
+    parser.add_argument('--bars', type=int, default=1_000_000, help='Number of bars (default: 1000000)')
+    parser.add_argument('--ticks', type=int, default=0, help='Also generate this many ticks (default: 0)')
+    parser.add_argument('--model', default='gbm', choices=MODELS, help='Price model (default: gbm)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--start', default='2020-01-06', help='First trading week (default: 2020-01-06)')
+    parser.add_argument('--store', default='mt5_store', help='Store directory (default: ./mt5_store)')
+    args = parser.parse_args()
+
+    symbol = args.symbol.upper()
+    period = args.period.upper()
+    folder = Path(args.store) / symbol
+
+    print("=" * 70)
+    print(f"Synthetic Data - {symbol} {period} ({args.model}, seed {args.seed})")
+    print("=" * 70)
+    print()
+
+    try:
+        t0 = time.perf_counter()
+        bars = iter_bars(args.bars, period=period, start=args.start, seed=args.seed, model=args.model)
+        written = write_store(bars, folder / f"{period}.npy", args.bars, RATES_DTYPE)
+        print(f"[OK] {written} bars -> {folder / f'{period}.npy'} ({time.perf_counter() - t0:.2f}s)")
+
+        if args.ticks:
+            t0 = time.perf_counter()
+            ticks = iter_ticks(args.ticks, start=args.start, seed=args.seed)
+            written = write_store(ticks, folder / 'ticks.npy', args.ticks, TICKS_DTYPE)
+            print(f"[OK] {written} ticks -> {folder / 'ticks.npy'} ({time.perf_counter() - t0:.2f}s)")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
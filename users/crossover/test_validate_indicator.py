@@ -0,0 +1,81 @@
+"""
+test_validate_indicator.py - Regression tests for validate_indicator.py
+
+Exports are built exactly as export_aligned.py writes them (requested bars
+plus declared warmup, %.5f CSV) from synthetic bars, with mt5_offline
+standing in for the MetaTrader5 package, so no terminal is needed.
+
+Usage:
+    python -m pytest test_validate_indicator.py -q
+"""
+import pandas as pd
+
+import mt5_offline
+
+mt5_offline.install()  # export_aligned imports MetaTrader5
+
+import export_aligned
+import synthetic_data
+import validate_indicator
+from history_lake import HistoryLake
+from indicators import registry
+
+
+EXPORT_BARS = 3000
+INDICATOR = "laguerre_rsi"
+
+
+def write_warmed_export(directory, symbol="EURUSD", period="M5"):
+    """Write a default-parameter export the way export_aligned.py does; returns (path, rates)"""
+    indicator_params = export_aligned.default_indicator_params()
+    rates = synthetic_data.generate_bars(export_aligned.bars_needed(EXPORT_BARS, indicator_params),
+                                         period=period, seed=46)
+    export_df = export_aligned.compute_export(rates, EXPORT_BARS, indicator_params)
+    path = directory / export_aligned.export_filename(symbol, period)
+    export_aligned.write_export(export_df, path)
+    return path, rates
+
+
+def test_warmed_export_validates_clean(tmp_path, capsys):
+    """Python starts cold: only bars within the declared warmup may be excluded, then every buffer matches"""
+    path, _ = write_warmed_export(tmp_path)
+    run = validate_indicator.validate_export(path, INDICATOR, {}, 0.999, sidecar=False)
+    capsys.readouterr()
+
+    declared = registry.warmup_bars(INDICATOR)
+    assert run["all_pass"]
+    assert run["bars"] == EXPORT_BARS
+    for name, metrics in run["results"].items():
+        assert metrics["warmup_bars"] <= declared, name
+        assert metrics["divergence"]["first_index"] == -1, name
+        assert metrics["max_diff"] <= 1e-5, name  # %.5f export tolerance
+
+
+def test_lake_warmed_export_excludes_nothing(tmp_path, capsys):
+    """Python warmed from a lake matches from the first bar: no warmup excluded, no divergence"""
+    path, rates = write_warmed_export(tmp_path)
+    HistoryLake(tmp_path / "lake").ingest("EURUSD", "M5", rates)
+    run = validate_indicator.validate_export(path, INDICATOR, {}, 0.999, lake=tmp_path / "lake", sidecar=False)
+    capsys.readouterr()
+
+    assert run["all_pass"]
+    for name, metrics in run["results"].items():
+        assert metrics["warmup_bars"] == 0, name
+        assert metrics["divergence"]["first_index"] == -1, name
+
+
+def test_lake_history_with_gap_before_export_is_not_warmup(tmp_path):
+    """Lake bars that end well before the export are reported as missing, not as warmup"""
+    rates = synthetic_data.generate_bars(3000, period="M5", seed=41)
+    lake = HistoryLake(tmp_path / "lake")
+    lake.ingest("EURUSD", "M5", rates[:1000])
+    first = pd.Timestamp(int(rates["time"][2000]), unit="s")
+
+    history, missing = validate_indicator.load_lake_history(tmp_path / "lake", "EURUSD", "M5", first, 100)
+    assert len(history) == 0
+    assert missing >= 999
+
+    lake.ingest("EURUSD", "M5", rates[1000:2000])
+    history, missing = validate_indicator.load_lake_history(tmp_path / "lake", "EURUSD", "M5", first, 100)
+    assert len(history) == 100
+    assert missing == 0
@@ -6,22 +6,40 @@ Created: 2025-10-16
 Purpose: Validate MQL5 indicator exports against Python implementations
 Stores validation results in DuckDB for historical tracking and analysis
 
+CSV exports are parsed once with explicit types and cached in a Parquet
+sidecar (<export>.csv.parquet, reused while the CSV's size and mtime match).
+
+--glob validates many exports at once: loading and metrics run in worker
+processes, and a single writer thread owns the only DuckDB connection and
+stores runs in batched transactions.
+
 Usage:
     python validate_indicator.py --csv Export_EURUSD_PERIOD_M1.csv --indicator laguerre_rsi
     python validate_indicator.py --csv Export_XAUUSD_PERIOD_H1.csv --indicator laguerre_rsi --params atr_period=32
+    python validate_indicator.py --csv Export_EURUSD_PERIOD_M1.csv --indicator rsi --lake history
+    python validate_indicator.py --csv Export_EURUSD_PERIOD_M1.csv --indicator rsi --full-diffs
+    python validate_indicator.py --csv Export_EURUSD_PERIOD_M1.parquet --indicator laguerre_rsi --chunk-rows 1000000
+    python validate_indicator.py --glob "exports/Export_*.csv" --indicator rsi --workers 8
 """
 
+import io
+import os
 import sys
+import bisect
 import argparse
+import contextlib
 from pathlib import Path
 from datetime import datetime
 import duckdb
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr
 
-# Import indicator implementations
-from indicators.laguerre_rsi import calculate_laguerre_rsi_indicator
+# Indicator implementations are imported lazily through the registry
+from indicators import registry
+from indicators.metrics import DivergenceProfiler, MetricsAccumulator, best_lag
+from indicators.quality import missing_bars
+from indicators.ticks import parse_bar_seconds
+from history_lake import HistoryLake, parse_export_name
 
 
 class ValidationError(Exception):
@@ -34,15 +52,20 @@ def parse_args():
     parser = argparse.ArgumentParser(
         description="Validate MQL5 indicator exports against Python implementations"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--csv",
-        required=True,
-        help="Path to MQL5 CSV export file"
+        help="Path to MQL5 export file (CSV, or Parquet/Feather/NPZ from export_aligned.py --format)"
+    )
+    source.add_argument(
+        "--glob",
+        help="Validate every export matching this pattern (e.g. 'exports/Export_*.csv') in a process pool, "
+             "storing all runs through one DuckDB writer"
     )
     parser.add_argument(
         "--indicator",
         required=True,
-        choices=["laguerre_rsi", "rsi"],
+        choices=registry.available_indicators(),
         help="Indicator to validate"
     )
     parser.add_argument(
@@ -59,8 +82,59 @@ def parse_args():
     parser.add_argument(
         "--threshold",
         type=float,
-        default=0.999,
-        help="Minimum correlation threshold (default: 0.999)"
+        default=None,
+        help="Minimum correlation threshold (default: registry value, 0.999)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached Python indicator results (content-addressed, see indicators/cache.py)"
+    )
+    parser.add_argument(
+        "--full-diffs",
+        action="store_true",
+        help=f"Store every bar's diff for failed buffers (default: the {TOP_DIFFS} largest; "
+             f"in-memory validation only)"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DIVERGENCE_WINDOW,
+        help=f"Bars per divergence profile window (default: {DIVERGENCE_WINDOW})"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help=f"|MQL5 - Python| above which a bar counts as diverged (default: one unit in the last decimal "
+             f"of a CSV export, e.g. 1e-05 for %%.5f; {DIVERGENCE_TOLERANCE:g} for binary formats)"
+    )
+    parser.add_argument(
+        "--max-lag",
+        type=int,
+        default=MAX_LAG,
+        help=f"Bar shifts checked either way for MQL5/Python misalignment (0 disables; default: {MAX_LAG})"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        help="Validate in constant memory, reading the export in chunks of this many rows "
+             "(streaming indicators only)"
+    )
+    parser.add_argument(
+        "--no-sidecar",
+        action="store_true",
+        help="Do not read or write the Parquet sidecar (<export>.csv.parquet) caching a parsed CSV export"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --glob (default: CPU count)"
+    )
+    parser.add_argument(
+        "--lake",
+        help="History lake (history_lake.py) supplying the warmup bars that precede the export"
     )
     return parser.parse_args()
 
@@ -84,12 +158,73 @@ def parse_parameters(param_list):
     return params
 
 
-def load_mql5_csv(csv_path):
-    """Load MQL5 CSV export and validate structure"""
-    if not Path(csv_path).exists():
-        raise ValidationError(f"CSV file not found: {csv_path}")
+# Bar columns always loaded (matched case-insensitively: export_aligned.py writes Time/Open/...)
+BAR_COLUMNS = ["time", "open", "high", "low", "close", "tick_volume", "spread", "real_volume"]
+
+
+def detect_export_format(path):
+    """Detect export file format from its magic bytes (csv, parquet, feather, npz)"""
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    if magic[:4] == b"PAR1":
+        return "parquet"
+    if magic == b"ARROW1":
+        return "feather"
+    if magic[:4] == b"PK\x03\x04":
+        return "npz"
+    return "csv"
 
-    df = pd.read_csv(csv_path)
+
+def column_filter(buffer_prefixes=None):
+    """Column predicate: bar columns plus columns starting with one of buffer_prefixes (None keeps all)"""
+    def keep(col):
+        if buffer_prefixes is None or col.lower() in BAR_COLUMNS:
+            return True
+        return any(col.lower().startswith(prefix.lower()) for prefix in buffer_prefixes)
+    return keep
+
+
+# Bar time formats, tried in order: export_aligned.py CSV, MQL5 TimeToString(TIME_DATE|TIME_MINUTES), ISO
+MT5_TIME_FORMATS = ("%Y.%m.%d %H:%M:%S", "%Y.%m.%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+def parse_bar_times(values):
+    """Parse a bar time column with an explicit format (typed datetime64)
+
+    Strings use the first MT5_TIME_FORMATS entry that fits the first value
+    (an explicit format avoids per-row inference); numbers are epoch seconds.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit="s")
+    sample = values.dropna()
+    if sample.empty:
+        return pd.to_datetime(values)
+    fmt = detect_time_format(sample.iloc[0])
+    try:
+        return pd.to_datetime(values, format=fmt)
+    except ValueError as e:
+        raise ValidationError(f"Bar times do not all match {fmt}: {e}")
+
+
+def detect_time_format(sample):
+    """First MT5_TIME_FORMATS entry that parses one bar time string"""
+    sample = str(sample).strip()
+    for fmt in MT5_TIME_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+            return fmt
+        except ValueError:
+            continue
+    raise ValidationError(f"Unrecognized bar time format: {sample!r}")
+
+
+def normalize_export(df):
+    """Lower-case bar column names, check OHLC columns and parse time"""
+    # Normalize bar column names (Time -> time, ...)
+    df = df.rename(columns={col: col.lower() for col in df.columns if col.lower() in BAR_COLUMNS})
 
     # Validate required OHLC columns
     required_cols = ["time", "open", "high", "low", "close"]
@@ -97,183 +232,1276 @@ def load_mql5_csv(csv_path):
     if missing:
         raise ValidationError(f"CSV missing required columns: {missing}")
 
-    # Convert time to datetime
-    df["time"] = pd.to_datetime(df["time"])
+    # Convert time to datetime (columnar exports are already typed)
+    if not pd.api.types.is_datetime64_any_dtype(df["time"]):
+        df["time"] = parse_bar_times(df["time"]).to_numpy()
 
     return df
 
 
-def calculate_python_laguerre_rsi(df, params):
-    """Calculate Laguerre RSI using Python implementation"""
-    # Extract parameters with defaults
-    atr_period = params.get("atr_period", 32)
-    price_smooth_period = params.get("price_smooth_period", 5)
-    price_smooth_method = params.get("price_smooth_method", "ema")
+def _import_pyarrow(fmt):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as parquet
+    except ImportError:
+        raise ValidationError(f"Reading {fmt} exports requires pyarrow (pip install pyarrow)")
+    return pa, parquet
+
+
+# Integer bar columns of a CSV export; every other non-time column is float64
+INT_COLUMNS = ("tick_volume", "spread", "real_volume")
+
+# Parquet metadata key holding the "<size>:<mtime_ns>" of the CSV a sidecar was parsed from
+SIDECAR_KEY = b"validate_indicator.source"
+
+
+def csv_header(csv_path):
+    """Column names and first data row of a CSV export (as strings)"""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        first = f.readline().rstrip("\r\n").split(",")
+    return header, first
+
+
+def sidecar_path(csv_path):
+    """Parquet cache of a parsed CSV export: <export>.csv.parquet next to it"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".parquet")
+
+
+def sidecar_key(csv_path):
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def sidecar_columns(csv_path):
+    """Columns of a sidecar still matching its CSV (same size and mtime), else None"""
+    path = sidecar_path(csv_path)
+    if not path.exists():
+        return None
+    try:
+        import pyarrow.parquet as parquet
+        schema = parquet.read_schema(path)
+    except Exception:  # No pyarrow, or a truncated/foreign file: parse the CSV again
+        return None
+    if (schema.metadata or {}).get(SIDECAR_KEY) != sidecar_key(csv_path):
+        return None
+    return schema.names
+
+
+def csv_types(csv_path, columns):
+    """Explicit parse types for columns of a CSV export
+
+    Returns:
+        (dtypes, time_col, fmt): {column: "int64" | "float64"} for the non-time
+        columns, the time column name (or None) and its format from the first row
+    """
+    header, first = csv_header(csv_path)
+    time_col = next((col for col in columns if col.lower() == "time"), None)
+    fmt = None
+    if time_col is not None and len(first) == len(header):
+        fmt = detect_time_format(first[header.index(time_col)])
+    dtypes = {col: ("int64" if col.lower() in INT_COLUMNS else "float64") for col in columns if col != time_col}
+    return dtypes, time_col, fmt
+
 
-    result = calculate_laguerre_rsi_indicator(
-        df,
-        atr_period=atr_period,
-        price_type='close',
-        price_smooth_period=price_smooth_period,
-        price_smooth_method=price_smooth_method
+def arrow_convert_options(csv_path, columns):
+    """pyarrow.csv ConvertOptions parsing only columns, with csv_types() types"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    dtypes, time_col, fmt = csv_types(csv_path, columns)
+    column_types = {col: pa.int64() if dtype == "int64" else pa.float64() for col, dtype in dtypes.items()}
+    if fmt is not None:
+        column_types[time_col] = pa.timestamp("s")
+    return pa_csv.ConvertOptions(
+        include_columns=columns,
+        column_types=column_types,
+        timestamp_parsers=[fmt] if fmt else None,
     )
 
-    return {
-        "Laguerre_RSI": result["laguerre_rsi"],
-        "Laguerre_Signal": result["signal"],
-        "Adaptive_Period": result["adaptive_period"],
-        "ATR": result["atr"]
-    }
 
+@contextlib.contextmanager
+def csv_parse_errors(csv_path):
+    """Re-raise CSV parser failures as ValidationError (pyarrow's ArrowInvalid and pandas' ParserError are ValueErrors)"""
+    try:
+        yield
+    except ValueError as e:
+        raise ValidationError(f"CSV parse error in {csv_path}: {e}") from e
 
-def calculate_metrics(mql5_values, python_values, buffer_name):
-    """Calculate validation metrics between MQL5 and Python values"""
-    # Remove NaN values (first few bars may have NaN)
-    mask = ~(np.isnan(mql5_values) | np.isnan(python_values))
-    mql5_clean = mql5_values[mask]
-    python_clean = python_values[mask]
 
-    if len(mql5_clean) < 10:
+def read_csv_export(csv_path, keep, sidecar=True):
+    """Parse a CSV export with explicit dtypes and time format
+
+    Only the columns selected by keep are parsed: float64 buffers and prices,
+    int64 volumes, and the bar time with the format detected from the first
+    row (MT5 %Y.%m.%d %H:%M, see MT5_TIME_FORMATS) instead of per-row
+    inference. With pyarrow the multi-threaded Arrow CSV reader is used and,
+    if sidecar is set, the parsed table is written to sidecar_path(): later
+    loads of the unchanged CSV memory-map that file instead of parsing text.
+    A sidecar holding fewer columns than requested is re-parsed with the union.
+    """
+    header, _ = csv_header(csv_path)
+    cached = sidecar_columns(csv_path) if sidecar else None
+    columns = [col for col in header if keep(col) or col in (cached or ())]
+    if cached is not None and set(columns) <= set(cached):
+        import pyarrow.parquet as parquet
+        return parquet.read_table(sidecar_path(csv_path), columns=[c for c in columns if keep(c)],
+                                  memory_map=True).to_pandas()
+
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        dtypes, _, _ = csv_types(csv_path, columns)
+        with csv_parse_errors(csv_path):
+            return pd.read_csv(csv_path, usecols=columns, dtype=dtypes)
+
+    with csv_parse_errors(csv_path):
+        table = pa_csv.read_csv(csv_path, convert_options=arrow_convert_options(csv_path, columns))
+    if sidecar:
+        write_sidecar(csv_path, table)
+    return table.select([col for col in columns if keep(col)]).to_pandas()
+
+
+def write_sidecar(csv_path, table):
+    """Write the parsed-CSV Parquet sidecar atomically (temp file + rename); skipped if not writable"""
+    import pyarrow.parquet as parquet
+
+    path = sidecar_path(csv_path)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    table = table.replace_schema_metadata({SIDECAR_KEY: sidecar_key(csv_path)})
+    try:
+        parquet.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"  [WARN] Parquet sidecar not written ({e})")
+
+
+def load_mql5_csv(csv_path, buffer_prefixes=None, sidecar=True):
+    """Load MQL5 export (CSV, Parquet, Feather or NPZ) and validate structure
+
+    Args:
+        csv_path: Export file; the format is detected from its contents
+        buffer_prefixes: If given, load only the bar columns plus columns whose
+            names start with one of these prefixes (column pruning)
+        sidecar: Cache parsed CSV exports in a Parquet sidecar (read_csv_export)
+    """
+    if not Path(csv_path).exists():
+        raise ValidationError(f"CSV file not found: {csv_path}")
+
+    keep = column_filter(buffer_prefixes)
+    fmt = detect_export_format(csv_path)
+    if fmt == "csv":
+        df = read_csv_export(csv_path, keep, sidecar=sidecar)
+    elif fmt == "npz":
+        with np.load(csv_path) as data:
+            df = pd.DataFrame({col: data[col] for col in data.files if keep(col)})
+    else:
+        pa, parquet = _import_pyarrow(fmt)
+        if fmt == "parquet":
+            schema = parquet.read_schema(csv_path)
+        else:
+            with pa.memory_map(str(csv_path)) as source:
+                schema = pa.ipc.open_file(source).schema
+        columns = [col for col in schema.names if keep(col)]
+        if fmt == "parquet":
+            df = pd.read_parquet(csv_path, columns=columns)
+        else:
+            df = pd.read_feather(csv_path, columns=columns)
+
+    return normalize_export(df)
+
+
+def iter_mql5_chunks(csv_path, buffer_prefixes=None, chunk_rows=1_000_000, sidecar=True):
+    """Yield an MQL5 export as normalized DataFrames of at most chunk_rows rows
+
+    CSV is streamed by pyarrow's CSV reader with explicit types (pandas'
+    chunked reader without pyarrow), or read by record batches from its
+    Parquet sidecar when one is current (unless sidecar is False); Parquet is
+    read by record batches and Feather by memory-mapped IPC batches, so memory
+    stays bounded by one chunk. NPZ members cannot be read partially and are
+    loaded whole, then sliced.
+    """
+    if not Path(csv_path).exists():
+        raise ValidationError(f"CSV file not found: {csv_path}")
+
+    keep = column_filter(buffer_prefixes)
+    fmt = detect_export_format(csv_path)
+    if fmt == "csv":
+        header, _ = csv_header(csv_path)
+        cached = sidecar_columns(csv_path) if sidecar else None
+        if cached is not None and {col for col in header if keep(col)} <= set(cached):
+            yield from iter_mql5_chunks(sidecar_path(csv_path), buffer_prefixes, chunk_rows)
+            return
+        columns = [col for col in header if keep(col)]
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            dtypes, _, _ = csv_types(csv_path, columns)
+            with csv_parse_errors(csv_path), \
+                    pd.read_csv(csv_path, usecols=columns, dtype=dtypes, chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    yield normalize_export(chunk)
+            return
+        # Arrow's streaming reader yields blocks of arbitrary size; regroup them into chunk_rows rows
+        with csv_parse_errors(csv_path):
+            reader = pa_csv.open_csv(csv_path, convert_options=arrow_convert_options(csv_path, columns))
+            pending, rows = [], 0
+            for batch in reader:
+                pending.append(batch)
+                rows += batch.num_rows
+                while rows >= chunk_rows:
+                    table = pa.Table.from_batches(pending)
+                    yield normalize_export(table.slice(0, chunk_rows).to_pandas())
+                    pending, rows = table.slice(chunk_rows).to_batches(), rows - chunk_rows
+            if rows:
+                yield normalize_export(pa.Table.from_batches(pending, schema=reader.schema).to_pandas())
+    elif fmt == "npz":
+        df = load_mql5_csv(csv_path, buffer_prefixes)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+    elif fmt == "parquet":
+        pa, parquet = _import_pyarrow(fmt)
+        source = parquet.ParquetFile(csv_path)
+        columns = [col for col in source.schema_arrow.names if keep(col)]
+        for batch in source.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield normalize_export(batch.to_pandas())
+    else:
+        pa, parquet = _import_pyarrow(fmt)
+        with pa.memory_map(str(csv_path)) as source:
+            reader = pa.ipc.open_file(source)
+            columns = [col for col in reader.schema.names if keep(col)]
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select(columns)
+                for start in range(0, batch.num_rows, chunk_rows):
+                    yield normalize_export(batch.slice(start, chunk_rows).to_pandas())
+
+
+# Missing time before an export's first bar still taken as a session break (metals' and indices' daily breaks)
+LAKE_SESSION_GAP = 3 * 3600
+
+
+def load_lake_history(lake_dir, symbol, timeframe, before, bars, until=None):
+    """Bars preceding an export from a history lake, shaped like load_mql5_csv() bar columns
+
+    Args:
+        lake_dir: History lake directory
+        symbol, timeframe: Series to read
+        before: First bar time of the export (history ends strictly before it)
+        bars: Number of history bars wanted (the indicator's warmup)
+        until: Also return the lake's bars from `before` through this time (the
+            export span), so bars missing from the export still feed the indicator
+
+    Returns:
+        (history, missing): DataFrame with time/open/high/low/close (may be shorter
+        than bars, or empty) and the bars missing between the lake's last bar and
+        `before`. Lake bars separated from the export by such a gap are not
+        returned, as they would not warm the indicator up for the export.
+    """
+    if not HistoryLake.is_lake(lake_dir):
+        raise ValidationError(f"Not a history lake (no manifest): {lake_dir}")
+    lake = HistoryLake(lake_dir)
+    start = int(pd.Timestamp(before).timestamp())
+    rates = lake.tail(symbol, timeframe, bars, end=start - 1)
+    missing = 0
+    if len(rates):
+        try:
+            spacing = parse_bar_seconds(timeframe)
+        except ValueError:
+            spacing = None  # MN1 or unknown: no fixed spacing to check against
+        if spacing:
+            missing = int(missing_bars(rates["time"][-1], start, spacing, LAKE_SESSION_GAP))
+        if missing:
+            rates = rates[:0]
+    if until is not None:
+        rates = np.concatenate([rates, lake.read(symbol, timeframe, start, int(pd.Timestamp(until).timestamp()))])
+    history = pd.DataFrame({col: rates[col] for col in ["open", "high", "low", "close"]})
+    history.insert(0, "time", pd.to_datetime(rates["time"], unit="s"))
+    return history, missing
+
+
+# Values per accumulator update, across all buffers (keeps the per-chunk temporaries in cache)
+METRICS_CHUNK = 65536
+MIN_VALUES = 10
+
+# Divergence analysis defaults: profile window (bars) and |diff| counted as diverged
+# (the tolerance is the floor; CSV exports default to their written precision, see export_tolerance)
+DIVERGENCE_WINDOW = 1000
+DIVERGENCE_TOLERANCE = 1e-6
+
+# Data rows sampled to infer the decimals a CSV export was written with
+PRECISION_SAMPLE_ROWS = 1000
+
+# Lag detection: shifts tried either way, and the trailing bars it runs on (bounds FFT memory)
+MAX_LAG = 10
+LAG_SAMPLE_BARS = 1 << 19
+
+
+def check_alignment(mql5_values, python_values, max_lag=MAX_LAG):
+    """best_lag() of each buffer row over its last LAG_SAMPLE_BARS bars (None per row when max_lag is 0)"""
+    if max_lag <= 0:
+        return [None] * len(mql5_values)
+    return [
+        best_lag(mql5_values[row, -LAG_SAMPLE_BARS:], python_values[row, -LAG_SAMPLE_BARS:], max_lag)
+        for row in range(len(mql5_values))
+    ]
+
+
+def check_count(metrics):
+    """Raise if too few non-NaN pairs were compared"""
+    if metrics["count"] < MIN_VALUES:
         raise ValidationError(
-            f"{buffer_name}: Insufficient non-NaN values for validation "
-            f"(need >= 10, got {len(mql5_clean)})"
+            f"{metrics['buffer_name']}: Insufficient non-NaN values for validation "
+            f"(need >= {MIN_VALUES}, got {metrics['count']})"
         )
 
-    # Calculate correlation
-    correlation, _ = pearsonr(mql5_clean, python_clean)
 
-    # Calculate error metrics
-    diff = mql5_clean - python_clean
-    mae = np.mean(np.abs(diff))
-    rmse = np.sqrt(np.mean(diff ** 2))
-    max_diff = np.max(np.abs(diff))
+def calculate_buffer_metrics(mql5_values, python_values, buffer_names, profiler=None, bar_times=None):
+    """Calculate validation metrics for several buffers at once
 
-    # Summary statistics
-    metrics = {
-        "buffer_name": buffer_name,
-        "correlation": correlation,
-        "mae": mae,
-        "rmse": rmse,
-        "max_diff": max_diff,
-        "mql5_min": np.min(mql5_clean),
-        "mql5_max": np.max(mql5_clean),
-        "mql5_mean": np.mean(mql5_clean),
-        "python_min": np.min(python_clean),
-        "python_max": np.max(python_clean),
-        "python_mean": np.mean(python_clean),
-        "diff": diff
-    }
+    Args:
+        mql5_values, python_values: (n_buffers, n_bars) arrays, one row per buffer
+        buffer_names: Row names
+        profiler: Optional DivergenceProfiler fed in the same pass; its result is
+            attached as metrics["divergence"]
+        bar_times: Bar times of the columns (for the profiler)
 
-    return metrics
+    Metrics come from a single chunked pass with per-row NaN masks
+    (indicators/metrics.py); each buffer's non-NaN per-bar values are kept for
+    bar-level diff storage.
 
+    Returns:
+        List of metrics dicts in row order
+    """
+    mql5_values = np.atleast_2d(np.asarray(mql5_values, dtype=float))
+    python_values = np.atleast_2d(np.asarray(python_values, dtype=float))
+
+    accumulator = MetricsAccumulator()
+    step = max(1, METRICS_CHUNK // len(mql5_values))
+    for start in range(0, mql5_values.shape[1], step):
+        x, y = mql5_values[:, start:start + step], python_values[:, start:start + step]
+        accumulator.update(x, y)
+        if profiler is not None:
+            profiler.update(x, y, times=None if bar_times is None else bar_times[start:start + step])
+    results = accumulator.results(buffer_names)
+    if profiler is not None:
+        for metrics, divergence in zip(results, profiler.results(buffer_names)):
+            metrics["divergence"] = divergence
+
+    # Remove NaN values (first few bars may have NaN)
+    valid = ~(np.isnan(mql5_values) | np.isnan(python_values))
+    for row, metrics in enumerate(results):
+        check_count(metrics)
+        bar_index = np.flatnonzero(valid[row])
+        metrics.update({
+            "bar_index": bar_index,
+            "bar_time": None if bar_times is None else np.asarray(bar_times)[bar_index],
+            "mql5_values": mql5_values[row, bar_index],
+            "python_values": python_values[row, bar_index],
+            "diff": mql5_values[row, bar_index] - python_values[row, bar_index],
+        })
+    return results
+
+
+def calculate_metrics(mql5_values, python_values, buffer_name):
+    """Calculate validation metrics between MQL5 and Python values of one buffer"""
+    return calculate_buffer_metrics(mql5_values, python_values, [buffer_name])[0]
 
-def validate_laguerre_rsi(df, params, threshold):
-    """Validate Laguerre RSI MQL5 vs Python"""
-    print(f"\nValidating Laguerre RSI...")
-    print(f"Parameters: {params}")
-    print()
 
-    # Check if MQL5 exported Laguerre RSI columns
-    # Note: Columns may have suffixes like _32 or _14 for period
-    expected_cols = ["Laguerre_RSI", "Laguerre_Signal", "Adaptive_Period", "ATR"]
+def match_buffer_columns(spec, columns):
+    """Map each registered buffer to its export column
+
+    Columns may have suffixes like _32 or _14 for period; exact match first,
+    then case-insensitive prefix match.
+
+    Raises:
+        ValidationError: If any buffer has no matching column
+    """
+    columns = list(columns)
+    exact = set(columns)
+    # Sorted (lower-case name, position) index: each prefix lookup is a bisect, not a column scan
+    index = sorted((col.lower(), i) for i, col in enumerate(columns))
+    names = [name for name, _ in index]
+    mql5_columns = {}
     missing = []
-    for col in expected_cols:
-        # Try both exact match and case-insensitive prefix match
-        if col not in df.columns:
-            # Try to find case-insensitive prefix match (handles _32, _14 suffixes)
-            matches = [c for c in df.columns if c.lower().startswith(col.lower())]
-            if not matches:
-                missing.append(col)
+    for buffer in spec.buffers:
+        if buffer.column in exact:
+            mql5_columns[buffer.column] = buffer.column
+            continue
+        prefix = buffer.column.lower()
+        lo = bisect.bisect_left(names, prefix)
+        hi = lo
+        while hi < len(names) and names[hi].startswith(prefix):
+            hi += 1
+        if hi > lo:
+            # First matching column in file order, as before
+            mql5_columns[buffer.column] = columns[min(i for _, i in index[lo:hi])]
+        else:
+            missing.append(buffer.column)
 
     if missing:
+        hint = f"Hint: Run ExportAligned.mq5 with {spec.export_flag}=true" if spec.export_flag else ""
         raise ValidationError(
-            f"CSV missing Laguerre RSI columns: {missing}\n"
-            f"Available columns: {list(df.columns)}\n"
-            f"Hint: Run ExportAligned.mq5 with InpUseLaguerreRSI=true"
+            f"CSV missing {spec.title} columns: {missing}\n"
+            f"Available columns: {list(columns)}\n"
+            f"{hint}"
         )
+    return mql5_columns
+
+
+def print_buffer_metrics(metrics, threshold):
+    """Print one buffer's PASS/FAIL block"""
+    status = "PASS" if metrics["pass"] else "FAIL"
+    print(f"[{status}] {metrics['buffer_name']}")
+    print(f"  Correlation: {metrics['correlation']:.6f} (threshold: {threshold})")
+    print(f"  MAE: {metrics['mae']:.6f}, RMSE: {metrics['rmse']:.6f}, Max Diff: {metrics['max_diff']:.6f}")
+    print(f"  MQL5:   min={metrics['mql5_min']:.6f}, max={metrics['mql5_max']:.6f}, mean={metrics['mql5_mean']:.6f}")
+    print(f"  Python: min={metrics['python_min']:.6f}, max={metrics['python_max']:.6f}, mean={metrics['python_mean']:.6f}")
+    if metrics.get("warmup_bars"):
+        print(f"  Warmup: first {metrics['warmup_bars']} bars excluded")
+    divergence = metrics.get("divergence")
+    if divergence is not None:
+        if divergence["first_index"] < 0:
+            print(f"  First divergence: none (|diff| <= {divergence['tolerance']:g})")
+        else:
+            when = f" ({pd.Timestamp(divergence['first_time'])})" if divergence["first_time"] is not None else ""
+            print(f"  First divergence: bar {divergence['first_index']}{when}, "
+                  f"diff={divergence['first_diff']:.6g} (tolerance {divergence['tolerance']:g})")
+        worst = worst_window(divergence)
+        if worst is not None:
+            windows = divergence["windows"]
+            print(f"  Worst {divergence['window']}-bar window: bars {windows['start'][worst]}-{windows['end'][worst] - 1}, "
+                  f"max diff={windows['max_abs_diff'][worst]:.6f}, correlation={windows['correlation'][worst]:.6f}")
+    alignment = metrics.get("alignment")
+    if alignment is not None:
+        if alignment["misaligned"]:
+            print(f"  [WARN] Best alignment at lag {alignment['best_lag']:+d} bars: "
+                  f"correlation={alignment['best_correlation']:.6f} (lag 0: {alignment['lag0_correlation']:.6f}) "
+                  f"- check bar indexing / ArraySetAsSeries")
+        else:
+            print(f"  Alignment: lag 0 is best within +-{alignment['max_lag']} bars")
+    print()
+
+
+def worst_window(divergence):
+    """Index of the profile window with the largest max |diff| (None without windows)"""
+    windows = divergence["windows"]
+    if windows is None or len(windows["start"]) == 0:
+        return None
+    return int(np.argmax(windows["max_abs_diff"]))
+
+
+def csv_decimals(csv_path, columns, rows=PRECISION_SAMPLE_ROWS):
+    """Decimals of the coarsest of columns in a CSV export, from its first rows
+
+    Returns:
+        Smallest per-column maximum of written decimals, or None when no sampled
+        value has a fractional part (integer-valued columns are ignored)
+    """
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        decimals = {header.index(col): 0 for col in columns if col in header}
+        for _, line in zip(range(rows), f):
+            fields = line.rstrip("\r\n").split(",")
+            for i in decimals:
+                value = fields[i] if i < len(fields) else ""
+                if "e" in value or "E" in value:
+                    decimals[i] = max(decimals[i], 17)  # Scientific notation: full precision
+                elif "." in value:
+                    decimals[i] = max(decimals[i], len(value) - value.index(".") - 1)
+    found = [d for d in decimals.values() if d > 0]
+    return min(found) if found else None
+
+
+def export_tolerance(csv_path, columns):
+    """Default divergence tolerance for an export's buffer columns
+
+    A CSV written with d decimals (export_aligned.py uses %.5f) differs from the
+    exact Python values by up to half a unit in the last decimal from rounding
+    alone, so the tolerance is one unit, 10**-d. Binary exports and full-precision
+    CSVs use DIVERGENCE_TOLERANCE, which is also the floor.
+    """
+    if detect_export_format(csv_path) != "csv":
+        return DIVERGENCE_TOLERANCE
+    decimals = csv_decimals(csv_path, columns)
+    if decimals is None:
+        return DIVERGENCE_TOLERANCE
+    return max(DIVERGENCE_TOLERANCE, 10.0 ** -decimals)
+
+
+def make_profiler(window, tolerance):
+    """DivergenceProfiler with CLI-level error reporting"""
+    try:
+        return DivergenceProfiler(window=window, tolerance=tolerance)
+    except ValueError as e:
+        raise ValidationError(f"Invalid divergence window: {e}")
+
+
+# MQL5 EMPTY_VALUE (DBL_MAX) and anything near it marks a bar without a value
+EMPTY_VALUE_LIMIT = 1e300
+
+
+def python_input_bars(df, history=None):
+    """Bars the Python side is computed over: history plus export bars, sorted and unique by time
+
+    Export rows win over history rows with the same time (they are what MT5 saw).
+    """
+    bars = df
+    if history is not None and len(history):
+        columns = list(history.columns)
+        bars = pd.concat([history, df[columns]], ignore_index=True)
+    order = np.argsort(bars["time"].to_numpy(dtype="datetime64[ns]").view(np.int64), kind="stable")
+    bars = bars.iloc[order]
+    bars = bars[~bars["time"].duplicated(keep="last")]
+    return bars.reset_index(drop=True)
+
+
+def align_on_time(df, mql5_columns, buffer_names, python_times, python_buffers, tolerance_s=0):
+    """Match export rows to Python bars by bar time instead of position
+
+    Both sides are typed to int64 nanoseconds and sorted (duplicate export rows
+    keep the last); an as-of merge then pairs each export bar with the latest
+    Python bar at or before it within tolerance_s. Export bars without a match
+    compare as NaN; Python-only bars are ignored. O(n) on sorted input.
+
+    Returns:
+        (mql5_values, python_values, times, stats) - (n_buffers, n_rows) arrays
+        over the sorted unique export rows, their times, and a dict of counts
+        (rows, duplicates, unsorted, unmatched, python_only)
+    """
+    times = df["time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    unsorted = bool(len(times) > 1 and (np.diff(times) < 0).any())
+    order = np.argsort(times, kind="stable") if unsorted else np.arange(len(times))
+    sorted_times = times[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = sorted_times[1:] != sorted_times[:-1]  # Last row of each duplicated time
+    rows = order[keep]
+
+    left = pd.DataFrame({"time": times[rows]})
+    right = pd.DataFrame({
+        "time": pd.Series(python_times).to_numpy(dtype="datetime64[ns]").view(np.int64),
+        "position": np.arange(len(python_times)),
+    })
+    merged = pd.merge_asof(left, right, on="time", direction="backward", tolerance=int(tolerance_s * 1e9))
+    matched = merged["position"].notna().to_numpy()
+    position = merged["position"].fillna(0).to_numpy(dtype=np.int64)
+
+    mql5_values = np.vstack([df[mql5_columns[name]].to_numpy(dtype=float)[rows] for name in buffer_names])
+    python_values = np.vstack([np.asarray(python_buffers[name], dtype=float)[position] for name in buffer_names])
+    python_values[:, ~matched] = np.nan
+
+    span = (right["time"] >= left["time"].iloc[0]) & (right["time"] <= left["time"].iloc[-1]) if len(left) else []
+    stats = {
+        "rows": int(len(rows)),
+        "duplicates": int(len(times) - len(rows)),
+        "unsorted": unsorted,
+        "unmatched": int((~matched).sum()),
+        "python_only": int(np.sum(span)) - int(len(np.unique(position[matched]))) if len(left) else 0,
+    }
+    return mql5_values, python_values, pd.to_datetime(left["time"]).to_numpy(), stats
+
+
+def detect_warmup(mql5_values, python_values, max_bars, tolerance=DIVERGENCE_TOLERANCE):
+    """Leading bars per buffer row to exclude as warmup, read from the data
+
+    Warmup ends after the last bar within max_bars (the indicator's declared
+    warmup) of the first valid bar (both sides have a value, not NaN or
+    EMPTY_VALUE) where the two sides differ by more than tolerance. Recursive
+    state can agree by chance before it has converged, so the whole declared
+    window is searched; a row matching from its first valid bar (e.g. Python
+    warmed up from a lake) excludes nothing, and no difference after the
+    declared warmup is ever hidden.
+
+    Returns:
+        int64 array: bars to exclude per row
+    """
+    rows, n = mql5_values.shape
+    valid = np.isfinite(mql5_values) & np.isfinite(python_values) & (np.abs(mql5_values) < EMPTY_VALUE_LIMIT)
+    first_valid = np.where(valid.any(axis=1), valid.argmax(axis=1), n)
+    warmup = first_valid.copy()
+    for row in range(rows):
+        start = first_valid[row]
+        window = slice(start, min(n, start + max_bars))
+        with np.errstate(invalid="ignore"):
+            diverged = valid[row, window] & (np.abs(mql5_values[row, window] - python_values[row, window]) > tolerance)
+        if diverged.any():
+            warmup[row] = start + len(diverged) - int(diverged[::-1].argmax())
+    return warmup
+
+
+def exclude_warmup(mql5_values, python_values, warmup):
+    """NaN out each row's warmup bars and MQL5 EMPTY_VALUE bars, in place"""
+    with np.errstate(invalid="ignore"):
+        mql5_values[np.abs(mql5_values) >= EMPTY_VALUE_LIMIT] = np.nan
+    columns = np.arange(mql5_values.shape[1])
+    excluded = columns[None, :] < warmup[:, None]
+    mql5_values[excluded] = np.nan
+    python_values[excluded] = np.nan
+
+
+def validate_buffers(df, indicator, params, threshold, cache=None, history=None,
+                     window=DIVERGENCE_WINDOW, tolerance=DIVERGENCE_TOLERANCE, max_lag=MAX_LAG):
+    """Validate all registered buffers of an indicator, MQL5 vs Python
+
+    Export rows are matched to Python bars by bar time (align_on_time), so
+    exports with gaps, extra or duplicate bars or a different first bar compare
+    correctly; each buffer's leading warmup bars are detected and excluded.
+
+    Args:
+        history: Optional bars preceding df (load_lake_history); the Python side is
+            computed over history + df so recursive indicators start warmed up
+        window, tolerance: Divergence profile window (bars) and |diff| tolerance
+        max_lag: Bar shifts checked either way for misalignment (0 disables)
+    """
+    spec = registry.get_spec(indicator)
+    print(f"\nValidating {spec.title}...")
+    print(f"Parameters: {params}")
+    print()
+
+    # Check if MQL5 exported the indicator's columns
+    mql5_columns = match_buffer_columns(spec, df.columns)
 
     # Calculate Python implementation
-    python_buffers = calculate_python_laguerre_rsi(df, params)
+    calc_df = python_input_bars(df, history)
+    try:
+        python_buffers = registry.calculate(indicator, calc_df, params, cache=cache)
+    except ValueError as e:
+        raise ValidationError(f"Invalid parameters for {indicator}: {e}")
 
-    # Validate each buffer
+    # Align on bar time, then drop each buffer's warmup
+    buffer_names = list(python_buffers)
+    mql5_values, python_values, bar_times, stats = align_on_time(
+        df, mql5_columns, buffer_names, calc_df["time"], python_buffers
+    )
+    print(f"Aligned {stats['rows']} export bars on time: {stats['unmatched']} without a Python bar, "
+          f"{stats['python_only']} Python-only bars, {stats['duplicates']} duplicate rows dropped"
+          + (" (export was unsorted)" if stats["unsorted"] else ""))
+    warmup = detect_warmup(mql5_values, python_values, registry.warmup_bars(indicator, params), tolerance)
+    exclude_warmup(mql5_values, python_values, warmup)
+    print()
+
+    # Validate all buffers in one batched computation
     results = {}
     all_pass = True
+    profiler = make_profiler(window, tolerance)
+    all_metrics = calculate_buffer_metrics(mql5_values, python_values, buffer_names,
+                                           profiler=profiler, bar_times=bar_times)
+    for metrics, alignment, skipped in zip(all_metrics, check_alignment(mql5_values, python_values, max_lag), warmup):
+        metrics["alignment"] = alignment
+        metrics["warmup_bars"] = int(skipped)
+        metrics["pass"] = metrics["correlation"] >= threshold
+        results[metrics["buffer_name"]] = metrics
+        print_buffer_metrics(metrics, threshold)
+        all_pass = all_pass and metrics["pass"]
+
+    return results, all_pass
+
+
+def validate_buffers_chunked(csv_path, indicator, params, threshold, chunk_rows, history=None,
+                             window=DIVERGENCE_WINDOW, tolerance=DIVERGENCE_TOLERANCE, max_lag=MAX_LAG,
+                             sidecar=True):
+    """Validate an export chunk by chunk in constant memory
+
+    The export is read in chunks (iter_mql5_chunks), the Python side is the
+    indicator's streaming implementation carried across chunks, and metrics of
+    all buffers are accumulated in one batched pass (MetricsAccumulator), keeping
+    only the TOP_DIFFS largest bar-level diffs per buffer. Bars pair by position,
+    so bar times must be strictly increasing; warmup is detected on the first chunk.
 
-    for buffer_name, python_values in python_buffers.items():
-        # Get MQL5 values (case-insensitive prefix match, handles _32, _14 suffixes)
-        mql5_col = next(c for c in df.columns if c.lower().startswith(buffer_name.lower()))
-        mql5_values = df[mql5_col].values
+    Args:
+        chunk_rows: Export rows per chunk
+        history: Optional bars preceding the export; replayed to warm up the indicator
+        window, tolerance: Divergence profile window (bars) and |diff| tolerance
+        max_lag: Bar shifts checked either way for misalignment (0 disables; runs
+            on the last LAG_SAMPLE_BARS bars)
+        sidecar: Read a CSV export's current Parquet sidecar instead of the CSV
 
-        # Calculate metrics
-        metrics = calculate_metrics(mql5_values, python_values, buffer_name)
+    Returns:
+        (results, all_pass, bars) - bars is the number of export rows read
+    """
+    spec = registry.get_spec(indicator)
+    print(f"\nValidating {spec.title} in chunks of {chunk_rows} bars...")
+    print(f"Parameters: {params}")
+    print()
+
+    try:
+        streaming = registry.create_streaming(indicator, params)
+    except ValueError as e:
+        raise ValidationError(f"Chunked validation needs a streaming implementation: {e}")
+    if history is not None and len(history):
+        streaming.run(history.to_records(index=False))
+
+    buffer_names = [buffer.column for buffer in spec.buffers]
+    accumulator = MetricsAccumulator(top_k=TOP_DIFFS)
+    profiler = make_profiler(window, tolerance)
+    mql5_columns = None
+    tail = None  # Last LAG_SAMPLE_BARS bars of both sides, for lag detection
+    warmup = None  # Detected on the first chunk
+    last_time = None
+    bars = 0
+    for chunk in iter_mql5_chunks(csv_path, buffer_names, chunk_rows, sidecar=sidecar):
+        if mql5_columns is None:
+            mql5_columns = match_buffer_columns(spec, chunk.columns)
+        bar_columns = [col for col in BAR_COLUMNS if col in chunk.columns]
+        outputs = streaming.run(chunk[bar_columns].to_records(index=False))
+        mql5_values = np.vstack([chunk[mql5_columns[buffer.column]].to_numpy(dtype=float) for buffer in spec.buffers])
+        python_values = np.vstack([outputs[buffer.output].to_numpy(dtype=float) for buffer in spec.buffers])
+        index, times = np.arange(bars, bars + len(chunk)), chunk["time"].to_numpy()
+        # Streaming pairs bars by position, which is only bar-time aligned on strictly increasing times
+        steps = np.diff(np.concatenate([[last_time], times]) if last_time is not None else times)
+        if (steps <= np.timedelta64(0)).any():
+            raise ValidationError("Export bar times are not strictly increasing (duplicate or unsorted rows); "
+                                  "validate without --chunk-rows to align on time")
+        last_time = times[-1]
+        if warmup is None:
+            warmup = detect_warmup(mql5_values, python_values, registry.warmup_bars(indicator, params), tolerance)
+        exclude_warmup(mql5_values, python_values, np.maximum(warmup - bars, 0))
+        accumulator.update(mql5_values, python_values, index=index, times=times)
+        profiler.update(mql5_values, python_values, index=index, times=times)
+        if max_lag > 0:
+            if tail is not None:
+                mql5_values = np.concatenate([tail[0], mql5_values], axis=1)
+                python_values = np.concatenate([tail[1], python_values], axis=1)
+            tail = (mql5_values[:, -LAG_SAMPLE_BARS:], python_values[:, -LAG_SAMPLE_BARS:])
+        bars += len(chunk)
+
+    results = {}
+    all_pass = True
+    alignments = check_alignment(*tail, max_lag) if tail is not None else [None] * len(buffer_names)
+    if warmup is None:
+        warmup = np.zeros(len(buffer_names), dtype=np.int64)
+    for metrics, divergence, alignment, skipped in zip(accumulator.results(buffer_names),
+                                                       profiler.results(buffer_names), alignments, warmup):
+        check_count(metrics)
+        metrics["divergence"] = divergence
+        metrics["alignment"] = alignment
+        metrics["warmup_bars"] = int(skipped)
         metrics["pass"] = metrics["correlation"] >= threshold
+        results[metrics["buffer_name"]] = metrics
+        print_buffer_metrics(metrics, threshold)
+        all_pass = all_pass and metrics["pass"]
 
-        results[buffer_name] = metrics
+    return results, all_pass, bars
 
-        # Print summary
-        status = "PASS" if metrics["pass"] else "FAIL"
-        print(f"[{status}] {buffer_name}")
-        print(f"  Correlation: {metrics['correlation']:.6f} (threshold: {threshold})")
-        print(f"  MAE: {metrics['mae']:.6f}, RMSE: {metrics['rmse']:.6f}, Max Diff: {metrics['max_diff']:.6f}")
-        print(f"  MQL5:   min={metrics['mql5_min']:.6f}, max={metrics['mql5_max']:.6f}, mean={metrics['mql5_mean']:.6f}")
-        print(f"  Python: min={metrics['python_min']:.6f}, max={metrics['python_max']:.6f}, mean={metrics['python_mean']:.6f}")
-        print()
 
-        if not metrics["pass"]:
-            all_pass = False
+def validate_laguerre_rsi(df, params, threshold):
+    """Validate Laguerre RSI MQL5 vs Python"""
+    return validate_buffers(df, "laguerre_rsi", params, threshold)
 
-    return results, all_pass
+
+# Schema shipped next to this script (sequences supply the surrogate keys)
+SCHEMA_PATH = Path(__file__).parent / "validation_schema.sql"
+
+# Bar-level diffs kept per flagged buffer unless full diffs are requested
+TOP_DIFFS = 100
+DIFF_THRESHOLD = 0.01
+
+
+def diff_rows(buffer_name, metrics, bar_times=None, full=False):
+    """Bar-level diff rows of one buffer as a DataFrame (bar_diffs columns, without run_id)
+
+    Args:
+        metrics: calculate_metrics() or MetricsAccumulator.result() (carries its own bar_time)
+        bar_times: Bar times of the validated export rows (indexed by bar_index)
+        full: Keep every compared bar instead of the TOP_DIFFS largest differences
+    """
+    diff = metrics["diff"]
+    abs_diff = np.abs(diff)
+    if full or len(diff) <= TOP_DIFFS:
+        keep = np.arange(len(diff))
+    else:
+        keep = np.argpartition(abs_diff, -TOP_DIFFS)[-TOP_DIFFS:]
+        keep = keep[np.argsort(-abs_diff[keep], kind="stable")]
+
+    bar_index = metrics["bar_index"][keep]
+    if metrics.get("bar_time") is not None:
+        times = pd.to_datetime(metrics["bar_time"][keep])
+    elif bar_times is None:
+        times = pd.NaT
+    else:
+        times = pd.to_datetime(np.asarray(bar_times)[bar_index])
+    return pd.DataFrame({
+        "buffer_name": buffer_name,
+        "bar_index": bar_index.astype(np.int64),
+        "bar_time": times,
+        "mql5_value": metrics["mql5_values"][keep],
+        "python_value": metrics["python_values"][keep],
+        "diff": diff[keep],
+        "abs_diff": abs_diff[keep],
+    })
+
+
+def _optional(value):
+    """NaN/NaT -> None for nullable columns"""
+    return None if value is None or pd.isna(value) else value
+
+
+def divergence_row(run_id, buffer_name, divergence):
+    """buffer_divergence row of one buffer's DivergenceProfiler result"""
+    worst = worst_window(divergence)
+    windows = divergence["windows"]
+    first = divergence["first_index"]
+    return (
+        run_id, buffer_name, divergence["tolerance"], divergence["window"],
+        first if first >= 0 else None,
+        None if first < 0 or divergence["first_time"] is None else pd.Timestamp(divergence["first_time"]).to_pydatetime(),
+        _optional(divergence["first_diff"]),
+        None if worst is None else int(windows["start"][worst]),
+        None if worst is None else float(windows["max_abs_diff"][worst]),
+        None if worst is None else _optional(float(windows["correlation"][worst])),
+    )
+
+
+def window_rows(buffer_name, divergence):
+    """divergence_windows rows of one buffer as a DataFrame (without run_id)"""
+    windows = divergence["windows"]
+    missing = pd.Series(pd.NaT, index=range(len(windows["start"])))
+    return pd.DataFrame({
+        "buffer_name": buffer_name,
+        "start_index": windows["start"].astype(np.int64),
+        "end_index": windows["end"].astype(np.int64),
+        "start_time": missing if windows["start_time"] is None else pd.to_datetime(windows["start_time"]),
+        "end_time": missing if windows["end_time"] is None else pd.to_datetime(windows["end_time"]),
+        "bars": windows["bars"],
+        "correlation": windows["correlation"],
+        "mae": windows["mae"],
+        "max_abs_diff": windows["max_abs_diff"],
+    })
 
 
-def store_validation_results(db_path, csv_path, indicator_name, symbol, timeframe, bars, params, results, status, error_msg=None):
-    """Store validation results in DuckDB"""
-    conn = duckdb.connect(db_path)
+def store_validation_results(db_path, csv_path, indicator_name, symbol, timeframe, bars, params, results, status,
+                             error_msg=None, bar_times=None, full_diffs=False):
+    """Store validation results in DuckDB
 
-    # Load schema if database is new
-    schema_path = Path(db_path).parent / "validation_schema.sql"
-    if schema_path.exists() and conn.execute("SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'validation_runs'").fetchone()[0] == 0:
-        schema_sql = schema_path.read_text()
-        conn.executemany(schema_sql)
+    Buffer metrics, divergence and alignment summaries and parameters go in
+    with executemany; bar-level diffs and divergence window profiles are
+    collected into DataFrames and bulk-inserted with INSERT ... SELECT, all in
+    a single transaction.
 
+    Args:
+        bar_times: Bar times of the validated export rows (stored as bar_diffs.bar_time)
+        full_diffs: Store every bar of failed buffers instead of the largest TOP_DIFFS
+
+    Returns:
+        run_id of the stored run
+    """
+    conn = duckdb.connect(str(db_path))
+    try:
+        apply_schema(conn)
+        conn.begin()
+        run_id = insert_validation_run(conn, csv_path, indicator_name, symbol, timeframe, bars, params, results,
+                                       status, error_msg=error_msg, bar_times=bar_times, full_diffs=full_diffs)
+        conn.commit()
+        return run_id
+    finally:
+        conn.close()
+
+
+# Surrogate keys filled from sequences: (table, key column, sequence)
+SURROGATE_KEYS = (
+    ("validation_runs", "run_id", "seq_run_id"),
+    ("buffer_metrics", "metric_id", "seq_metric_id"),
+    ("bar_diffs", "diff_id", "seq_diff_id"),
+    ("indicator_parameters", "param_id", "seq_param_id"),
+    ("divergence_windows", "window_id", "seq_window_id"),
+)
+
+
+def apply_schema(conn):
+    """Apply the schema (idempotent: IF NOT EXISTS / OR REPLACE, so older databases gain new tables)"""
+    if not SCHEMA_PATH.exists():
+        raise ValidationError(f"Schema not found: {SCHEMA_PATH}")
+    conn.execute(SCHEMA_PATH.read_text())
+    migrate_surrogate_keys(conn)
+
+
+def migrate_surrogate_keys(conn):
+    """Give key columns of tables created by the original schema their sequence DEFAULT
+
+    CREATE TABLE IF NOT EXISTS leaves existing tables untouched, and the
+    original schema declared the keys without a DEFAULT, so inserts would fail
+    with a NOT NULL violation. Each such sequence is restarted past the
+    table's largest key before it becomes the column default.
+    """
+    for table, key, sequence in SURROGATE_KEYS:
+        row = conn.execute("""
+            SELECT column_default FROM duckdb_columns()
+            WHERE database_name = current_database() AND schema_name = 'main'
+              AND table_name = ? AND column_name = ?
+        """, (table, key)).fetchone()
+        if row is None or row[0] is not None:
+            continue
+        start = conn.execute(f"SELECT COALESCE(MAX({key}), 0) + 1 FROM {table}").fetchone()[0]
+        conn.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
+        conn.execute(f"CREATE SEQUENCE {sequence} START {start}")
+        conn.execute(f"ALTER TABLE {table} ALTER COLUMN {key} SET DEFAULT nextval('{sequence}')")
+
+
+def insert_validation_run(conn, csv_path, indicator_name, symbol, timeframe, bars, params, results, status,
+                          error_msg=None, bar_times=None, full_diffs=False):
+    """Insert one validation run on an open connection (the caller owns the transaction)
+
+    Returns:
+        run_id of the inserted run
+    """
     # Insert validation run
-    conn.execute("""
+    run_id = conn.execute("""
         INSERT INTO validation_runs (indicator_name, symbol, timeframe, bars, mql5_csv_path, python_version, status, error_message)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (indicator_name, symbol, timeframe, bars, str(csv_path), sys.version.split()[0], status, error_msg))
-
-    run_id = conn.execute("SELECT MAX(run_id) FROM validation_runs").fetchone()[0]
+        RETURNING run_id
+    """, (indicator_name, symbol, timeframe, bars, str(csv_path), sys.version.split()[0], status, error_msg)).fetchone()[0]
 
     # Insert buffer metrics
-    for buffer_name, metrics in results.items():
-        conn.execute("""
+    if results:
+        conn.executemany("""
             INSERT INTO buffer_metrics (run_id, buffer_name, correlation, mae, rmse, max_diff, mql5_min, mql5_max, mql5_mean, python_min, python_max, python_mean, pass)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (run_id, buffer_name, metrics["correlation"], metrics["mae"], metrics["rmse"], metrics["max_diff"],
-              metrics["mql5_min"], metrics["mql5_max"], metrics["mql5_mean"],
-              metrics["python_min"], metrics["python_max"], metrics["python_mean"], metrics["pass"]))
-
-        # Store bar-level differences for failed buffers or high diffs
-        if not metrics["pass"] or metrics["max_diff"] > 0.01:
-            # Store top 100 largest differences
-            diff = metrics["diff"]
-            indices = np.argsort(np.abs(diff))[-100:]
-            for idx in indices:
-                conn.execute("""
-                    INSERT INTO bar_diffs (run_id, buffer_name, bar_index, bar_time, mql5_value, python_value, diff, abs_diff)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (run_id, buffer_name, int(idx), datetime.now(), float(metrics["mql5_min"]), float(metrics["python_min"]), float(diff[idx]), float(np.abs(diff[idx]))))
+        """, [
+            (run_id, buffer_name, float(m["correlation"]), float(m["mae"]), float(m["rmse"]), float(m["max_diff"]),
+             float(m["mql5_min"]), float(m["mql5_max"]), float(m["mql5_mean"]),
+             float(m["python_min"]), float(m["python_max"]), float(m["python_mean"]), bool(m["pass"]))
+            for buffer_name, m in results.items()
+        ])
 
-    # Insert indicator parameters
-    for param_name, param_value in params.items():
+    # Store bar-level differences for failed buffers or high diffs
+    frames = [
+        diff_rows(buffer_name, m, bar_times, full=full_diffs and not m["pass"])
+        for buffer_name, m in results.items()
+        if not m["pass"] or m["max_diff"] > DIFF_THRESHOLD
+    ]
+    if frames:
+        diffs = pd.concat(frames, ignore_index=True)
+        if diffs["bar_time"].isna().any():
+            raise ValidationError("bar_diffs needs bar times (pass bar_times)")
+        conn.register("diff_frame", diffs)
         conn.execute("""
+            INSERT INTO bar_diffs (run_id, buffer_name, bar_index, bar_time, mql5_value, python_value, diff, abs_diff)
+            SELECT ?, buffer_name, bar_index, bar_time, mql5_value, python_value, diff, abs_diff FROM diff_frame
+        """, (run_id,))
+        conn.unregister("diff_frame")
+
+    # Divergence: first diverged bar per buffer, window profiles of flagged buffers
+    divergences = [(name, m["divergence"]) for name, m in results.items() if m.get("divergence") is not None]
+    if divergences:
+        conn.executemany("""
+            INSERT INTO buffer_divergence (run_id, buffer_name, tolerance, window_bars, first_bar_index, first_bar_time,
+                                           first_diff, worst_window_start, worst_window_max_diff, worst_window_correlation)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [divergence_row(run_id, name, d) for name, d in divergences])
+
+        frames = [
+            window_rows(name, d) for name, d in divergences
+            if d["windows"] is not None and (not results[name]["pass"] or results[name]["max_diff"] > DIFF_THRESHOLD)
+        ]
+        if frames:
+            conn.register("window_frame", pd.concat(frames, ignore_index=True))
+            conn.execute("""
+                INSERT INTO divergence_windows (run_id, buffer_name, start_index, end_index, start_time, end_time,
+                                                bars, correlation, mae, max_abs_diff)
+                SELECT ?, buffer_name, start_index, end_index, start_time, end_time, bars, correlation, mae, max_abs_diff
+                FROM window_frame
+            """, (run_id,))
+            conn.unregister("window_frame")
+
+    # Alignment: best lag per buffer
+    alignments = [(name, m["alignment"]) for name, m in results.items() if m.get("alignment") is not None]
+    if alignments:
+        conn.executemany("""
+            INSERT INTO buffer_alignment (run_id, buffer_name, max_lag, best_lag, best_correlation, lag0_correlation, misaligned)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (run_id, name, a["max_lag"], a["best_lag"], _optional(a["best_correlation"]),
+             _optional(a["lag0_correlation"]), a["misaligned"])
+            for name, a in alignments
+        ])
+
+    # Insert indicator parameters
+    if params:
+        conn.executemany("""
             INSERT INTO indicator_parameters (run_id, param_name, param_value)
             VALUES (?, ?, ?)
-        """, (run_id, param_name, str(param_value)))
+        """, [(run_id, param_name, str(param_value)) for param_name, param_value in params.items()])
 
-    conn.close()
     return run_id
 
 
+def validate_export(csv_path, indicator, params, threshold, lake=None, chunk_rows=None, cache=None, sidecar=True,
+                    window=DIVERGENCE_WINDOW, tolerance=None, max_lag=MAX_LAG):
+    """Load one export and validate it (steps 1-2 of main; nothing is stored)
+
+    tolerance None uses export_tolerance() (the export's written precision).
+
+    Returns:
+        Run dict with csv_path, indicator, symbol, timeframe, bars, params,
+        results, all_pass, status, error and bar_times - the arguments of
+        store_validation_results()
+    """
+    # Load MQL5 CSV
+    print("[1/4] Loading MQL5 CSV export...")
+    buffer_prefixes = [buffer.column for buffer in registry.get_spec(indicator).buffers]
+    if chunk_rows:
+        # Only the first row now: columns and start time (for --lake)
+        chunks = iter_mql5_chunks(csv_path, buffer_prefixes, 1, sidecar=sidecar)
+        df = next(chunks, None)
+        chunks.close()
+        if df is None:
+            raise ValidationError(f"Export has no rows: {csv_path}")
+        print(f"  Reading in chunks of {chunk_rows} bars")
+    else:
+        df = load_mql5_csv(csv_path, buffer_prefixes=buffer_prefixes, sidecar=sidecar)
+        print(f"  Loaded {len(df)} bars")
+    print(f"  Columns: {list(df.columns)}")
+    if tolerance is None:
+        mql5_columns = match_buffer_columns(registry.get_spec(indicator), df.columns)
+        tolerance = export_tolerance(csv_path, list(mql5_columns.values()))
+        print(f"  Divergence tolerance: {tolerance:g} (from export precision)")
+    print()
+
+    # Extract metadata from CSV filename (Export_<SYMBOL>_PERIOD_<PERIOD>)
+    symbol, timeframe = parse_export_name(csv_path)
+    symbol = symbol or "UNKNOWN"
+    timeframe = timeframe or "UNKNOWN"
+
+    history = None
+    if lake:
+        warmup = registry.warmup_bars(indicator, params)
+        first = df["time"].min()
+        # In memory, lake bars over the export span also fill bars missing from the export
+        until = None if chunk_rows else df["time"].max()
+        history, missing = load_lake_history(lake, symbol, timeframe, first, warmup, until=until)
+        if missing:
+            print(f"  [WARN] Lake history ends {missing} bars before {first}; not used for warmup")
+        print(f"  Lake warmup: {(history['time'] < first).sum()} of {warmup} bars before {first}")
+        print()
+
+    # Validate indicator
+    print(f"[2/4] Calculating Python {indicator}...")
+    if chunk_rows:
+        results, all_pass, bars = validate_buffers_chunked(
+            csv_path, indicator, params, threshold, chunk_rows, history=history,
+            window=window, tolerance=tolerance, max_lag=max_lag, sidecar=sidecar
+        )
+        bar_times = None  # Kept with each buffer's top diffs
+    else:
+        results, all_pass = validate_buffers(df, indicator, params, threshold, cache=cache, history=history,
+                                             window=window, tolerance=tolerance, max_lag=max_lag)
+        bars, bar_times = len(df), df["time"].to_numpy()
+
+    return {
+        "csv_path": str(csv_path), "indicator": indicator, "symbol": symbol, "timeframe": timeframe,
+        "bars": bars, "params": params, "results": results, "all_pass": all_pass,
+        "status": "success" if all_pass else "failed", "error": None, "bar_times": bar_times,
+    }
+
+
+# Runs per DuckDB transaction in --glob mode
+WRITE_BATCH = 16
+
+
+def trim_diffs(metrics, full=False):
+    """Keep only the bar-level diff arrays diff_rows() will store (shrinks a run sent between processes)"""
+    if "diff" not in metrics or (full and not metrics["pass"]) or len(metrics["diff"]) <= TOP_DIFFS:
+        return metrics
+    abs_diff = np.abs(metrics["diff"])
+    keep = np.sort(np.argpartition(abs_diff, -TOP_DIFFS)[-TOP_DIFFS:])
+    for key in ("bar_index", "bar_time", "mql5_values", "python_values", "diff"):
+        if metrics.get(key) is not None:
+            metrics[key] = metrics[key][keep]
+    return metrics
+
+
+def failed_run(job, error):
+    """Run dict for an export whose validation failed, stored with status 'failed' like main() stores one"""
+    symbol, timeframe = parse_export_name(job["csv"])
+    return {
+        "csv_path": job["csv"], "indicator": job["indicator"], "symbol": symbol or "UNKNOWN",
+        "timeframe": timeframe or "UNKNOWN", "bars": 0, "params": job["params"], "results": {},
+        "all_pass": False, "status": "failed", "error": error, "bar_times": None, "log": "",
+    }
+
+
+def validate_job(job, payload=None):
+    """--glob compute stage: validate one export in a worker process
+
+    Output is captured rather than interleaved with other workers'; a
+    ValidationError becomes a failed run (stored like main() stores one).
+
+    Returns:
+        validate_export() run dict plus its captured "log"
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            cache = None
+            if job["cache"]:
+                from indicators.cache import IndicatorCache
+                cache = IndicatorCache()
+            run = validate_export(
+                job["csv"], job["indicator"], job["params"], job["threshold"], lake=job["lake"],
+                chunk_rows=job["chunk_rows"], cache=cache, sidecar=job["sidecar"],
+                window=job["window"], tolerance=job["tolerance"], max_lag=job["max_lag"]
+            )
+        except ValidationError as e:
+            print(f"\nValidation Error: {e}")
+            run = failed_run(job, str(e))
+    # Diffs carry their own bar times, so the full time column need not travel back
+    for metrics in run["results"].values():
+        trim_diffs(metrics, job["full_diffs"])
+    run["bar_times"] = None
+    run["log"] = log.getvalue()
+    return run
+
+
+class ValidationWriter:
+    """Single DuckDB writer for --glob mode
+
+    Runs are buffered and inserted WRITE_BATCH per transaction over one
+    connection, used only by the pipeline's writer thread, so workers never
+    open validation.ddb and DuckDB's single-writer rule is never contended.
+    If a batch fails, its runs are retried one transaction each so one bad
+    run does not discard the others.
+    """
+
+    def __init__(self, db_path, full_diffs=False, batch_runs=WRITE_BATCH):
+        self.conn = duckdb.connect(str(db_path))
+        apply_schema(self.conn)
+        self.full_diffs = full_diffs
+        self.batch_runs = batch_runs
+        self.pending = []
+
+    def add(self, run):
+        """Queue a run for storage; its run_id (or store_error) is set when its batch commits"""
+        self.pending.append(run)
+        if len(self.pending) >= self.batch_runs:
+            self.flush()
+
+    def _insert(self, run):
+        run["run_id"] = insert_validation_run(
+            self.conn, run["csv_path"], run["indicator"], run["symbol"], run["timeframe"], run["bars"],
+            run["params"], run["results"], run["status"], error_msg=run["error"], full_diffs=self.full_diffs
+        )
+
+    def flush(self):
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        try:
+            self.conn.begin()
+            for run in batch:
+                self._insert(run)
+            self.conn.commit()
+            return
+        except Exception:
+            self.conn.rollback()
+        for run in batch:
+            try:
+                self.conn.begin()
+                self._insert(run)
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                run["run_id"] = None
+                run["store_error"] = str(e)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+
+def expand_glob(pattern):
+    """Export files matching pattern (sorted; Parquet sidecars of CSV exports excluded)"""
+    import glob
+
+    return [path for path in sorted(glob.glob(pattern, recursive=True))
+            if Path(path).is_file() and not path.endswith(".csv.parquet")]
+
+
+def validate_glob(args, params):
+    """--glob mode: validate every matching export in a worker process pool
+
+    Loading and metrics run in worker processes (ExportPipeline compute
+    stage); the pipeline's single writer thread owns the only DuckDB
+    connection (ValidationWriter).
+
+    Returns:
+        (runs, pipeline): run dicts in file order and the pipeline (per-stage
+        metrics). A file whose worker raised unexpectedly is stored as a
+        failed run with its error.
+    """
+    from export_pipeline import ExportPipeline
+
+    paths = expand_glob(args.glob)
+    if not paths:
+        raise ValidationError(f"No export files match: {args.glob}")
+    jobs = [
+        {"csv": path, "indicator": args.indicator, "params": params, "threshold": args.threshold,
+         "lake": args.lake, "chunk_rows": args.chunk_rows, "cache": args.cache, "sidecar": not args.no_sidecar,
+         "window": args.window, "tolerance": args.tolerance, "max_lag": args.max_lag, "full_diffs": args.full_diffs}
+        for path in paths
+    ]
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+    print(f"  {len(jobs)} exports, {workers} worker processes")
+    print()
+
+    writer = ValidationWriter(args.db, full_diffs=args.full_diffs)
+    runs = [None] * len(jobs)
+    index = {job["csv"]: i for i, job in enumerate(jobs)}
+
+    def write(job, run):
+        runs[index[job["csv"]]] = run
+        writer.add(run)
+        status = "ERROR" if run["error"] else ("PASS" if run["all_pass"] else "FAIL")
+        print(f"  [{status}] {job['csv']}")
+        if status != "PASS":
+            # The worker's full report (per-buffer metrics, warmup, divergence, alignment)
+            for line in (run["log"].strip("\n") or run["error"]).splitlines():
+                print(f"    {line}")
+
+    pipeline = ExportPipeline(lambda job: None, validate_job, write, compute_workers=workers,
+                              queue_size=2 * workers, processes=True)
+    try:
+        results = pipeline.run(jobs)
+        # The writer thread has finished; runs whose worker raised unexpectedly are stored here
+        for job, result in zip(jobs, results):
+            if result["status"] == "FAILED":
+                write(job, failed_run(job, result["error"]))
+    finally:
+        writer.close()
+    print()
+    return runs, pipeline
+
+
+def print_glob_summary(runs, pipeline, threshold):
+    """Aggregated --glob summary: one line per export, totals and stage utilisation"""
+    print("=" * 70)
+    print("Validation Summary")
+    print("=" * 70)
+    print(f"{'Export':<40} {'Bars':>8} {'Min Corr':>9} {'Run':>5}  Status")
+    print("-" * 70)
+    counts = {"PASS": 0, "FAIL": 0, "ERROR": 0}
+    for run in runs:
+        status = "ERROR" if run["error"] else ("PASS" if run["all_pass"] else "FAIL")
+        counts[status] += 1
+        correlations = [m["correlation"] for m in run["results"].values()]
+        min_corr = f"{min(correlations):.6f}" if correlations else "-"
+        run_id = run.get("run_id")
+        print(f"{Path(run['csv_path']).name:<40} {run['bars']:>8} {min_corr:>9} "
+              f"{'-' if run_id is None else run_id:>5}  {status}")
+    print("-" * 70)
+    print(f"Exports: {counts['PASS']} passed, {counts['FAIL']} failed (threshold {threshold}), {counts['ERROR']} errors")
+    for run in runs:
+        if run.get("store_error"):
+            print(f"[WARN] Not stored: {run['csv_path']}: {run['store_error']}")
+    print()
+    print("Pipeline stages:")
+    pipeline.print_metrics()
+    return counts
+
+
 def main():
     """Main validation workflow"""
     args = parse_args()
@@ -281,42 +1509,46 @@ def main():
     print("=" * 70)
     print("Universal Indicator Validation")
     print("=" * 70)
-    print(f"CSV: {args.csv}")
+    print(f"CSV: {args.csv}" if args.csv else f"Glob: {args.glob}")
+    if args.threshold is None:
+        args.threshold = registry.get_spec(args.indicator).threshold
+
     print(f"Indicator: {args.indicator}")
     print(f"Threshold: {args.threshold}")
     print(f"Database: {args.db}")
     print()
 
+    if args.glob:
+        try:
+            params = parse_parameters(args.params)
+            runs, pipeline = validate_glob(args, params)
+        except ValidationError as e:
+            print(f"\nValidation Error: {e}")
+            return 1
+        except duckdb.Error as e:
+            print(f"\nDatabase Error: {e}")
+            return 1
+        counts = print_glob_summary(runs, pipeline, args.threshold)
+        return 0 if counts["PASS"] == len(runs) else 1
+
     try:
         # Parse parameters
         params = parse_parameters(args.params)
 
-        # Load MQL5 CSV
-        print("[1/4] Loading MQL5 CSV export...")
-        df = load_mql5_csv(args.csv)
-        print(f"  Loaded {len(df)} bars")
-        print(f"  Columns: {list(df.columns)}")
-        print()
-
-        # Extract metadata from CSV filename
-        csv_name = Path(args.csv).stem
-        parts = csv_name.split("_")
-        symbol = parts[1] if len(parts) > 1 else "UNKNOWN"
-        timeframe = parts[2] if len(parts) > 2 else "UNKNOWN"
-
-        # Validate indicator
-        print(f"[2/4] Calculating Python {args.indicator}...")
-        if args.indicator == "laguerre_rsi":
-            results, all_pass = validate_laguerre_rsi(df, params, args.threshold)
-        else:
-            raise ValidationError(f"Indicator not implemented: {args.indicator}")
+        cache = None
+        if args.cache:
+            from indicators.cache import IndicatorCache
+            cache = IndicatorCache()
+        run = validate_export(args.csv, args.indicator, params, args.threshold, lake=args.lake,
+                              chunk_rows=args.chunk_rows, cache=cache, sidecar=not args.no_sidecar,
+                              window=args.window, tolerance=args.tolerance, max_lag=args.max_lag)
+        results, all_pass = run["results"], run["all_pass"]
 
         # Store results
         print("[3/4] Storing validation results in DuckDB...")
-        status = "success" if all_pass else "failed"
         run_id = store_validation_results(
-            args.db, args.csv, args.indicator, symbol, timeframe, len(df),
-            params, results, status
+            args.db, args.csv, args.indicator, run["symbol"], run["timeframe"], run["bars"],
+            params, results, run["status"], bar_times=run["bar_times"], full_diffs=args.full_diffs
         )
         print(f"  Stored as run_id={run_id}")
         print()
@@ -3,9 +3,16 @@
 -- Created: 2025-10-16
 -- Purpose: Track validation runs and store MQL5 vs Python correlation metrics
 
+-- Surrogate key sequences (DuckDB has no implicit INTEGER PRIMARY KEY autoincrement)
+CREATE SEQUENCE IF NOT EXISTS seq_run_id;
+CREATE SEQUENCE IF NOT EXISTS seq_metric_id;
+CREATE SEQUENCE IF NOT EXISTS seq_diff_id;
+CREATE SEQUENCE IF NOT EXISTS seq_param_id;
+CREATE SEQUENCE IF NOT EXISTS seq_window_id;
+
 -- Validation runs table
 CREATE TABLE IF NOT EXISTS validation_runs (
-    run_id INTEGER PRIMARY KEY,
+    run_id INTEGER PRIMARY KEY DEFAULT nextval('seq_run_id'),
     timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     indicator_name VARCHAR NOT NULL,
     symbol VARCHAR NOT NULL,
@@ -19,7 +26,7 @@ CREATE TABLE IF NOT EXISTS validation_runs (
 
 -- Buffer validation metrics table
 CREATE TABLE IF NOT EXISTS buffer_metrics (
-    metric_id INTEGER PRIMARY KEY,
+    metric_id INTEGER PRIMARY KEY DEFAULT nextval('seq_metric_id'),
     run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
     buffer_name VARCHAR NOT NULL,
     correlation DOUBLE NOT NULL,
@@ -37,8 +44,9 @@ CREATE TABLE IF NOT EXISTS buffer_metrics (
 );
 
 -- Bar-level differences table (for debugging mismatches)
+-- Top differences per flagged buffer, or every bar of failed buffers with --full-diffs
 CREATE TABLE IF NOT EXISTS bar_diffs (
-    diff_id INTEGER PRIMARY KEY,
+    diff_id BIGINT PRIMARY KEY DEFAULT nextval('seq_diff_id'),
     run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
     buffer_name VARCHAR NOT NULL,
     bar_index INTEGER NOT NULL,
@@ -50,9 +58,51 @@ CREATE TABLE IF NOT EXISTS bar_diffs (
     UNIQUE(run_id, buffer_name, bar_index)
 );
 
+-- First divergence per buffer (first bar with |mql5 - python| > tolerance; NULL if none)
+CREATE TABLE IF NOT EXISTS buffer_divergence (
+    run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
+    buffer_name VARCHAR NOT NULL,
+    tolerance DOUBLE NOT NULL,
+    window_bars INTEGER NOT NULL,
+    first_bar_index BIGINT,
+    first_bar_time TIMESTAMP,
+    first_diff DOUBLE,
+    worst_window_start BIGINT,
+    worst_window_max_diff DOUBLE,
+    worst_window_correlation DOUBLE,
+    PRIMARY KEY (run_id, buffer_name)
+);
+
+-- Bar alignment per buffer (FFT cross-correlation over +-max_lag bars; misaligned when best_lag != 0)
+CREATE TABLE IF NOT EXISTS buffer_alignment (
+    run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
+    buffer_name VARCHAR NOT NULL,
+    max_lag INTEGER NOT NULL,
+    best_lag INTEGER NOT NULL,
+    best_correlation DOUBLE,
+    lag0_correlation DOUBLE,
+    misaligned BOOLEAN NOT NULL,
+    PRIMARY KEY (run_id, buffer_name)
+);
+
+-- Windowed correlation/error profile of flagged buffers (locates divergence regions)
+CREATE TABLE IF NOT EXISTS divergence_windows (
+    window_id BIGINT PRIMARY KEY DEFAULT nextval('seq_window_id'),
+    run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
+    buffer_name VARCHAR NOT NULL,
+    start_index BIGINT NOT NULL,
+    end_index BIGINT NOT NULL,
+    start_time TIMESTAMP,
+    end_time TIMESTAMP,
+    bars INTEGER NOT NULL,
+    correlation DOUBLE,
+    mae DOUBLE,
+    max_abs_diff DOUBLE NOT NULL
+);
+
 -- Indicator parameters table (for reproducibility)
 CREATE TABLE IF NOT EXISTS indicator_parameters (
-    param_id INTEGER PRIMARY KEY,
+    param_id INTEGER PRIMARY KEY DEFAULT nextval('seq_param_id'),
     run_id INTEGER NOT NULL REFERENCES validation_runs(run_id),
     param_name VARCHAR NOT NULL,
     param_value VARCHAR NOT NULL,
@@ -68,6 +118,7 @@ CREATE INDEX IF NOT EXISTS idx_buffer_metrics_pass ON buffer_metrics(pass);
 CREATE INDEX IF NOT EXISTS idx_bar_diffs_run_id ON bar_diffs(run_id);
 CREATE INDEX IF NOT EXISTS idx_bar_diffs_abs_diff ON bar_diffs(abs_diff);
 CREATE INDEX IF NOT EXISTS idx_indicator_parameters_run_id ON indicator_parameters(run_id);
+CREATE INDEX IF NOT EXISTS idx_divergence_windows_run_id ON divergence_windows(run_id);
 
 -- View: Latest validation results per indicator
 CREATE OR REPLACE VIEW latest_validations AS